@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro em memória das ações do bot
+Ring buffer com respostas publicadas e falhas (com motivo), servido em /activity
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+
+class ActivityLog:
+    """Últimas `capacity` ações do bot, das mais velhas às mais novas"""
+
+    def __init__(self, capacity=500, clock=time.time):
+        self.clock = clock
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.totals = Counter()
+        self.last_post_ts = None
+
+    def record(self, action, **fields):
+        ts = self.clock()
+        entry = {
+            'ts': ts,
+            'time': datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'action': action,
+        }
+        entry.update(fields)
+        with self._lock:
+            self._entries.append(entry)
+            self.totals[action] += 1
+            if action == 'posted':
+                self.last_post_ts = ts
+        return entry
+
+    def recent(self, limit=100, since=None, action=None):
+        """Ações mais novas primeiro, opcionalmente filtradas por tipo e por ts > since"""
+        with self._lock:
+            entries = list(self._entries)
+        result = []
+        for entry in reversed(entries):
+            if since is not None and entry['ts'] <= since:
+                break
+            if action and entry['action'] != action:
+                continue
+            result.append(entry)
+            if len(result) >= limit:
+                break
+        return result
+
+    def summary(self):
+        with self._lock:
+            return {
+                'buffered': len(self._entries),
+                'capacity': self._entries.maxlen,
+                'totals': dict(self.totals),
+                'last_post_ts': self.last_post_ts,
+            }
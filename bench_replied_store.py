@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+📏 BENCHMARK DO REPLIED STORE
+Compara memória e tempo de busca do RepliedStore com o set de strings antigo
+Uso: python bench_replied_store.py [quantidade_de_ids]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from replied_store import RepliedStore
+from tweet_records import TWITTER_EPOCH_MS
+
+WINDOW_SEC = 7 * 86400 - 3600
+
+
+def fake_tweet_ids(count, seed=42, offset_sec=0):
+    """Gera IDs snowflake em ordem de chegada ao longo de ~7 dias.
+
+    Cada ID é de um tweet criado até 2h antes do momento em que seria
+    respondido, como acontece com menções e comentários reais.
+    """
+    rng = random.Random(seed)
+    start_ms = int(time.time() * 1000) - TWITTER_EPOCH_MS - WINDOW_SEC * 1000
+    step_ms = WINDOW_SEC * 1000 / max(count, 1)
+    ids = []
+    for n in range(count):
+        created_ms = int(start_ms + offset_sec * 1000 + n * step_ms - rng.randrange(2 * 3600 * 1000))
+        ids.append((created_ms << 22) | rng.getrandbits(22))
+    return ids
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def lookups_per_sec(container, keys):
+    started = time.perf_counter()
+    for key in keys:
+        key in container
+    return len(keys) / (time.perf_counter() - started)
+
+
+def run(count):
+    print("📏 BENCHMARK REPLIED STORE")
+    print("=" * 60)
+    print(f"🔢 IDs: {count:,}")
+
+    ids = fake_tweet_ids(count)
+    sample = min(count, 200_000)
+    hits = random.Random(1).sample(ids, sample)
+    # Candidatos novos: mesma faixa de tempo, IDs nunca respondidos
+    misses = fake_tweet_ids(sample, seed=7, offset_sec=60)
+
+    # O bot guardava as strings do JSON; elas entram na conta de memória
+    old_set, set_bytes, set_build = measure(lambda: {str(i) for i in ids})
+
+    def build_store():
+        # Distribui as inserções ao longo de 7 dias de relógio simulado
+        clock = [0.0]
+        store = RepliedStore(clock=lambda: clock[0])
+        step = WINDOW_SEC / max(count, 1)
+        for tweet_id in ids:
+            store.add(tweet_id)
+            clock[0] += step
+        return store
+
+    store, store_bytes, store_build = measure(build_store)
+
+    print(f"\n🗂️  set[str] antigo")
+    print(f"   Memória: {set_bytes / 1e6:.1f} MB ({set_bytes / count:.1f} bytes por ID)")
+    print(f"   Construção: {set_build:.2f}s")
+    print(f"   Busca (acerto): {lookups_per_sec(old_set, [str(i) for i in hits]):,.0f}/s")
+    print(f"   Busca (erro):   {lookups_per_sec(old_set, [str(i) for i in misses]):,.0f}/s")
+
+    print(f"\n📦 RepliedStore ({store.stats()['buckets']} baldes)")
+    print(f"   Memória: {store_bytes / 1e6:.1f} MB ({store_bytes / count:.1f} bytes por ID)")
+    print(f"   nbytes() estimado: {store.nbytes() / 1e6:.1f} MB")
+    print(f"   Construção: {store_build:.2f}s")
+    print(f"   Busca (acerto): {lookups_per_sec(store, hits):,.0f}/s")
+    print(f"   Busca (erro):   {lookups_per_sec(store, misses):,.0f}/s")
+
+    print(f"\n✅ Economia de memória: {set_bytes / max(store_bytes, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+📏 BENCHMARK DOS TWEET RECORDS
+Compara memória por 100k tweets e vazão de parse dos TweetRecords com os dicts
+decodificados do JSON (como o bot guardava antes)
+Uso: python bench_tweet_records.py [quantidade_de_tweets]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from tweet_records import TWITTER_EPOCH_MS, parse_tweets
+
+# Tweets por página da busca/timeline
+PAGE_SIZE = 100
+WORDS = ("obrigado", "ótimo", "post", "concordo", "muito", "bom", "conteúdo", "valeu",
+         "excelente", "sigo", "acompanhando", "parabéns", "ideia", "pergunta", "show")
+
+
+def fake_pages(count, authors=5000, seed=42):
+    """Corpos JSON de páginas da busca recente, com os campos pedidos pelo bot"""
+    rng = random.Random(seed)
+    start_ms = int(time.time() * 1000) - TWITTER_EPOCH_MS - 7 * 86400 * 1000
+    conversations = [str(((start_ms + n * 3600_000) << 22) | n) for n in range(100)]
+    pages = []
+    for first in range(0, count, PAGE_SIZE):
+        tweets = []
+        for n in range(first, min(first + PAGE_SIZE, count)):
+            created_ms = start_ms + n * 6000
+            tweet_id = str((created_ms << 22) | rng.getrandbits(22))
+            tweets.append({
+                'id': tweet_id,
+                'edit_history_tweet_ids': [tweet_id],
+                'text': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))),
+                'author_id': str(10 ** 9 + rng.randrange(authors)),
+                'conversation_id': rng.choice(conversations),
+                'in_reply_to_user_id': '1000',
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+                                            time.gmtime((created_ms + TWITTER_EPOCH_MS) / 1000)),
+            })
+        pages.append(json.dumps({'data': tweets, 'meta': {'result_count': len(tweets)}}))
+    return pages
+
+
+def parse_dicts(pages):
+    tweets = []
+    for body in pages:
+        tweets.extend(json.loads(body).get('data', []))
+    return tweets
+
+
+def parse_records(pages):
+    tweets = []
+    for body in pages:
+        tweets.extend(parse_tweets(json.loads(body)))
+    return tweets
+
+
+def measure(parse, pages):
+    """(objetos, bytes retidos, segundos); a memória conta só o que sobrevive ao parse"""
+    gc.collect()
+    tracemalloc.start()
+    result = parse(pages)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    started = time.perf_counter()
+    parse(pages)
+    return result, current, time.perf_counter() - started
+
+
+def run(count):
+    print("📏 BENCHMARK TWEET RECORDS")
+    print("=" * 60)
+    print(f"🔢 Tweets: {count:,} ({PAGE_SIZE} por página)")
+
+    pages = fake_pages(count)
+    dicts, dict_bytes, dict_sec = measure(parse_dicts, pages)
+    records, record_bytes, record_sec = measure(parse_records, pages)
+    assert len(dicts) == len(records) == count
+    per_100k = 100_000 / count
+
+    print("\n🗂️  dict do JSON")
+    print(f"   Memória: {dict_bytes * per_100k / 1e6:.1f} MB por 100k ({dict_bytes / count:.0f} bytes por tweet)")
+    print(f"   Parse: {count / dict_sec:,.0f} tweets/s")
+
+    print("\n📦 TweetRecord")
+    print(f"   Memória: {record_bytes * per_100k / 1e6:.1f} MB por 100k ({record_bytes / count:.0f} bytes por tweet)")
+    print(f"   Parse: {count / record_sec:,.0f} tweets/s (json.loads + conversão)")
+
+    print(f"\n✅ Economia de memória: {dict_bytes / max(record_bytes, 1):.1f}x | "
+          f"custo de parse: {record_sec / dict_sec:.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -6,17 +6,41 @@ Otimizado para deploy em produção no Railway
 Agora com monitoramento de comentários nos posts próprios
 """
 
+import atexit
+import hmac
 import os
-import time
 import json
 import logging
-import requests
 import random
-from datetime import datetime, timedelta
-from threading import Thread
-from flask import Flask, jsonify
+import time
+from datetime import datetime, timedelta, timezone
+import threading
+from flask import Flask, Response, jsonify, request
 from dotenv import load_dotenv
 
+from activity_log import ActivityLog
+from bot_watchdog import BotWatchdog, WorkerSuperseded
+from call_log import CallLog
+from circuit_breaker import BreakerRegistry, CircuitOpenError, is_failure_status
+from clock import SystemClock
+from http_transport import default_transport
+from memory_probe import memory
+from monitored_posts import MonitoredPosts
+from pipeline import ReplyPipeline
+from post_journal import PostJournal
+from quota import RollingQuota
+from replied_store import RepliedStore
+from reply_allocator import ReplyAllocator, ReplyCandidate
+from reply_latency import ReplyLatency
+from runtime_config import RuntimeConfig
+from sharding import ShardCoordinator, default_node_id, make_backend
+from spam_filter import SpamFilter, np as numpy_available
+from status_board import StatusBoard
+from throttle import ThrottleIndex
+from tracing import collapse, sample_stacks, traced, tracer
+from tweet_records import parse_tweets
+from user_cache import UserCache, batches
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -32,17 +56,24 @@ app = Flask(__name__)
 
 # Variáveis globais
 bot = None
-bot_status = {
-    'running': False,
+watchdog = None
+# Status publicado em snapshots imutáveis (lidos sem lock pelos endpoints)
+bot_status = StatusBoard({
+    'status': 'healthy',
+    'bot_running': False,
+    'daily_limit': None,  # vem da quota configurada quando o bot sobe
     'daily_posts': 0,
     'last_activity': None,
     'error': None,
     'monitored_posts': 0,
-    'replies_found': 0
-}
+    'replies_found': 0,
+    'replied_ids': 0,
+    'singleflight_saved': 0,
+    'pipeline': {}
+})
 
 class XAPIBot:
-    def __init__(self):
+    def __init__(self, transport=None, clock=None, config=None, shards=None):
         # Credenciais obrigatórias
         self.api_key = os.getenv('API_KEY')
         self.api_key_secret = os.getenv('API_KEY_SECRET')
@@ -70,37 +101,230 @@ class XAPIBot:
         
         # Configurações
         self.base_url = "https://api.x.com/2"
-        self.daily_limit = 17
-        self.daily_posts = 0
-        self.last_reset = datetime.now().date()
+        self.http = transport or default_transport
+        self.clock = clock or SystemClock()
+        # Configuração recarregável (env + BOT_CONFIG_FILE), aplicada pela thread do bot
+        self.config = config or RuntimeConfig(
+            path=os.getenv('BOT_CONFIG_FILE', '').strip() or None, clock=self.clock.time
+        )
+        self.applied_config = {}
+        # Heartbeat para o watchdog: cada fase declara até quando deve dar sinal de vida
+        self.heartbeat_grace_sec = float(os.getenv('HEARTBEAT_GRACE_SEC', '120'))
+        self.heartbeat_at = self.clock.monotonic()
+        self.heartbeat_deadline = self.heartbeat_at + self.heartbeat_grace_sec
+        self.worker_generation = 0
+        self._worker = threading.local()
+        # Log binário de chamadas e posts (CALL_LOG_DIR vazio desativa)
+        call_log_dir = os.getenv('CALL_LOG_DIR', 'call_logs').strip()
+        self.call_log = CallLog(call_log_dir, self.clock) if call_log_dir else None
+        # Circuit breakers por família de endpoint (auth, timeline, search, post)
+        self.breakers = BreakerRegistry(clock=self.clock.monotonic)
+        # Quota de posts em janelas móveis (a API limita por janela, não por dia do calendário)
+        self.quota = RollingQuota(self.config['POST_QUOTA_WINDOWS'], clock=self.clock.time)
+        self.daily_limit = self.quota.limit
         self.is_running = False
-        self.last_activity = datetime.now()
+        self.last_activity = self.clock.now()
         
         # Novos atributos para monitoramento de comentários
         self.my_user_id = None
-        self.monitored_posts = []
-        self.replied_comments = set()  # IDs dos comentários já respondidos
-        self.last_comment_check = datetime.now()
-        # Configuração de processamento de comentários
-        self.max_comments_per_cycle = int(os.getenv('MAX_COMMENTS_PER_CYCLE', '2'))
-        self.comment_interval_sec = int(os.getenv('COMMENT_INTERVAL_SEC', '120'))
+        # Posts próprios monitorados (janela de 7 dias, atualizada via since_id)
+        self.monitored_posts = MonitoredPosts(
+            cap=int(os.getenv('MAX_MONITORED_POSTS', '100')), clock=self.clock.time
+        )
+        # IDs já respondidos; expiram por idade (padrão 7 dias = janela da busca recente)
+        replied_ttl_hours = float(os.getenv('REPLIED_TTL_HOURS', '168'))
+        self.replied_comments = RepliedStore(
+            ttl_seconds=int(replied_ttl_hours * 3600), clock=self.clock.time
+        )
+        self.last_comment_check = None
+        # Alocação do orçamento (espalhamento e janela ativa vêm da configuração)
+        self.allocator = ReplyAllocator()
+        # Últimas ações (posts e falhas) servidas em /activity
+        self.activity = ActivityLog(
+            capacity=int(os.getenv('ACTIVITY_BUFFER_SIZE', '500')), clock=self.clock.time
+        )
+        # Journal de respostas: tentativa registrada antes do POST, reconciliada após falha ambígua
+        self.journal = PostJournal(
+            path=os.getenv('POST_JOURNAL_FILE', 'post_journal.jsonl') or None, clock=self.clock.time
+        )
+        # Autores (LRU + TTL): includes.users das buscas e /2/users em lote para os que faltam
+        self.users = UserCache(
+            capacity=int(os.getenv('USER_CACHE_SIZE', '5000')),
+            ttl_seconds=float(os.getenv('USER_CACHE_TTL_HOURS', '6')) * 3600,
+            unknown_ttl_seconds=float(os.getenv('USER_CACHE_UNKNOWN_TTL_HOURS', '1')) * 3600,
+            clock=self.clock.time
+        )
+        # Limite de respostas por autor e por conversa (espalha o orçamento entre pessoas);
+        # conversas dos nossos próprios posts não têm limite por conversa
+        self.throttle = ThrottleIndex(
+            {}, max_keys=int(os.getenv('THROTTLE_MAX_KEYS', '10000')), clock=self.clock.time,
+            exempt={'conversation': self.own_conversation}
+        )
+        # Filtro de spam/respostas copiadas (precisa de numpy; SPAM_FILTER=0 desativa)
+        self.spam_filter = None
+        if os.getenv('SPAM_FILTER', '1') == '1':
+            if numpy_available is None:
+                logging.warning("numpy não instalado: filtro de spam desativado")
+            else:
+                self.spam_filter = SpamFilter(
+                    threshold=float(os.getenv('SPAM_SIMILARITY', '0.85')),
+                    spam_threshold=float(os.getenv('SPAM_TEMPLATE_SIMILARITY', '0.6')),
+                    recent=int(os.getenv('SPAM_RECENT_TEXTS', '2000'))
+                )
+        # Particionamento entre nós (SHARD_BACKEND vazio = este nó cobre tudo)
+        self.shards = shards
+        backend = None if shards else make_backend(os.getenv('SHARD_BACKEND', ''))
+        if backend:
+            self.shards = ShardCoordinator(
+                default_node_id(), backend,
+                ttl_seconds=float(os.getenv('SHARD_TTL_SEC', '90')),
+                history_seconds=replied_ttl_hours * 3600, clock=self.clock.time
+            )
+        # Latência chegada → descoberta → fila → resposta por origem, e descartes por motivo
+        self.latency = ReplyLatency(
+            max_tracked=int(os.getenv('LATENCY_TRACKED_IDS', '10000')), clock=self.clock.time
+        )
+        # Pipeline de candidatos: fontes → dedup → filtros → priorizador → outbox
+        self.pipeline = ReplyPipeline(
+            sources={'mentions': self.mention_source, 'comments': self.comment_source},
+            dedup=lambda c: c.tweet_id in self.replied_comments,
+            filters=[
+                ('own_author', lambda c: c.author_id != self.my_user_id),
+                ('throttle', self.throttle.allow),
+            ],
+            prioritizer=lambda stream, k: self.allocator.select(stream, k, self.clock.utcnow()),
+            outbox=self.post_replies,
+            # Nenhum filtro usa os dados do autor (só o priorizador): completar os autores
+            # por último busca no /2/users só quem sobreviveu aos filtros e ao spam
+            batch_filters=([('spam', self.spam_filter.check)] if self.spam_filter else [])
+            + [('authors', self.resolve_authors)],
+            on_drop=self.latency.dropped,
+        )
         # Controle de retry para menções em caso de 429 (não bloquear comentários)
-        self.next_mentions_retry_at = datetime.now()
-        # Seed de posts monitorados via env (fallback para quota/cap)
-        seed_ids = os.getenv('MONITORED_POST_IDS', '').strip()
-        self.seeded_post_ids = False
-        if seed_ids:
-            ids = [i.strip() for i in seed_ids.split(',') if i.strip()]
-            if ids:
-                self.monitored_posts = [{'id': i} for i in ids]
-                self.seeded_post_ids = True
-                logging.info(f"Posts monitorados via env: {len(ids)} IDs fornecidos")
+        self.next_mentions_retry_at = self.clock.now()
+        # Limites, intervalos e seed de posts monitorados vêm da configuração recarregável
+        self.apply_config()
         logging.info(
-            f"Config: MAX_COMMENTS_PER_CYCLE={self.max_comments_per_cycle}, COMMENT_INTERVAL_SEC={self.comment_interval_sec}s"
+            f"Config: MAX_REPLIES_PER_CYCLE={self.max_replies_per_cycle}, "
+            f"COMMENT_INTERVAL_SEC={self.comment_interval_sec}s, BUDGET_SPREAD={int(self.allocator.spread)}"
         )
         
         logging.info(f"Bot inicializado para @{self.bot_username}")
 
+    # Textos alternativos tentados quando a X recusa o texto por repetir outro post
+    DUPLICATE_TEXT_RETRIES = 3
+
+    # Configurações que só viram atributos do bot (lidas a cada uso)
+    CONFIG_ATTRIBUTES = {
+        'MAX_REPLIES_PER_CYCLE': 'max_replies_per_cycle',
+        'COMMENT_INTERVAL_SEC': 'comment_interval_sec',
+        'FIRST_REPLY_DELAY_SEC': 'first_reply_delay_sec',
+        'CYCLE_WAIT_SEC': 'cycle_wait_sec',
+        'ERROR_BACKOFF_SEC': 'error_backoff_sec',
+        'MONITORED_REFRESH_SEC': 'monitored_refresh_sec',
+        'POST_RETRY_MAX': 'post_retry_max',
+        'POST_RETRY_BASE_SEC': 'post_retry_base_sec',
+    }
+
+    def apply_config(self):
+        """Aplica o que mudou na configuração desde a última aplicação; devolve os nomes.
+
+        Roda só na thread do bot (e no __init__), então quota, throttle e alocador
+        nunca mudam no meio de um ciclo.
+        """
+        values = self.config.values
+        changed = {name for name, value in values.items() if self.applied_config.get(name) != value}
+        if not changed:
+            return changed
+        for name, attribute in self.CONFIG_ATTRIBUTES.items():
+            setattr(self, attribute, values[name])
+        if 'POST_QUOTA_WINDOWS' in changed:
+            self.quota.set_windows(values['POST_QUOTA_WINDOWS'])
+            self.daily_limit = self.quota.limit
+        if changed & {'BUDGET_SPREAD', 'BUDGET_ACTIVE_HOURS'}:
+            self.allocator.spread = values['BUDGET_SPREAD']
+            self.allocator.set_active_hours(values['BUDGET_ACTIVE_HOURS'])
+        if changed & {'AUTHOR_REPLY_LIMIT', 'CONVERSATION_REPLY_LIMIT'}:
+            self.throttle.set_limits({
+                'author': values['AUTHOR_REPLY_LIMIT'],
+                'conversation': values['CONVERSATION_REPLY_LIMIT'],
+            })
+        if 'MONITORED_POST_IDS' in changed:
+            # Substitui os IDs configurados; os descobertos pela timeline continuam
+            added, removed = self.monitored_posts.seed(values['MONITORED_POST_IDS'])
+            logging.info(f"Posts monitorados via config: {added} IDs novos, {removed} removidos")
+        if self.applied_config:
+            logging.info(f"Configuração aplicada: {', '.join(sorted(changed))}")
+        self.applied_config = dict(values)
+        self.applied_config_version = self.config.version
+        return changed
+
+    def sync_config(self):
+        """Confere o arquivo de configuração e aplica recargas pendentes"""
+        self.config.check_file()
+        self.config.changed.clear()
+        changed = self.apply_config()
+        if changed:
+            bot_status.publish(daily_limit=self.daily_limit, config=self.config_state())
+        return changed
+
+    def config_state(self):
+        return dict(self.config.stats(), applied_version=self.applied_config_version)
+
+    def wait_next_cycle(self, wait_time):
+        """Espera o próximo ciclo; uma recarga de configuração acorda a espera e o prazo
+        é refeito com o novo CYCLE_WAIT_SEC (o tempo já esperado conta)"""
+        started = self.clock.monotonic()
+        deadline = started + wait_time
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0 or not self.sleep(remaining, 'cycle_wait', wake=self.config.changed):
+                return
+            if 'CYCLE_WAIT_SEC' in self.sync_config():
+                deadline = started + random.randint(*self.cycle_wait_sec)
+
+    @property
+    def mentions_shard_key(self):
+        return f"mentions:{self.bot_username.lower()}"
+
+    def sync_shards(self):
+        """Heartbeat, rebalanceamento e respostas publicadas pelos outros nós.
+
+        Respostas de outros nós entram no dedup, na quota (a quota é da conta, não do
+        nó) e nos limites por autor/conversa.
+        """
+        if not self.shards:
+            return
+        self.shards.refresh()
+        foreign = self.shards.foreign_replies()
+        for tweet_id, ts, throttle in foreign:
+            self.replied_comments.add(tweet_id)
+            self.quota.record(ts)
+            if throttle:
+                self.throttle.consume_keys(throttle)
+        if foreign:
+            logging.info(f"{len(foreign)} respostas de outros nós sincronizadas")
+        self.shards.prune()
+        keys = [self.mentions_shard_key] + [f"post:{post_id}" for post_id in self.monitored_posts]
+        owned = self.shards.publish_assignments(keys)
+        bot_status.publish(shards=dict(self.shards.stats(), owned=len(owned), keys=len(keys)))
+
+    @property
+    def daily_posts(self):
+        """Posts nas últimas 24h (janela mais longa da quota)"""
+        return self.quota.used()
+
+    def own_conversation(self, candidate):
+        """Conversa iniciada por um post nosso (comentário ou menção na thread de um post monitorado)"""
+        return candidate.post_id is not None or candidate.conversation_id in self.monitored_posts
+
+    def posts_today(self, now=None):
+        """Posts desde a meia-noite local (base do espalhamento do orçamento diário)"""
+        now = now or self.clock.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.quota.used_since(midnight.timestamp())
+
+    @traced('oauth.sign')
     def generate_oauth_header(self, method, url, params=None):
         """Gera header OAuth 1.0a"""
         import urllib.parse
@@ -115,7 +339,7 @@ class XAPIBot:
             'oauth_consumer_key': self.api_key,
             'oauth_token': self.access_token,
             'oauth_signature_method': 'HMAC-SHA1',
-            'oauth_timestamp': str(int(time.time())),
+            'oauth_timestamp': str(int(self.clock.time())),
             'oauth_nonce': ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32)),
             'oauth_version': '1.0'
         }
@@ -148,6 +372,79 @@ class XAPIBot:
         
         return auth_header
 
+    def heartbeat(self, expected_sec=0):
+        """Sinal de vida: a próxima batida deve vir em até expected_sec + folga"""
+        self.heartbeat_at = self.clock.monotonic()
+        self.heartbeat_deadline = self.heartbeat_at + expected_sec + self.heartbeat_grace_sec
+
+    def heartbeat_age(self):
+        return self.clock.monotonic() - self.heartbeat_at
+
+    def heartbeat_overdue(self):
+        return self.clock.monotonic() > self.heartbeat_deadline
+
+    def check_superseded(self):
+        """Encerra a thread atual se o watchdog já subiu um worker mais novo"""
+        generation = getattr(self._worker, 'generation', None)
+        if generation is not None and generation != self.worker_generation:
+            raise WorkerSuperseded(f"worker {generation} substituído por {self.worker_generation}")
+
+    def api_request(self, family, method, url, headers=None, params=None, json=None):
+        """Chamada à API passando pelo circuit breaker da família"""
+        self.check_superseded()
+        self.heartbeat(30)
+        breaker = self.breakers[family]
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuito '{family}' aberto; próxima tentativa em {breaker.retry_in():.0f}s"
+            )
+        path = url.replace(self.base_url, '')
+        with tracer.span('http', family=family, method=method, path=path) as span:
+            started = time.perf_counter()
+            try:
+                response = self.http.request(method, url, headers=headers, params=params,
+                                             json=json, timeout=30)
+            except Exception:
+                breaker.record_failure()
+                if self.call_log:
+                    self.call_log.record_call(method, path, 0, time.perf_counter() - started)
+                raise
+            span.attrs['status'] = response.status_code
+        # O breaker registra antes de tudo: uma sonda do meio-aberto precisa ser
+        # encerrada mesmo que este worker tenha sido substituído durante a chamada
+        if is_failure_status(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if self.call_log:
+            self.call_log.record_call(
+                method, path, response.status_code, time.perf_counter() - started,
+                response.headers.get('x-rate-limit-remaining'), len(response.content)
+            )
+        # Resposta que chegou depois de um restart não pode mais ser usada
+        self.check_superseded()
+        return response
+
+    def parse_json(self, response):
+        """Decodifica o corpo JSON (cronometrado no trace)"""
+        with tracer.span('json.parse', bytes=len(response.content)):
+            return response.json()
+
+    def sleep(self, seconds, reason, wake=None):
+        """Espera pelo relógio do bot, registrando o motivo no trace.
+        Com `wake` (Event) a espera termina antes se o evento for ligado (devolve True)"""
+        self.check_superseded()
+        self.heartbeat(seconds)
+        with tracer.span('sleep', reason=reason, seconds=seconds):
+            if wake is None:
+                self.clock.sleep(seconds)
+                woke = False
+            else:
+                woke = self.clock.wait(wake, seconds)
+        self.check_superseded()
+        return woke
+
+    @traced('authenticate')
     def authenticate(self):
         """Autentica com a API do X e obtém user_id"""
         try:
@@ -157,25 +454,19 @@ class XAPIBot:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.api_request('auth', 'GET', url, headers=headers)
             logging.info(f"Auth status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
+                data = self.parse_json(response)
                 user_data = data.get('data', {})
                 username = user_data.get('username', 'unknown')
                 self.my_user_id = user_data.get('id')
                 logging.info(f"Autenticado como @{username} (ID: {self.my_user_id})")
                 # Inicializar lista de posts monitorados imediatamente após autenticação
                 try:
-                    if not self.seeded_post_ids:
-                        self.monitored_posts = self.get_my_recent_posts()
-                        logging.info(f"Posts monitorados inicializados via API: {len(self.monitored_posts)}")
-                    else:
-                        logging.info(f"Usando IDs de posts monitorados fornecidos por env (sem chamar API)")
-                    self.last_comment_check = datetime.now()
-                    global bot_status
-                    bot_status['monitored_posts'] = len(self.monitored_posts)
+                    self.refresh_monitored_posts()
+                    logging.info(f"Posts monitorados inicializados: {len(self.monitored_posts)}")
                 except Exception as init_err:
                     logging.warning(f"Não foi possível inicializar posts monitorados: {init_err}")
                 return True
@@ -187,43 +478,72 @@ class XAPIBot:
             logging.error(f"Erro na autenticação: {e}")
             return False
 
-    def get_my_recent_posts(self):
-        """Busca posts próprios dos últimos 7 dias"""
+    @traced('get_my_recent_posts')
+    def get_my_recent_posts(self, since_id=None):
+        """Busca posts próprios (sem replies) dos últimos 7 dias, ou só os mais novos que since_id.
+
+        Devolve (posts, newest_id), ou (None, None) em caso de erro.
+        """
         try:
             if not self.my_user_id:
                 logging.error("User ID não disponível")
-                return []
+                return None, None
             
-            # Data de 7 dias atrás
-            seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
+            # Data de 7 dias atrás (a API exige RFC 3339 em UTC, ex: 2025-01-09T18:00:00Z)
+            seven_days_ago = (self.clock.utcnow() - timedelta(days=7)).strftime('%Y-%m-%dT%H:%M:%SZ')
             
             url = f"{self.base_url}/users/{self.my_user_id}/tweets"
             params = {
-                'max_results': 10,
+                'max_results': 100,
+                'exclude': 'replies',
                 'tweet.fields': 'created_at,conversation_id,public_metrics',
                 'start_time': seven_days_ago
             }
+            if since_id:
+                params['since_id'] = since_id
             
             headers = {
                 'Authorization': f"Bearer {self.bearer_token}",
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            logging.info(f"Posts próprios status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                posts = data.get('data', [])
-                logging.info(f"Encontrados {len(posts)} posts próprios dos últimos 7 dias")
-                return posts
-            else:
-                logging.error(f"Erro ao buscar posts próprios: {response.status_code}")
-                return []
+            posts, newest_id = [], None
+            # Paginar até o teto de posts monitorados (a primeira página traz os mais novos)
+            while True:
+                response = self.api_request('timeline', 'GET', url, headers=headers, params=params)
+                logging.info(f"Posts próprios status: {response.status_code}")
+                if response.status_code != 200:
+                    logging.error(f"Erro ao buscar posts próprios: {response.status_code}")
+                    # Página parcial não avança o since_id: tenta tudo de novo na próxima
+                    return None, None
+                data = self.parse_json(response)
+                meta = data.get('meta', {})
+                newest_id = newest_id or meta.get('newest_id')
+                posts.extend(parse_tweets(data))
+                next_token = meta.get('next_token')
+                if not next_token or len(posts) >= self.monitored_posts.cap:
+                    break
+                params = dict(params, pagination_token=next_token)
+
+            logging.info(f"Encontrados {len(posts)} posts próprios novos")
+            return posts, newest_id
                 
         except Exception as e:
             logging.error(f"Erro ao buscar posts próprios: {e}")
-            return []
+            return None, None
+
+    def refresh_monitored_posts(self):
+        """Traz só os posts novos (since_id) e descarta os que saíram da janela de busca"""
+        posts, newest_id = self.get_my_recent_posts(since_id=self.monitored_posts.since_id)
+        if posts is not None:
+            added = self.monitored_posts.merge(posts, newest_id)
+            self.last_comment_check = self.clock.now()
+            if added:
+                logging.info(f"{added} posts próprios novos monitorados")
+        evicted = self.monitored_posts.evict()
+        if evicted:
+            logging.info(f"{evicted} posts saíram da janela de 7 dias")
+        bot_status.publish(monitored_posts=len(self.monitored_posts))
 
     def search_replies_to_post(self, post_id):
         """Busca replies/comentários para um post específico"""
@@ -233,7 +553,9 @@ class XAPIBot:
             params = {
                 'query': query,
                 'max_results': 10,
-                'tweet.fields': 'created_at,author_id,conversation_id,in_reply_to_user_id'
+                'tweet.fields': 'created_at,author_id,conversation_id,in_reply_to_user_id',
+                'expansions': 'author_id',
+                'user.fields': 'public_metrics,verified'
             }
             
             headers = {
@@ -241,18 +563,14 @@ class XAPIBot:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self.api_request('search', 'GET', url, headers=headers, params=params)
             
             if response.status_code == 200:
-                data = response.json()
-                replies = data.get('data', [])
-                # Filtrar apenas replies que não são nossos e que não respondemos ainda
-                new_replies = [
-                    reply for reply in replies 
-                    if reply.get('author_id') != self.my_user_id 
-                    and reply.get('id') not in self.replied_comments
-                ]
-                return new_replies
+                data = self.parse_json(response)
+                replies = parse_tweets(data)
+                self.remember_authors(data)
+                # Dedup e filtro de autor próprio ficam nos estágios do pipeline
+                return replies
             elif response.status_code == 429:
                 logging.warning("Rate limit na busca de replies")
                 return []
@@ -264,6 +582,46 @@ class XAPIBot:
             logging.error(f"Erro ao buscar replies: {e}")
             return []
 
+    def remember_authors(self, data):
+        """Guarda os autores de includes.users (vêm de graça com expansions=author_id)"""
+        self.users.put_many(data.get('includes', {}).get('users', []))
+
+    @traced('lookup_users')
+    def lookup_users(self, user_ids):
+        """Busca no /2/users os autores fora do cache, até 100 IDs por chamada"""
+        missing = self.users.missing(user_ids)
+        headers = {
+            'Authorization': f"Bearer {self.bearer_token}",
+            'Content-Type': 'application/json'
+        }
+        fetched = 0
+        for batch in batches(missing):
+            try:
+                params = {'ids': ','.join(batch), 'user.fields': 'public_metrics,verified'}
+                response = self.api_request('users', 'GET', f"{self.base_url}/users",
+                                            headers=headers, params=params)
+            except Exception as e:
+                logging.error(f"Erro ao buscar autores: {e}")
+                break
+            if response.status_code != 200:
+                logging.warning(f"Erro ao buscar autores: {response.status_code}")
+                break
+            users = self.parse_json(response).get('data', [])
+            fetched += self.users.put_many(users)
+            # Suspensos/apagados vêm em `errors`: lembrar para não buscar de novo a cada ciclo
+            found = {user.get('id') for user in users}
+            self.users.put_unknown([user_id for user_id in batch if user_id not in found])
+        return fetched
+
+    def resolve_authors(self, candidates):
+        """Estágio em lote: completa o autor de quem veio sem includes (não descarta ninguém)"""
+        pending = [c for c in candidates if not c.author and c.author_id]
+        if pending:
+            self.lookup_users([c.author_id for c in pending])
+            for candidate in pending:
+                candidate.author = self.users.get(candidate.author_id) or {}
+        return [True] * len(candidates)
+
     def load_responses(self):
         """Carrega respostas do arquivo respostas.txt"""
         try:
@@ -283,8 +641,9 @@ class XAPIBot:
             params = {
                 'query': query,
                 'max_results': 10,
-                'tweet.fields': 'created_at,author_id,conversation_id',
-                'expansions': 'author_id'
+                'tweet.fields': 'created_at,author_id,conversation_id,in_reply_to_user_id',
+                'expansions': 'author_id',
+                'user.fields': 'public_metrics,verified'
             }
             
             headers = {
@@ -292,17 +651,18 @@ class XAPIBot:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=30)
+            response = self.api_request('search', 'GET', url, headers=headers, params=params)
             logging.info(f"Search status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
-                tweets = data.get('data', [])
+                data = self.parse_json(response)
+                tweets = parse_tweets(data)
+                self.remember_authors(data)
                 logging.info(f"Encontradas {len(tweets)} menções")
                 return tweets
             elif response.status_code == 429:
                 # Não bloquear o loop; configurar retry para menções e seguir com comentários
-                self.next_mentions_retry_at = datetime.now() + timedelta(minutes=15)
+                self.next_mentions_retry_at = self.clock.now() + timedelta(minutes=15)
                 logging.warning(
                     f"Rate limit em menções. Pausando menções até {self.next_mentions_retry_at.isoformat()}"
                 )
@@ -318,8 +678,50 @@ class XAPIBot:
             logging.error(f"Erro na busca: {e}")
             return []
 
-    def create_tweet(self, text, reply_to=None):
-        """Cria um tweet com controle de rate limiting"""
+    def memory_state(self):
+        """Tamanho das estruturas que crescem com o tempo de execução"""
+        return {
+            'replied_ids': len(self.replied_comments),
+            'replied_bytes': self.replied_comments.nbytes(),
+            'monitored_posts': len(self.monitored_posts),
+            'authors': len(self.users),
+            'activity': self.activity.summary()['buffered'],
+            'pipeline_stages': len(self.pipeline.stats),
+            'latency_tracked': self.latency.stats()['tracked'],
+        }
+
+    def error_reason(self, response):
+        """Motivo curto de uma resposta de erro da API (title/detail do corpo JSON)"""
+        try:
+            body = response.json()
+        except Exception:
+            return f"HTTP {response.status_code}"
+        detail = body.get('detail') or body.get('title') if isinstance(body, dict) else None
+        return f"HTTP {response.status_code}: {detail}" if detail else f"HTTP {response.status_code}"
+
+    def send_tweet(self, text, reply_to=None, source=None):
+        """Um único POST /tweets.
+
+        Devolve 'posted', 'duplicate' (403 de conteúdo duplicado), 'rate_limited',
+        'rejected' (não foi criado) ou 'ambiguous' (timeout/5xx: pode ter sido criado).
+        Com particionamento, a vaga é reservada antes na quota compartilhada entre os
+        nós e devolvida quando nada foi criado.
+        """
+        if not self.shards:
+            return self.post_tweet(text, reply_to, source)
+        reservation = self.shards.reserve_post(self.quota.windows)
+        if reservation is None:
+            logging.warning("Quota da conta esgotada por outros nós")
+            self.activity.record('failed', reply_to=reply_to, source=source, status=None,
+                                 reason='quota compartilhada esgotada')
+            return 'rate_limited'
+        outcome = self.post_tweet(text, reply_to, source)
+        if outcome not in ('posted', 'ambiguous'):
+            self.shards.release_post(reservation)
+        return outcome
+
+    def post_tweet(self, text, reply_to, source):
+        """POST /tweets e classificação da resposta (ver send_tweet)"""
         try:
             url = f"{self.base_url}/tweets"
             
@@ -332,200 +734,467 @@ class XAPIBot:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self.api_request('post', 'POST', url, headers=headers, json=payload)
             logging.info(f"Tweet status: {response.status_code}")
             
+            tweet_id = None
             if response.status_code == 201:
-                self.daily_posts += 1
-                self.last_activity = datetime.now()
-                logging.info(f"Tweet criado! Posts hoje: {self.daily_posts}/{self.daily_limit}")
-                return True
+                tweet_id = self.parse_json(response).get('data', {}).get('id')
+                self.activity.record('posted', tweet_id=tweet_id, reply_to=reply_to, source=source)
+            else:
+                self.activity.record('failed', reply_to=reply_to, source=source,
+                                     status=response.status_code, reason=self.error_reason(response))
+            if self.call_log:
+                self.call_log.record_post(tweet_id, reply_to, response.status_code,
+                                          ok=response.status_code == 201)
+            
+            if response.status_code == 201:
+                self.quota.record()
+                self.last_activity = self.clock.now()
+                logging.info(f"Tweet criado! Posts nas últimas 24h: {self.daily_posts}/{self.daily_limit}")
+                return 'posted'
             elif response.status_code == 429:
-                # Rate limit atingido - aguardar 15 minutos
-                logging.warning("Rate limit no tweet - aguardando 15 minutos...")
-                time.sleep(900)  # 15 minutos
-                return False
+                # Rate limit atingido: bloquear a quota até o reset informado (ou 15 minutos)
+                reset = response.headers.get('x-rate-limit-reset')
+                try:
+                    blocked_until = float(reset)
+                except (TypeError, ValueError):
+                    blocked_until = self.clock.time() + 900
+                self.quota.block_until(blocked_until)
+                logging.warning(
+                    f"Rate limit no tweet - sem posts por {max(blocked_until - self.clock.time(), 0) / 60:.0f} minutos"
+                )
+                return 'rate_limited'
+            elif response.status_code == 403 and 'duplicate' in response.text.lower():
+                logging.info(f"Conteúdo duplicado para {reply_to}: texto igual a outro post da conta")
+                return 'duplicate'
+            elif response.status_code >= 500:
+                logging.warning(f"Erro {response.status_code} no tweet: pode ter sido criado")
+                return 'ambiguous'
             else:
                 logging.error(f"Erro tweet: {response.status_code} - {response.text}")
-                return False
+                return 'rejected'
                 
+        except CircuitOpenError as e:
+            logging.warning(f"Tweet não enviado: {e}")
+            self.activity.record('failed', reply_to=reply_to, source=source, status=None, reason=str(e))
+            return 'rejected'
         except Exception as e:
             logging.error(f"Erro ao criar tweet: {e}")
+            self.activity.record('failed', reply_to=reply_to, source=source, status=None,
+                                 reason=f"{type(e).__name__}: {e}")
+            return 'ambiguous'
+
+    @traced('create_tweet')
+    def create_tweet(self, text, reply_to=None, source=None, alternatives=()):
+        """Cria um tweet; respostas são idempotentes (journal + reconciliação antes de repetir).
+
+        A X recusa (403) texto igual a qualquer post recente da conta: depois de uma
+        tentativa ambígua, o 403 só conta como resposta já dada se ela aparece na
+        timeline própria; senão (ou na primeira tentativa) troca por outro texto de
+        `alternatives` (até DUPLICATE_TEXT_RETRIES vezes) ou desiste.
+        """
+        if not reply_to:
+            return self.send_tweet(text, source=source) == 'posted'
+
+        entry = self.journal.get(reply_to)
+        if entry:
+            # Tentativa anterior terminou sem resposta clara: conferir antes de postar de novo
+            if self.reconcile_reply(entry, source):
+                return True
+            text = entry['text']  # mesmo texto: se já existir, a API devolve 403 de duplicado
+
+        tried = {text}
+        attempt = 0
+        while attempt <= self.post_retry_max:
+            if attempt:
+                delay = self.post_retry_base_sec * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logging.info(f"Resposta a {reply_to} ambígua; conferindo de novo em {delay:.0f}s")
+                self.sleep(delay, 'post_retry')
+                if self.reconcile_reply(self.journal.get(reply_to), source):
+                    return True
+            entry = self.journal.begin(reply_to, text)
+            outcome = self.send_tweet(text, reply_to=reply_to, source=source)
+            if outcome == 'ambiguous':
+                self.journal.mark_ambiguous(reply_to, 'timeout_or_5xx')
+                attempt += 1
+                continue
+            if outcome == 'duplicate' and entry['attempts'] > 1:
+                # O 403 também vem de texto repetido em outro post: só conta se está na timeline
+                if self.reconcile_reply(self.journal.get(reply_to), source):
+                    return True
+            if outcome == 'duplicate':
+                # Nada foi criado para este alvo: o texto só repete outro post da conta
+                self.journal.finish(reply_to, 'duplicate_text')
+                options = [t for t in alternatives if t not in tried]
+                if not options or len(tried) > self.DUPLICATE_TEXT_RETRIES:
+                    logging.warning(f"Sem texto inédito para responder {reply_to}")
+                    return False
+                text = random.choice(options)
+                tried.add(text)
+                logging.info(f"Texto repetido na conta; tentando outro para {reply_to}")
+                continue
+            self.journal.finish(reply_to, outcome)
+            return outcome == 'posted'
+
+        # Continua pendente: a próxima tentativa para este alvo reconcilia primeiro
+        logging.warning(f"Resposta a {reply_to} continua ambígua após {self.post_retry_max + 1} tentativas")
+        return False
+
+    def find_own_reply(self, reply_to, since_ts):
+        """Procura na timeline própria uma resposta ao tweet alvo criada desde since_ts.
+
+        Devolve o tweet, None se não existe, ou False se a consulta falhou.
+        """
+        try:
+            url = f"{self.base_url}/users/{self.my_user_id}/tweets"
+            start = datetime.fromtimestamp(since_ts - 60, tz=timezone.utc)
+            params = {
+                'max_results': 20,
+                'tweet.fields': 'created_at,referenced_tweets',
+                'start_time': start.strftime('%Y-%m-%dT%H:%M:%SZ')
+            }
+            headers = {
+                'Authorization': f"Bearer {self.bearer_token}",
+                'Content-Type': 'application/json'
+            }
+            response = self.api_request('timeline', 'GET', url, headers=headers, params=params)
+            if response.status_code != 200:
+                logging.error(f"Erro ao reconciliar resposta: {response.status_code}")
+                return False
+            for tweet in self.parse_json(response).get('data', []):
+                for ref in tweet.get('referenced_tweets', []):
+                    if ref.get('type') == 'replied_to' and ref.get('id') == reply_to:
+                        return tweet
+            return None
+        except Exception as e:
+            logging.error(f"Erro ao reconciliar resposta: {e}")
             return False
 
-    def process_mentions(self):
-        """Processa menções e responde - APENAS UMA POR CICLO"""
-        if self.daily_posts >= self.daily_limit:
-            logging.info("Limite diário atingido")
-            return
+    def reconcile_reply(self, entry, source=None):
+        """True se a resposta pendente já existe na timeline (e encerra a entrada do journal)"""
+        if not entry or not self.my_user_id:
+            return False
+        tweet = self.find_own_reply(entry['reply_to'], entry['started'])
+        if not tweet:
+            return False
+        logging.info(f"Resposta a {entry['reply_to']} já existia ({tweet['id']}); sem repostar")
+        self.quota.record()
+        if self.shards:
+            self.shards.record_reply(entry['reply_to'])
+        self.journal.finish(entry['reply_to'], 'reconciled', tweet['id'])
+        self.activity.record('reconciled', tweet_id=tweet['id'], reply_to=entry['reply_to'],
+                             source=source)
+        return True
+
+    def mention_source(self):
+        """Fonte de candidatos: menções à conta (preguiçosa)"""
         # Respeitar janela de retry de menções (para não bloquear comentários)
-        if datetime.now() < self.next_mentions_retry_at:
+        if self.shards and not self.shards.owns(self.mentions_shard_key):
+            return  # Menções desta conta são de outro nó
+        if self.clock.now() < self.next_mentions_retry_at:
             logging.info(
                 f"Menções pausadas até {self.next_mentions_retry_at.isoformat()} devido a rate limit"
             )
             return
-            
-        mentions = self.search_mentions()
+        with tracer.span('source.mentions'):
+            mentions = self.search_mentions()
         if not mentions:
-            logging.info("Nenhuma menção encontrada")
-            return
-            
-        responses = self.load_responses()
-        
-        # PROCESSAR APENAS A PRIMEIRA MENÇÃO
-        mention = mentions[0]
-        tweet_id = mention.get('id')
-        
-        logging.info(f"Processando menção {tweet_id} (1 de {len(mentions)} encontradas)")
-        
-        # Delay inicial para evitar rate limit
-        initial_delay = random.randint(30, 60)  # 30-60 segundos
-        logging.info(f"Aguardando {initial_delay}s antes de responder...")
-        time.sleep(initial_delay)
-        
-        # Escolher resposta aleatória
-        response_text = random.choice(responses)
-        
-        if self.create_tweet(response_text, reply_to=tweet_id):
-            logging.info(f"Respondeu à menção: {tweet_id}")
-        else:
-            logging.warning(f"Falha ao responder menção: {tweet_id}")
+            logging.info("Nenhuma menção nova encontrada")
+        for mention in mentions:
+            candidate = ReplyCandidate(mention, 'mention', self.users.get(mention.author_id),
+                                       my_user_id=self.my_user_id)
+            self.track_latency(candidate)
+            yield candidate
 
-    def process_post_comments(self):
-        """Processa comentários nos posts próprios com intervalo entre respostas"""
-        global bot_status
-        if self.daily_posts >= self.daily_limit:
-            return
-        
-        # Atualizar posts próprios: apenas se lista estiver vazia
-        # ou se passou 1h e NÃO estivermos usando seed via env (para evitar quota)
-        if (not self.monitored_posts) or ((datetime.now() - self.last_comment_check).seconds > 3600 and not self.seeded_post_ids):
-            self.monitored_posts = self.get_my_recent_posts()
-            self.last_comment_check = datetime.now()
-            global bot_status
-            bot_status['monitored_posts'] = len(self.monitored_posts)
-        
+    def track_latency(self, candidate):
+        """Marca first_seen; tweets já respondidos que voltam na busca não são rastreados"""
+        if candidate.tweet_id not in self.replied_comments:
+            self.latency.seen(candidate)
+
+    def comment_source(self):
+        """Fonte de candidatos: comentários nos posts próprios, um post por vez"""
+        # Atualizar posts próprios a cada MONITORED_REFRESH_SEC (incremental, via since_id)
+        if (self.last_comment_check is None
+                or (self.clock.now() - self.last_comment_check).total_seconds() >= self.monitored_refresh_sec):
+            with tracer.span('source.comments.refresh'):
+                self.refresh_monitored_posts()
+        elif self.monitored_posts.evict():
+            bot_status.publish(monitored_posts=len(self.monitored_posts))
+
+        found = 0
+        for post_id in list(self.monitored_posts):
+            if self.shards and not self.shards.owns(f"post:{post_id}"):
+                continue  # Conversa atribuída a outro nó
+            with tracer.span('source.comments', post_id=post_id):
+                replies = self.search_replies_to_post(post_id)
+            found += len(replies)
+            for reply in replies:
+                candidate = ReplyCandidate(
+                    reply, 'comment', self.users.get(reply.author_id),
+                    post_id=post_id, my_user_id=self.my_user_id
+                )
+                self.track_latency(candidate)
+                yield candidate
+        bot_status.publish(replies_found=found)
+
+    def cycle_budget(self):
+        """Respostas permitidas neste ciclo (orçamento diário espalhado e teto por ciclo)"""
+        # O espalhamento libera o limite ao longo do dia local: conta os posts desde a
+        # meia-noite, não a janela móvel de 24h (que carregaria os posts da véspera)
+        now = self.clock.now()
+        return min(
+            self.allocator.budget(self.posts_today(now), self.daily_limit, now),
+            self.quota.remaining(),
+            self.max_replies_per_cycle
+        )
+
+    @traced('post_replies')
+    def post_replies(self, selected):
+        """Outbox do pipeline: publica as respostas escolhidas e devolve quantas saíram"""
+        logging.info(
+            f"Selecionados {len(selected)} candidatos: "
+            + ', '.join(f"{c.source}:{c.tweet_id}" for c in selected)
+        )
         responses = self.load_responses()
-        replies_found = 0
-        processed_count = 0
-        
-        for post in self.monitored_posts:
-            if self.daily_posts >= self.daily_limit or processed_count >= self.max_comments_per_cycle:
+        for candidate in selected:
+            self.latency.queued(candidate)
+
+        posted = attempts = 0
+        for index, candidate in enumerate(selected):
+            if not self.quota.can_post():
+                for skipped in selected[index:]:
+                    self.latency.dropped(skipped, 'limit')
                 break
-                
-            post_id = post.get('id')
-            if not post_id:
+            if not self.throttle.allow(candidate):
+                # Outro candidato do mesmo autor/conversa já saiu neste ciclo
+                logging.info(f"Limite por autor/conversa: pulando {candidate.source} {candidate.tweet_id}")
+                self.latency.dropped(candidate, 'limit')
                 continue
-                
-            replies = self.search_replies_to_post(post_id)
-            replies_found += len(replies)
-            
-            for reply in replies:
-                if self.daily_posts >= self.daily_limit or processed_count >= self.max_comments_per_cycle:
-                    break
-                    
-                reply_id = reply.get('id')
-                
-                if reply_id in self.replied_comments:
-                    continue  # Já respondeu este comentário
-                
-                logging.info(f"Processando comentário {reply_id} (encontrados {len(replies)} no post {post_id})")
-                
-                # Intervalo entre respostas de comentários
-                if processed_count == 0:
-                    # Delay inicial para evitar rate limit
-                    initial_delay = random.randint(30, 60)  # 30-60 segundos
-                    logging.info(f"Aguardando {initial_delay}s antes de responder comentário...")
-                    time.sleep(initial_delay)
-                else:
-                    logging.info(f"Aguardando {self.comment_interval_sec}s antes da próxima resposta de comentário...")
-                    time.sleep(self.comment_interval_sec)
-                
-                # Escolher resposta aleatória
-                response_text = random.choice(responses)
-                
-                if self.create_tweet(response_text, reply_to=reply_id):
-                    logging.info(f"Respondeu ao comentário: {reply_id}")
-                    self.replied_comments.add(reply_id)
-                else:
-                    logging.warning(f"Falha ao responder comentário: {reply_id}")
-                processed_count += 1
-        
-        bot_status['replies_found'] = replies_found
 
-    def run_bot_loop(self):
-        """Loop principal do bot"""
+            attempts += 1
+            if attempts == 1:
+                # Delay inicial para evitar rate limit
+                delay = random.randint(*self.first_reply_delay_sec)
+                logging.info(f"Aguardando {delay}s antes de responder...")
+            else:
+                delay = self.comment_interval_sec
+                logging.info(f"Aguardando {delay}s antes da próxima resposta...")
+            self.sleep(delay, 'reply_interval')
+
+            # Escolher resposta aleatória
+            response_text = random.choice(responses)
+
+            if self.create_tweet(response_text, reply_to=candidate.tweet_id, source=candidate.source,
+                                 alternatives=responses):
+                logging.info(f"Respondeu {candidate.source} {candidate.tweet_id} (score {candidate.score:.2f})")
+                self.replied_comments.add(candidate.tweet_id)
+                self.throttle.consume(candidate)
+                self.latency.posted(candidate)
+                if self.shards:
+                    self.shards.record_reply(candidate.tweet_id,
+                                             throttle=self.throttle.keys(candidate))
+                posted += 1
+            else:
+                logging.warning(f"Falha ao responder {candidate.source}: {candidate.tweet_id}")
+                self.latency.dropped(candidate, 'failed')
+        return posted
+
+    def run_pipeline(self):
+        """Roda o pipeline (todas as fontes) dentro do orçamento do ciclo"""
+        budget = self.cycle_budget()
+        if budget <= 0:
+            # Nada seria publicado: as fontes nem chegam a ser consultadas
+            logging.info("Sem orçamento neste ciclo")
+            return []
+        if self.breakers['post'].retry_in() > 0:
+            logging.warning("Circuito de posts aberto; candidatos ficam para o próximo ciclo")
+            return []
+        selected = self.pipeline.run(budget)
+        bot_status.publish(pipeline=self.pipeline.snapshot())
+        return selected
+
+    @traced('process_cycle')
+    def process_cycle(self):
+        """Junta menções e comentários e distribui o orçamento entre os melhores"""
+        if not self.quota.can_post():
+            logging.info("Quota de posts esgotada")
+            return
+        self.run_pipeline()
+
+    def run_bot_loop(self, generation=None):
+        """Loop principal do bot (generation identifica o worker do watchdog)"""
         self.is_running = True
+        self._worker.generation = generation
         
         while self.is_running:
             try:
-                # Reset diário
-                today = datetime.now().date()
-                if today > self.last_reset:
-                    self.daily_posts = 0
-                    self.last_reset = today
-                    self.replied_comments.clear()  # Limpar comentários respondidos
-                    logging.info("Contador diário resetado")
+                self.heartbeat()
+                self.sync_config()
+                self.sync_shards()
+                self.replied_comments.expire()  # Descartar apenas IDs fora do TTL
+                self.journal.expire()
                 
-                if self.daily_posts < self.daily_limit:
-                    # Processar menções (prioridade)
-                    self.process_mentions()
-                    
-                    # Delay entre processamentos para evitar rate limit
-                    if self.daily_posts < self.daily_limit:
-                        delay_between = random.randint(60, 120)  # 1-2 minutos
-                        logging.info(f"Aguardando {delay_between}s entre processamentos...")
-                        time.sleep(delay_between)
-                        
-                        # Processar comentários nos posts próprios
-                        if self.daily_posts < self.daily_limit:
-                            self.process_post_comments()
+                if self.quota.can_post():
+                    # Menções e comentários disputam o mesmo orçamento
+                    with tracer.span('cycle'):
+                        self.process_cycle()
                 
                 # Atualizar status
-                global bot_status
-                bot_status.update({
-                    'running': True,
-                    'daily_posts': self.daily_posts,
-                    'last_activity': self.last_activity.isoformat(),
-                    'error': None
-                })
+                bot_status.publish(
+                    bot_running=True,
+                    daily_limit=self.daily_limit,
+                    daily_posts=self.daily_posts,
+                    quota=self.quota.stats(),
+                    post_journal=self.journal.stats(),
+                    throttle=self.throttle.stats(),
+                    spam_filter=self.spam_filter.stats() if self.spam_filter else None,
+                    last_activity=self.last_activity.isoformat(),
+                    replied_ids=len(self.replied_comments),
+                    singleflight_saved=self.http.saved_calls,
+                    circuit_breakers=self.breakers.snapshot(),
+                    config=self.config_state(),
+                    latency=self.latency.stats(),
+                    user_cache=self.users.stats(),
+                    error=None
+                )
+                memory.sample()
                 
-                # Aguardar próximo ciclo (10-15 minutos aleatório)
-                wait_time = random.randint(600, 900)  # 10-15 minutos
+                # Aguardar próximo ciclo (CYCLE_WAIT_SEC, padrão 10-15 minutos, ou até abrir vaga na quota)
+                wait_time = random.randint(*self.cycle_wait_sec)
+                slot_in = self.quota.next_slot_at() - self.clock.time()
+                if slot_in > wait_time:
+                    wait_time = int(slot_in) + 1
+                    logging.info(f"Quota cheia; próxima vaga em {slot_in / 60:.0f} minutos")
                 logging.info(f"Aguardando {wait_time//60} minutos antes do próximo ciclo")
-                time.sleep(wait_time)
+                self.wait_next_cycle(wait_time)
                 
             except Exception as e:
                 logging.error(f"Erro no loop: {e}")
-                bot_status['error'] = str(e)
-                time.sleep(60)  # Aguardar 1 minuto em caso de erro
+                bot_status.publish(error=str(e))
+                self.sleep(self.error_backoff_sec, 'error_backoff')
 
 # Endpoints Flask
+def snapshot_response(body, etag):
+    """Responde com o JSON pré-serializado, ou 304 se o cliente já tem essa versão"""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/', methods=['GET'])
 def healthcheck():
     """Endpoint de healthcheck"""
-    global bot_status
-    
-    return jsonify({
-        'status': 'healthy',
-        'bot_running': bot_status['running'],
-        'daily_limit': 17,
-        'daily_posts': bot_status['daily_posts'],
-        'last_activity': bot_status['last_activity'],
-        'monitored_posts': bot_status['monitored_posts'],
-        'replies_found': bot_status['replies_found'],
-        'timestamp': datetime.now().isoformat(),
-        'error': bot_status['error']
-    })
+    snapshot = bot_status.snapshot()
+    return snapshot_response(snapshot.health_body, snapshot.health_etag)
 
 @app.route('/status', methods=['GET'])
 def status():
     """Status detalhado"""
-    return healthcheck()
+    snapshot = bot_status.snapshot()
+    return snapshot_response(snapshot.status_body, snapshot.status_etag)
+
+@app.route('/activity', methods=['GET'])
+def activity():
+    """Ações recentes do bot (posts e falhas) direto da memória, sem gastar quota da API"""
+    if bot is None:
+        return jsonify({'error': 'bot não inicializado', 'activity': []}), 503
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+    return jsonify({
+        'bot_username': bot.bot_username,
+        'daily_posts': bot.daily_posts,
+        'daily_limit': bot.daily_limit,
+        'summary': bot.activity.summary(),
+        'activity': bot.activity.recent(
+            limit=limit,
+            since=request.args.get('since', type=float),
+            action=request.args.get('action')
+        )
+    })
+
+def debug_allowed():
+    """Endpoints /debug exigem DEBUG_TOKEN (?token= ou Bearer); sem ele definido ficam desligados"""
+    token = os.getenv('DEBUG_TOKEN', '')
+    given = request.args.get('token') or request.headers.get('Authorization', '').removeprefix('Bearer ')
+    return bool(token) and hmac.compare_digest(given, token)
+
+@app.route('/debug/trace', methods=['GET'])
+def debug_trace():
+    """Spans recentes do ring buffer e resumo por fase"""
+    if not debug_allowed():
+        return jsonify({'error': 'unauthorized'}), 401
+    limit = request.args.get('limit', 200, type=int)
+    return jsonify({
+        'summary': tracer.summary(),
+        'spans': tracer.recent(limit=limit, name=request.args.get('name'))
+    })
+
+@app.route('/debug/profile', methods=['GET'])
+def debug_profile():
+    """Amostra a thread do bot por N segundos e devolve pilhas colapsadas (flamegraph)"""
+    if not debug_allowed():
+        return jsonify({'error': 'unauthorized'}), 401
+    bot_thread = watchdog.thread if watchdog else None
+    if bot_thread is None or not bot_thread.is_alive():
+        return jsonify({'error': 'thread do bot não está rodando'}), 503
+    seconds = min(max(request.args.get('seconds', 10, type=float), 0.1), 60)
+    interval = min(max(request.args.get('interval_ms', 5, type=float), 1), 100) / 1000
+    stacks = sample_stacks(bot_thread.ident, seconds, interval)
+    return Response(collapse(stacks), mimetype='text/plain')
+
+@app.route('/debug/memory', methods=['GET'])
+def debug_memory():
+    """RSS ao longo do tempo, estado do bot e top de alocações (tracemalloc).
+
+    ?start=1 liga o tracemalloc (com ?frames=N), ?stop=1 desliga, ?diff=1 mostra o
+    crescimento desde que foi ligado, ?group_by=lineno|filename|traceback
+    """
+    if not debug_allowed():
+        return jsonify({'error': 'unauthorized'}), 401
+    if request.args.get('stop') == '1':
+        memory.stop_tracing()
+    elif request.args.get('start') == '1':
+        memory.start_tracing(frames=min(max(request.args.get('frames', 1, type=int), 1), 25))
+    group_by = request.args.get('group_by', 'lineno')
+    if group_by not in ('lineno', 'filename', 'traceback'):
+        return jsonify({'error': 'group_by inválido'}), 400
+    memory.sample(force=True)
+    report = memory.report(
+        limit=min(max(request.args.get('limit', 20, type=int), 1), 200),
+        group_by=group_by,
+        diff=request.args.get('diff') == '1'
+    )
+    report['bot'] = bot.memory_state() if bot else None
+    return jsonify(report)
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Relê a configuração (env + BOT_CONFIG_FILE); aplicada pela thread do bot em seguida.
+
+    Exige ADMIN_TOKEN (Bearer); sem ele definido o endpoint fica desligado.
+    """
+    token = os.getenv('ADMIN_TOKEN', '')
+    given = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not token or not hmac.compare_digest(given, token):
+        return jsonify({'error': 'unauthorized'}), 401
+    if bot is None:
+        return jsonify({'error': 'bot não inicializado'}), 503
+    changed = bot.config.reload('admin')
+    result = bot.config.stats()
+    if changed is None:
+        return jsonify(result), 400
+    return jsonify(dict(result, changed=sorted(changed), applied_version=bot.applied_config_version))
+
+def publish_liveness(liveness):
+    """Chamado pelo watchdog a cada verificação: bot_running reflete a thread de verdade"""
+    bot_status.publish(bot_running=liveness['alive'], watchdog=liveness)
 
 def init_bot():
     """Inicializa o bot para Railway"""
-    global bot, bot_status
+    global bot, watchdog
     
     try:
         logging.info("Iniciando bot para Railway...")
@@ -537,21 +1206,30 @@ def init_bot():
         if not bot.authenticate():
             raise Exception("Falha na autenticação")
         
-        # Iniciar em thread separada
-        bot_thread = Thread(target=bot.run_bot_loop, daemon=True)
-        bot_thread.start()
+        # Iniciar em thread separada, supervisionada pelo watchdog
+        watchdog = BotWatchdog(
+            bot,
+            check_interval=float(os.getenv('WATCHDOG_INTERVAL_SEC', '30')),
+            on_change=publish_liveness
+        )
+        if bot.shards:
+            bot.sync_shards()
+            bot.shards.start_heartbeat(float(os.getenv('SHARD_HEARTBEAT_SEC', '30')))
+            atexit.register(bot.shards.leave)
+        watchdog.start()
+        bot.config.start_watching(float(os.getenv('CONFIG_POLL_SEC', '30')))
         
-        bot_status['running'] = True
+        bot_status.publish(bot_running=True, daily_limit=bot.daily_limit, config=bot.config_state())
         logging.info("Bot inicializado com sucesso!")
         
     except Exception as e:
         error_msg = f"Erro na inicialização: {e}"
         logging.error(error_msg)
-        bot_status['error'] = error_msg
-        bot_status['running'] = False
+        bot_status.publish(error=error_msg, bot_running=False)
 
-# Inicializar bot automaticamente
-init_bot()
+# Inicializar bot automaticamente (BOT_AUTOSTART=0 para importar sem iniciar, ex: simulação)
+if os.getenv('BOT_AUTOSTART', '1') == '1':
+    init_bot()
 
 # Para execução local
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Watchdog da thread do bot
+Detecta thread morta ou heartbeat atrasado e sobe um worker novo sobre a mesma
+instância do bot (estado em memória preservado)
+"""
+
+import logging
+import threading
+import time
+
+
+class WorkerSuperseded(BaseException):
+    """A thread foi substituída pelo watchdog e deve sair sem fazer mais nada.
+
+    Herda de BaseException para atravessar o `except Exception` do loop.
+    """
+
+
+class BotWatchdog:
+    """Supervisiona o worker do bot e o reinicia quando ele trava ou morre"""
+
+    def __init__(self, bot, check_interval=30, on_change=None):
+        self.bot = bot
+        self.check_interval = check_interval
+        self.on_change = on_change
+        self.thread = None
+        self.restarts = 0
+        self.last_restart_reason = None
+        self.last_restart_at = None
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def start_worker(self):
+        """Sobe um worker novo; o anterior (se vivo) passa a ser ignorado"""
+        self.bot.worker_generation += 1
+        generation = self.bot.worker_generation
+        self.bot.heartbeat(self.bot.heartbeat_grace_sec)
+        self.thread = threading.Thread(
+            target=self._run_worker, args=(generation,), daemon=True,
+            name=f"bot-worker-{generation}"
+        )
+        self.thread.start()
+        return self.thread
+
+    def _run_worker(self, generation):
+        try:
+            self.bot.run_bot_loop(generation=generation)
+        except WorkerSuperseded:
+            logging.info(f"Worker {generation} substituído encerrou")
+        except BaseException as e:
+            logging.error(f"Worker {generation} morreu: {e!r}")
+            raise
+
+    def check(self):
+        """Verifica o worker; reinicia se necessário. Devolve o motivo do restart ou None"""
+        reason = None
+        if self.thread is None or not self.thread.is_alive():
+            reason = 'thread morta'
+        elif self.bot.heartbeat_overdue():
+            reason = f"heartbeat atrasado {self.bot.heartbeat_age():.0f}s"
+        if reason:
+            self.restarts += 1
+            self.last_restart_reason = reason
+            self.last_restart_at = time.time()
+            logging.error(f"Watchdog: {reason}; reiniciando worker (restart #{self.restarts})")
+            self.start_worker()
+        if self.on_change:
+            self.on_change(self.liveness())
+        return reason
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Erro no watchdog: {e}")
+
+    def start(self):
+        self.start_worker()
+        self._watcher = threading.Thread(target=self._watch, daemon=True, name="bot-watchdog")
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_alive(self):
+        return (self.thread is not None and self.thread.is_alive()
+                and not self.bot.heartbeat_overdue())
+
+    def liveness(self):
+        return {
+            'alive': self.is_alive(),
+            'worker': self.thread.name if self.thread else None,
+            'heartbeat_age_sec': round(self.bot.heartbeat_age(), 1),
+            'restarts': self.restarts,
+            'last_restart_reason': self.last_restart_reason,
+            'last_restart_at': self.last_restart_at,
+        }
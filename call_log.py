@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log binário append-only de chamadas à API e posts
+Registros de largura fixa (42 bytes, little-endian) em um arquivo por dia UTC,
+legíveis direto com numpy.memmap (ver query_call_log.py)
+"""
+
+import os
+import re
+import struct
+import threading
+from datetime import datetime, timezone
+
+# ts, kind, method, endpoint, status, latency_ms, rate_remaining, bytes, tweet_id, target_id
+RECORD = struct.Struct('<dBBHHfiIQQ')
+RECORD_FIELDS = [
+    ('ts', '<f8'), ('kind', 'u1'), ('method', 'u1'), ('endpoint', '<u2'), ('status', '<u2'),
+    ('latency_ms', '<f4'), ('rate_remaining', '<i4'), ('bytes', '<u4'),
+    ('tweet_id', '<u8'), ('target_id', '<u8'),
+]
+
+KIND_CALL = 0
+KIND_POST = 1
+KIND_POST_FAILED = 2
+KINDS = {KIND_CALL: 'call', KIND_POST: 'post', KIND_POST_FAILED: 'post_failed'}
+
+METHODS = {'GET': 0, 'POST': 1, 'DELETE': 2, 'PUT': 3}
+
+# Códigos fixos: nunca renumerar, só acrescentar (os arquivos antigos dependem deles)
+ENDPOINTS = {
+    'other': 0,
+    '/users/me': 1,
+    '/users/:id/tweets': 2,
+    '/tweets/search/recent': 3,
+    '/tweets': 4,
+    '/users': 5,
+    '/users/:id/mentions': 6,
+}
+
+_ID_SEGMENT_RE = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_code(path):
+    """Normaliza o caminho (IDs viram :id) e devolve o código do endpoint"""
+    path = path.split('?', 1)[0]
+    if path.startswith('/2/'):
+        path = path[2:]
+    return ENDPOINTS.get(_ID_SEGMENT_RE.sub('/:id', path), 0)
+
+
+def log_filename(ts):
+    return f"calls-{datetime.fromtimestamp(ts, tz=timezone.utc):%Y%m%d}.bin"
+
+
+def _to_u64(value):
+    try:
+        return int(value) if value else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class CallLog:
+    """Escreve um registro por chamada/post; rotaciona o arquivo por dia (UTC)"""
+
+    def __init__(self, directory, clock):
+        self.directory = directory
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._file = None
+        self._filename = None
+        self.records = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, ts, kind, method, endpoint, status, latency_ms, rate_remaining, size,
+               tweet_id=0, target_id=0):
+        record = RECORD.pack(ts, kind, METHODS.get(method, 255), endpoint, status,
+                             latency_ms, rate_remaining, min(size, 0xFFFFFFFF),
+                             _to_u64(tweet_id), _to_u64(target_id))
+        filename = log_filename(ts)
+        with self._lock:
+            if filename != self._filename:
+                if self._file:
+                    self._file.close()
+                self._file = open(os.path.join(self.directory, filename), 'ab')
+                self._filename = filename
+            self._file.write(record)
+            self._file.flush()
+            self.records += 1
+
+    def record_call(self, method, path, status, latency_sec, rate_remaining=None, size=0):
+        try:
+            remaining = int(rate_remaining) if rate_remaining is not None else -1
+        except (TypeError, ValueError):
+            remaining = -1
+        self._write(self.clock.time(), KIND_CALL, method, endpoint_code(path), status,
+                    latency_sec * 1000, remaining, size)
+
+    def record_post(self, tweet_id, reply_to=None, status=201, ok=True):
+        self._write(self.clock.time(), KIND_POST if ok else KIND_POST_FAILED, 'POST',
+                    ENDPOINTS['/tweets'], status, 0.0, -1, 0, tweet_id, reply_to)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+                self._filename = None
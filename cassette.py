@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gravação e reprodução de tráfego HTTP (cassetes)
+Sessões plugáveis no HTTPTransport: CassetteRecorder grava as trocas reais com a API
+(sem credenciais) e CassettePlayer as reproduz de forma determinística.
+Uso: python cassette.py arquivo.jsonl.gz   (mostra o resumo de um cassete)
+"""
+
+import gzip
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from json import dumps, loads
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# Cabeçalhos de resposta que interessam para reprodução (rate limit e tipo)
+KEPT_RESPONSE_HEADERS = ('content-type', 'x-rate-limit-limit', 'x-rate-limit-remaining',
+                         'x-rate-limit-reset')
+# Parâmetros que mudam a cada execução e não entram na chave de reprodução
+VOLATILE_PARAMS = ('start_time', 'end_time')
+_SECRET_MARKERS = ('token', 'secret', 'oauth', 'key', 'password', 'authorization')
+
+
+class CassetteMiss(Exception):
+    """Requisição sem gravação correspondente no cassete"""
+
+
+def _is_secret(name):
+    name = name.lower()
+    return any(marker in name for marker in _SECRET_MARKERS) and name != 'pagination_token'
+
+
+def scrub_params(params):
+    """Remove valores de parâmetros que parecem credenciais"""
+    return {
+        str(k): ('***' if _is_secret(str(k)) else str(v))
+        for k, v in (params or {}).items()
+    }
+
+
+def scrub_url(url):
+    parsed = urlparse(url)
+    if not parsed.query:
+        return url
+    query = urlencode(scrub_params(dict(parse_qsl(parsed.query))))
+    return urlunparse(parsed._replace(query=query))
+
+
+def request_key(method, url, params):
+    """Chave de reprodução: método, caminho e parâmetros estáveis"""
+    stable = tuple(sorted(
+        (k, v) for k, v in scrub_params(params).items() if k not in VOLATILE_PARAMS
+    ))
+    return (method, urlparse(url).path, stable)
+
+
+class ReplayedResponse:
+    """Subconjunto de requests.Response reconstruído a partir do cassete"""
+
+    def __init__(self, status_code, text, headers):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode()
+        self.headers = headers
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return loads(self.text)
+
+
+def load_cassette(path):
+    """Trocas gravadas; um último registro truncado (processo morto na escrita) é ignorado"""
+    opener = gzip.open if path.endswith('.gz') else open
+    entries = []
+    with opener(path, 'rt', encoding='utf-8') as f:
+        try:
+            for line in f:
+                if line.strip():
+                    entries.append(loads(line))
+        except (EOFError, gzip.BadGzipFile, ValueError):
+            pass
+    return entries
+
+
+class CassetteRecorder:
+    """Sessão que repassa para a sessão real e grava cada troca (sem Authorization).
+
+    Em .gz cada troca é um membro gzip completo, escrito e descarregado na hora:
+    o arquivo continua legível mesmo se o processo morrer sem close().
+    """
+
+    def __init__(self, session, path, clock=time.monotonic):
+        self.session = session
+        self.path = path
+        self.clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._compress = path.endswith('.gz')
+        self._file = open(path, 'ab')
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=None):
+        started = self.clock()
+        response = self.session.request(method, url, headers=headers, params=params,
+                                        json=json, timeout=timeout)
+        entry = {
+            't': round(started - self._started, 3),
+            'd': round(self.clock() - started, 3),
+            'm': method,
+            'u': scrub_url(url),
+            'p': scrub_params(params),
+            'b': json,
+            's': response.status_code,
+            'h': {k: response.headers[k] for k in KEPT_RESPONSE_HEADERS if k in response.headers},
+            'r': response.text,
+        }
+        data = (dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        if self._compress:
+            data = gzip.compress(data)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(data)
+                self._file.flush()
+        return response
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class CassettePlayer:
+    """Sessão que responde a partir de um cassete gravado.
+
+    As respostas são casadas por método, caminho e parâmetros estáveis, na
+    ordem em que foram gravadas. `realtime=True` reproduz também a duração
+    original de cada chamada (via `sleep`, que pode ser de um relógio virtual).
+    Com `strict=False`, uma chave esgotada repete a última resposta.
+    """
+
+    def __init__(self, entries, realtime=False, sleep=time.sleep, strict=True):
+        if isinstance(entries, str):
+            entries = load_cassette(entries)
+        self.realtime = realtime
+        self.sleep = sleep
+        self.strict = strict
+        self._queues = defaultdict(deque)
+        self._last = {}
+        for entry in entries:
+            self._queues[request_key(entry['m'], entry['u'], entry['p'])].append(entry)
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=None):
+        key = request_key(method, url, params)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            elif not self.strict and key in self._last:
+                entry = self._last[key]
+            else:
+                raise CassetteMiss(f"{method} {urlparse(url).path} {dict(key[2])}")
+            self.calls[(method, key[1])] += 1
+        if self.realtime and entry.get('d'):
+            self.sleep(entry['d'])
+        return ReplayedResponse(entry['s'], entry['r'], entry.get('h', {}))
+
+    def remaining(self):
+        return sum(len(q) for q in self._queues.values())
+
+
+def summarize(path):
+    entries = load_cassette(path)
+    print(f"📼 {path}: {len(entries)} trocas")
+    by_route = Counter((e['m'], urlparse(e['u']).path, e['s']) for e in entries)
+    for (method, route, status), count in sorted(by_route.items()):
+        print(f"   {method:4} {route:35} {status} x{count}")
+    if entries:
+        print(f"⏱️  Duração gravada: {entries[-1]['t'] + entries[-1]['d']:.1f}s")
+
+
+if __name__ == "__main__":
+    for cassette_path in sys.argv[1:]:
+        summarize(cassette_path)
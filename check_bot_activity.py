@@ -2,8 +2,11 @@
 """
 🔍 VERIFICAR ATIVIDADE DO BOT NO TWITTER
 Verifica se o bot @drtrafeg0 está ativo e funcionando
+Uso: python check_bot_activity.py                      (consulta a API do X, gasta quota)
+     python check_bot_activity.py --from-bot URL       (lê /activity do bot em execução)
 """
 
+import argparse
 import requests
 import json
 import os
@@ -208,5 +211,77 @@ def check_bot_activity():
     print(f"\n{'='*50}")
     print("✅ VERIFICAÇÃO CONCLUÍDA")
 
+def check_bot_activity_from_bot(bot_url, limit=100):
+    """Verifica a atividade lendo o /activity do próprio bot (sem chamar a API do X)"""
+    print("🔍 VERIFICAÇÃO DE ATIVIDADE DO BOT (via /activity)")
+    print("=" * 50)
+    print(f"⏰ Verificação em: {datetime.now().strftime('%H:%M:%S')}")
+    print(f"🌐 Bot: {bot_url}")
+    print()
+
+    try:
+        response = requests.get(f"{bot_url.rstrip('/')}/activity", params={'limit': limit}, timeout=30)
+        result = response.json()
+    except Exception as e:
+        print(f"   ❌ Erro ao consultar o bot: {e}")
+        return
+    if response.status_code != 200:
+        print(f"   ❌ Erro {response.status_code}: {result.get('error', response.text)}")
+        return
+
+    summary = result.get('summary', {})
+    entries = result.get('activity', [])
+    now = datetime.now().timestamp()
+    posted = [e for e in entries if e['action'] == 'posted']
+    failed = [e for e in entries if e['action'] == 'failed']
+    recent_posts = [e for e in posted if now - e['ts'] <= 86400]
+
+    print(f"   ✅ Bot: @{result.get('bot_username', 'N/A')}")
+    print(f"   📊 Posts hoje: {result.get('daily_posts')}/{result.get('daily_limit')}")
+    print(f"   🗂️  Ações em memória: {summary.get('buffered', 0)} (totais: {summary.get('totals', {})})")
+
+    print("\n📈 ANÁLISE DE ATIVIDADE:")
+    print(f"   🕐 Respostas nas últimas 24h: {len(recent_posts)}")
+    print(f"   ⚠️  Falhas recentes: {len(failed)}")
+
+    if entries:
+        print("\n📋 ATIVIDADE RECENTE:")
+        for entry in entries[:10]:
+            when = datetime.fromtimestamp(entry['ts']).strftime('%H:%M:%S')
+            if entry['action'] == 'posted':
+                print(f"   💬 RESPOSTA | {when} | {entry.get('source') or '-'} → {entry.get('reply_to')} "
+                      f"(tweet {entry.get('tweet_id')})")
+            else:
+                print(f"   ❌ FALHA    | {when} | {entry.get('source') or '-'} → {entry.get('reply_to')} "
+                      f"| {entry.get('reason')}")
+
+    print(f"\n🤖 STATUS DO BOT:")
+    last_post_ts = summary.get('last_post_ts')
+    if last_post_ts:
+        last_activity = (now - last_post_ts) / 3600
+        if last_activity < 1:
+            print("   🟢 ATIVO - Atividade na última hora")
+        elif last_activity < 6:
+            print("   🟡 MODERADO - Atividade nas últimas 6 horas")
+        elif last_activity < 24:
+            print("   🟠 BAIXO - Atividade nas últimas 24 horas")
+        else:
+            print("   🔴 INATIVO - Sem atividade recente")
+        print(f"   ⏰ Última resposta: {last_activity:.1f}h atrás")
+    else:
+        print("   🔴 NENHUMA RESPOSTA DESDE QUE O BOT INICIOU")
+
+    print(f"\n{'='*50}")
+    print("✅ VERIFICAÇÃO CONCLUÍDA")
+
 if __name__ == "__main__":
-    check_bot_activity()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Verifica a atividade do bot")
+    parser.add_argument('--from-bot', metavar='URL',
+                        help="URL do bot em execução (lê /activity em vez da API do X)")
+    parser.add_argument('--limit', type=int, default=100, help="ações a buscar em --from-bot")
+    args = parser.parse_args()
+
+    if args.from_bot:
+        check_bot_activity_from_bot(args.from_bot, args.limit)
+    else:
+        check_bot_activity()
\ No newline at end of file
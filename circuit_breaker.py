@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Circuit breaker por família de endpoint (auth, timeline, search, post)
+Abre após falhas seguidas, corta as chamadas enquanto aberto e testa com uma única
+sonda no estado meio-aberto
+"""
+
+import os
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+FAMILIES = ('auth', 'timeline', 'search', 'post', 'users')
+
+
+class CircuitOpenError(Exception):
+    """Chamada cortada porque o circuito da família está aberto"""
+
+
+def is_failure_status(status_code):
+    """5xx, 400 e 401 indicam que repetir a chamada não adianta agora.
+
+    429 não conta: o rate limit já tem tratamento próprio e prova que a API responde.
+    """
+    return status_code >= 500 or status_code in (400, 401)
+
+
+class CircuitBreaker:
+    """Máquina de estados fechado → aberto → meio-aberto → fechado"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=300, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.short_circuited = 0
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True se a chamada pode sair; no meio-aberto libera só uma sonda"""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._probe_in_flight = False
+
+    def retry_in(self):
+        """Segundos até a próxima sonda (0 se não estiver aberto)"""
+        if self.state != OPEN:
+            return 0
+        return max(self.reset_timeout - (self.clock() - self.opened_at), 0)
+
+    def info(self):
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'retry_in_sec': round(self.retry_in()),
+            'times_opened': self.times_opened,
+            'short_circuited': self.short_circuited,
+        }
+
+
+class BreakerRegistry:
+    """Um breaker por família, configurado por variáveis de ambiente.
+
+    BREAKER_FAILURES / BREAKER_RESET_SEC valem para todas as famílias e
+    podem ser sobrescritas por família, ex: BREAKER_FAILURES_AUTH=2.
+    """
+
+    def __init__(self, clock=time.monotonic, env=os.environ):
+        default_failures = int(env.get('BREAKER_FAILURES', '5'))
+        default_reset = float(env.get('BREAKER_RESET_SEC', '300'))
+        self.breakers = {}
+        for family in FAMILIES:
+            suffix = family.upper()
+            self.breakers[family] = CircuitBreaker(
+                family,
+                failure_threshold=int(env.get(f'BREAKER_FAILURES_{suffix}', default_failures)),
+                reset_timeout=float(env.get(f'BREAKER_RESET_SEC_{suffix}', default_reset)),
+                clock=clock,
+            )
+
+    def __getitem__(self, family):
+        return self.breakers[family]
+
+    def snapshot(self):
+        return {family: breaker.info() for family, breaker in self.breakers.items()}
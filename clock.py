@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Relógios injetáveis do bot
+SystemClock usa o tempo real; VirtualClock avança instantaneamente para simulações
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+
+class SystemClock:
+    """Relógio real (padrão em produção)"""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def now(self):
+        """Hora local sem fuso (mesma semântica de datetime.now())"""
+        return datetime.now()
+
+    def utcnow(self):
+        return datetime.now(timezone.utc)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait(self, event, seconds):
+        """Dorme até `seconds` ou até o evento ser ligado; devolve True se acordou pelo evento"""
+        return event.wait(seconds)
+
+
+class VirtualClock:
+    """Relógio simulado: sleep() só avança o tempo, sem esperar.
+
+    Ao passar de `stop_at` (epoch) chama `on_stop` uma única vez; a simulação
+    usa isso para encerrar o loop do bot.
+    """
+
+    def __init__(self, start=None, stop_at=None, on_stop=None):
+        self._t = float(time.time() if start is None else start)
+        self.start = self._t
+        self.stop_at = stop_at
+        self.on_stop = on_stop
+        self.slept = 0.0
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self._t
+
+    def monotonic(self):
+        return self._t
+
+    def now(self):
+        return datetime.fromtimestamp(self._t)
+
+    def utcnow(self):
+        return datetime.fromtimestamp(self._t, tz=timezone.utc)
+
+    def advance(self, seconds):
+        with self._lock:
+            self._t += max(seconds, 0)
+            crossed = (
+                self.stop_at is not None and not self._stopped and self._t >= self.stop_at
+            )
+            if crossed:
+                self._stopped = True
+        if crossed and self.on_stop:
+            self.on_stop()
+
+    def sleep(self, seconds):
+        self.slept += max(seconds, 0)
+        self.advance(seconds)
+
+    def wait(self, event, seconds):
+        """Em tempo virtual ninguém liga o evento durante a espera: dorme o tempo todo"""
+        if event.is_set():
+            return True
+        self.sleep(seconds)
+        return False
+
+    @property
+    def elapsed(self):
+        return self._t - self.start
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Ambiente comum dos testes
+Os testes importam bot_railway_optimized no topo do módulo, então as variáveis
+precisam estar definidas quando o pytest carrega este arquivo (antes da coleta):
+credenciais fictícias, bot sem autostart e sem log de chamadas/journal em disco.
+Rode os testes pelo pytest (python -m pytest test_quota.py), não direto pelo python.
+"""
+
+import os
+
+TEST_ENV = {
+    'API_KEY': 'teste',
+    'API_KEY_SECRET': 'teste',
+    'ACCESS_TOKEN': 'teste',
+    'ACCESS_TOKEN_SECRET': 'teste',
+    'BEARER_TOKEN': 'teste',
+    'CALL_LOG_DIR': '',
+    'POST_JOURNAL_FILE': '',
+}
+
+for _var, _value in TEST_ENV.items():
+    os.environ.setdefault(_var, _value)
+os.environ['BOT_AUTOSTART'] = '0'
+
+
+def pytest_addoption(parser):
+    parser.addoption('--record-cassette', action='store_true',
+                     help='regrava o cassete do teste de regressão a partir da API falsa')
+
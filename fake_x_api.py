@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+API do X falsa, em memória
+Serve menções, comentários e timeline a partir de uma linha do tempo roteirizada,
+respeitando um relógio (real ou virtual). Usada como `session` do HTTPTransport.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from collections import Counter, deque
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from requests.exceptions import ReadTimeout
+
+from tweet_records import TWITTER_EPOCH_MS, snowflake_time
+
+# Janela da busca recente
+SEARCH_WINDOW_SEC = 7 * 86400
+# Por quanto tempo a API recusa um texto igual a outro post da conta (403 duplicado)
+DUPLICATE_WINDOW_SEC = 86400
+
+_CONVERSATION_RE = re.compile(r'conversation_id:(\d+)')
+_MENTION_RE = re.compile(r'@(\w+)')
+_FROM_EXCLUDE_RE = re.compile(r'-from:(\w+)')
+
+
+def iso_z(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def parse_rfc3339(value):
+    """Aceita apenas o formato exigido pela API (YYYY-MM-DDTHH:mm:ss[.fff]Z)"""
+    if not isinstance(value, str) or not value.endswith('Z'):
+        raise ValueError(value)
+    return datetime.fromisoformat(value[:-1] + '+00:00').timestamp()
+
+
+class FakeResponse:
+    """Subconjunto de requests.Response usado pelo bot"""
+
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload if payload is not None else {}
+        self.text = json.dumps(self._payload)
+        self.content = self.text.encode()
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _Timeline:
+    """Tweets em ordem de criação com índice de tempo para busca por bisect"""
+
+    __slots__ = ('times', 'ids', 'head')
+
+    def __init__(self):
+        self.times = []
+        self.ids = []
+        self.head = 0  # início lógico (itens antes dele já expiraram)
+
+    def append(self, ts, tweet_id):
+        self.times.append(ts)
+        self.ids.append(tweet_id)
+
+    def prune(self, cutoff):
+        self.head = max(self.head, bisect_right(self.times, cutoff, self.head))
+        if self.head > 1024 and self.head * 2 > len(self.ids):
+            del self.times[:self.head]
+            del self.ids[:self.head]
+            self.head = 0
+
+    def __len__(self):
+        return len(self.ids) - self.head
+
+    def visible(self, now):
+        """IDs já criados até `now`, do mais novo para o mais velho"""
+        end = bisect_right(self.times, now, self.head)
+        for index in range(end - 1, self.head - 1, -1):
+            yield self.ids[index]
+
+
+class FakeXAPI:
+    """Servidor falso da API v2 (rotas usadas pelo bot)"""
+
+    def __init__(self, clock, username='drtrafeg0', user_id='1000', post_limit=None,
+                 keep_tweets_sec=SEARCH_WINDOW_SEC):
+        self.clock = clock
+        self.username = username
+        self.user_id = str(user_id)
+        # (janela_em_segundos, máximo) para simular o limite de posts da API
+        self.post_limit = post_limit
+        self.keep_tweets_sec = keep_tweets_sec
+        self.tweets = {}
+        self.users = {}
+        self.mentions = _Timeline()
+        self.own = _Timeline()
+        self.conversations = {}
+        self.posted = []  # (ts, in_reply_to, id) dos posts do bot
+        self._post_times = deque()
+        self._seq = 0
+        self.calls = Counter()
+        self.post_failures = deque()  # falhas injetadas nos próximos POST /tweets
+        self.add_user(self.user_id, username)
+
+    # ----- montagem da linha do tempo -----
+
+    def _new_id(self, ts):
+        self._seq = (self._seq + 1) & 0x3FFFFF
+        return str(((int(ts * 1000) - TWITTER_EPOCH_MS) << 22) | self._seq)
+
+    def add_user(self, user_id, username=None, followers=0, verified=False):
+        user_id = str(user_id)
+        self.users[user_id] = {
+            'id': user_id,
+            'username': username or f"user{user_id}",
+            'name': username or f"User {user_id}",
+            'verified': verified,
+            'public_metrics': {'followers_count': followers, 'following_count': 0,
+                               'tweet_count': 0, 'listed_count': 0},
+        }
+        return self.users[user_id]
+
+    def _add_tweet(self, ts, author_id, text, conversation_id=None, in_reply_to_user_id=None,
+                   replied_to=None):
+        author_id = str(author_id)
+        if author_id not in self.users:
+            self.add_user(author_id)
+        tweet_id = self._new_id(ts)
+        tweet = {
+            'id': tweet_id,
+            'text': text,
+            'author_id': author_id,
+            'created_at': iso_z(ts),
+            'conversation_id': conversation_id or tweet_id,
+        }
+        if in_reply_to_user_id:
+            tweet['in_reply_to_user_id'] = str(in_reply_to_user_id)
+        if replied_to:
+            tweet['referenced_tweets'] = [{'type': 'replied_to', 'id': replied_to}]
+        self.tweets[tweet_id] = (ts, tweet)
+        self.conversations.setdefault(tweet['conversation_id'], _Timeline()).append(ts, tweet_id)
+        if author_id == self.user_id:
+            self.own.append(ts, tweet_id)
+        return tweet_id
+
+    def add_own_post(self, ts, text="Post do bot"):
+        return self._add_tweet(ts, self.user_id, text)
+
+    def add_mention(self, ts, author_id, text=None):
+        tweet_id = self._add_tweet(ts, author_id, text or f"@{self.username} gm!")
+        self.mentions.append(ts, tweet_id)
+        return tweet_id
+
+    def add_reply(self, ts, post_id, author_id, text="Comentário", in_reply_to_user_id=None):
+        conversation_id = self.tweets[post_id][1]['conversation_id']
+        return self._add_tweet(
+            ts, author_id, text, conversation_id=conversation_id,
+            in_reply_to_user_id=in_reply_to_user_id or self.user_id, replied_to=post_id
+        )
+
+    def fail_next_posts(self, *modes):
+        """Injeta falhas nos próximos POST /tweets, uma por chamada:
+        'timeout_before' (nada criado), 'timeout_after' (criado, cliente não sabe),
+        '503' (nada criado) e '503_after' (criado, mas responde 503)
+        """
+        self.post_failures.extend(modes)
+
+    def prune(self):
+        """Descarta tweets que já saíram da janela de busca (memória limitada)"""
+        cutoff = self.clock.time() - self.keep_tweets_sec
+        for timeline in [self.mentions, self.own, *self.conversations.values()]:
+            timeline.prune(cutoff)
+        for conversation_id in [c for c, t in self.conversations.items() if not len(t)]:
+            del self.conversations[conversation_id]
+        for tweet_id in [t for t, (ts, _) in self.tweets.items() if ts < cutoff]:
+            del self.tweets[tweet_id]
+
+    # ----- interface de requests.Session -----
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=None):
+        path = urlparse(url).path
+        if path.startswith('/2'):
+            path = path[2:]
+        params = params or {}
+        if method == 'GET' and path == '/users/me':
+            return self._route('/users/me', self._users_me)
+        if method == 'GET' and path == '/tweets/search/recent':
+            return self._route('/tweets/search/recent', self._search, params)
+        if method == 'GET' and path == '/users':
+            return self._route('/users', self._users_lookup, params)
+        if method == 'GET' and path.startswith('/users/') and path.endswith('/tweets'):
+            return self._route('/users/:id/tweets', self._user_tweets, path.split('/')[2], params)
+        if method == 'POST' and path == '/tweets':
+            return self._route('/tweets', self._create_tweet, json or {})
+        return FakeResponse(404, {'title': 'Not Found Error', 'detail': path})
+
+    def _route(self, name, handler, *args):
+        self.calls[name] += 1
+        return handler(*args)
+
+    # ----- rotas -----
+
+    def _users_me(self):
+        user = self.users[self.user_id]
+        return FakeResponse(200, {'data': {'id': user['id'], 'name': user['name'],
+                                           'username': user['username']}})
+
+    def _users_lookup(self, params):
+        """GET /2/users?ids= (até 100); IDs desconhecidos vêm em errors, como na API real"""
+        ids = [i for i in params.get('ids', '').split(',') if i]
+        if not ids or len(ids) > 100:
+            return FakeResponse(400, {'title': 'Invalid Request',
+                                      'detail': 'ids deve ter entre 1 e 100 itens'})
+        body = {}
+        found = [self.users[i] for i in ids if i in self.users]
+        if found:
+            body['data'] = found
+        unknown = [i for i in ids if i not in self.users]
+        if unknown:
+            body['errors'] = [{'value': i, 'resource_type': 'user', 'title': 'Not Found Error'}
+                              for i in unknown]
+        return FakeResponse(200, body)
+
+    def _page(self, ids, params, extra_filter=None):
+        """Aplica since_id/start_time/max_results e paginação (IDs do mais novo ao mais velho)"""
+        max_results = int(params.get('max_results', 10))
+        since_id = int(params['since_id']) if params.get('since_id') else None
+        start_ts = parse_rfc3339(params['start_time']) if params.get('start_time') else None
+        skip = int(params.get('pagination_token') or params.get('next_token') or 0)
+        window_start = self.clock.time() - SEARCH_WINDOW_SEC
+        page, seen, more = [], 0, False
+        for tweet_id in ids:
+            ts, tweet = self.tweets[tweet_id]
+            if ts < window_start or (start_ts is not None and ts < start_ts):
+                break
+            if since_id is not None and int(tweet_id) <= since_id:
+                break
+            if extra_filter and not extra_filter(tweet):
+                continue
+            seen += 1
+            if seen <= skip:
+                continue
+            if len(page) == max_results:
+                more = True
+                break
+            page.append(tweet)
+        body = {'meta': {'result_count': len(page)}}
+        if page:
+            body['data'] = page
+            body['meta']['newest_id'] = page[0]['id']
+            body['meta']['oldest_id'] = page[-1]['id']
+        if more:
+            body['meta']['next_token'] = str(skip + len(page))
+        if page and 'author_id' in params.get('expansions', ''):
+            authors = {t['author_id'] for t in page}
+            body['includes'] = {'users': [self.users[a] for a in sorted(authors)]}
+        return FakeResponse(200, body)
+
+    def _search(self, params):
+        query = params.get('query', '')
+        try:
+            now = self.clock.time()
+            excluded = {m.lower() for m in _FROM_EXCLUDE_RE.findall(query)}
+            not_excluded = None
+            if excluded:
+                def not_excluded(tweet):
+                    return self.users[tweet['author_id']]['username'].lower() not in excluded
+            conversation = _CONVERSATION_RE.search(query)
+            if conversation:
+                timeline = self.conversations.get(conversation.group(1))
+                ids = timeline.visible(now) if timeline else iter(())
+                return self._page(ids, params, not_excluded)
+            mention = _MENTION_RE.search(query)
+            if mention and mention.group(1).lower() == self.username.lower():
+                return self._page(self.mentions.visible(now), params, not_excluded)
+            return FakeResponse(200, {'meta': {'result_count': 0}})
+        except ValueError as e:
+            return FakeResponse(400, {'title': 'Invalid Request', 'detail': str(e)})
+
+    def _user_tweets(self, user_id, params):
+        if user_id != self.user_id:
+            return FakeResponse(200, {'meta': {'result_count': 0}})
+        exclude = params.get('exclude', '')
+        only_posts = None
+        if 'replies' in exclude:
+            def only_posts(tweet):
+                return 'in_reply_to_user_id' not in tweet
+        try:
+            return self._page(self.own.visible(self.clock.time()), params, only_posts)
+        except ValueError as e:
+            return FakeResponse(400, {'title': 'Invalid Request', 'detail': str(e)})
+
+    def _create_tweet(self, payload):
+        failure = self.post_failures.popleft() if self.post_failures else None
+        if failure == 'timeout_before':
+            raise ReadTimeout("Read timed out (simulado)")
+        if failure == '503':
+            return FakeResponse(503, {'title': 'Service Unavailable'})
+        response = self._create_tweet_ok(payload)
+        if failure == 'timeout_after':
+            raise ReadTimeout("Read timed out (simulado, tweet criado)")
+        if failure == '503_after':
+            return FakeResponse(503, {'title': 'Service Unavailable'})
+        return response
+
+    def _create_tweet_ok(self, payload):
+        now = self.clock.time()
+        text = payload.get('text', '')
+        reply_to = (payload.get('reply') or {}).get('in_reply_to_tweet_id')
+        if self.post_limit:
+            window, limit = self.post_limit
+            while self._post_times and self._post_times[0] <= now - window:
+                self._post_times.popleft()
+            if len(self._post_times) >= limit:
+                reset = int(self._post_times[0] + window)
+                return FakeResponse(429, {'title': 'Too Many Requests'}, {
+                    'x-rate-limit-limit': str(limit),
+                    'x-rate-limit-remaining': '0',
+                    'x-rate-limit-reset': str(reset),
+                })
+        if reply_to and reply_to not in self.tweets:
+            return FakeResponse(400, {'title': 'Invalid Request', 'detail': 'reply target not found'})
+        for ts, _, previous_id in self.posted[-200:]:
+            # Texto repetido é recusado na conta toda, seja qual for o tweet respondido
+            previous = self.tweets.get(previous_id)
+            if ts > now - DUPLICATE_WINDOW_SEC and previous and previous[1]['text'] == text:
+                return FakeResponse(403, {
+                    'title': 'Forbidden',
+                    'detail': 'You are not allowed to create a Tweet with duplicate content.',
+                })
+        if reply_to:
+            target = self.tweets[reply_to][1]
+            tweet_id = self._add_tweet(
+                now, self.user_id, text, conversation_id=target['conversation_id'],
+                in_reply_to_user_id=target['author_id'], replied_to=reply_to
+            )
+        else:
+            tweet_id = self._add_tweet(now, self.user_id, text)
+        self.posted.append((now, reply_to, tweet_id))
+        self._post_times.append(now)
+        return FakeResponse(201, {'data': {'id': tweet_id, 'text': text}})
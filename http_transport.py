@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Camada de transporte HTTP do bot
+Centraliza as chamadas à API do X e coalesce GETs idênticos em andamento (single-flight)
+"""
+
+import atexit
+import os
+import re
+import threading
+
+import requests
+
+_OAUTH_TOKEN_RE = re.compile(r'oauth_token="([^"]*)"')
+
+
+class _Flight:
+    """Requisição em andamento compartilhada entre as threads que pediram a mesma coisa"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        self.waiters = 0
+
+
+class HTTPTransport:
+    """Envia requisições via requests.Session.
+
+    GETs idênticos (mesma URL, parâmetros e credencial) que chegam enquanto
+    um deles ainda está em andamento não saem para a rede: esperam a
+    primeira requisição e recebem a mesma resposta (ou a mesma exceção).
+    """
+
+    def __init__(self, session=None, single_flight=True):
+        self.session = session or requests.Session()
+        self.single_flight = single_flight
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.saved_calls = 0
+
+    @staticmethod
+    def _identity(headers):
+        """Identifica a credencial sem depender do nonce/assinatura do OAuth"""
+        auth = (headers or {}).get('Authorization', '')
+        if auth.startswith('OAuth '):
+            match = _OAUTH_TOKEN_RE.search(auth)
+            return 'oauth:' + (match.group(1) if match else '')
+        return auth
+
+    def _flight_key(self, url, params, headers):
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (url, items, self._identity(headers))
+
+    def _send(self, method, url, **kwargs):
+        with self._lock:
+            self.upstream_calls += 1
+        return self.session.request(method, url, **kwargs)
+
+    def request(self, method, url, headers=None, params=None, json=None, timeout=30):
+        if method != 'GET' or not self.single_flight:
+            return self._send(method, url, headers=headers, params=params, json=json, timeout=timeout)
+
+        key = self._flight_key(url, params, headers)
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                flight.waiters += 1
+                self.saved_calls += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._send(method, url, headers=headers, params=params, timeout=timeout)
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.response
+
+    def get(self, url, headers=None, params=None, timeout=30):
+        return self.request('GET', url, headers=headers, params=params, timeout=timeout)
+
+    def post(self, url, headers=None, json=None, timeout=30):
+        return self.request('POST', url, headers=headers, json=json, timeout=timeout)
+
+    def stats(self):
+        """Contadores para /status"""
+        return {
+            'upstream_calls': self.upstream_calls,
+            'saved_calls': self.saved_calls,
+            'in_flight': len(self._inflight),
+        }
+
+
+def _default_session():
+    """Sessão real; com HTTP_CASSETTE_RECORD=arquivo grava o tráfego em cassete"""
+    record_path = os.getenv('HTTP_CASSETTE_RECORD', '').strip()
+    if record_path:
+        from cassette import CassetteRecorder
+        recorder = CassetteRecorder(requests.Session(), record_path)
+        atexit.register(recorder.close)
+        return recorder
+    return requests.Session()
+
+
+# Transporte compartilhado por todos os bots do processo (várias contas)
+default_transport = HTTPTransport(session=_default_session())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+🔥 TESTE DE CARGA DOS ENDPOINTS / E /status
+Sobe o app no waitress localmente, mantém o loop do bot ocupado (simulação em tempo
+virtual publicando status) e mede requisições/s e latência p50/p99 de cada endpoint.
+Uso: python load_test_status.py [--seconds 10] [--clients 16]
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+import requests
+from waitress.server import create_server
+
+import simulate_bot  # define credenciais fictícias e BOT_AUTOSTART=0 antes do bot
+import bot_railway_optimized as bot_module
+
+
+def busy_bot_loop(stop):
+    """Roda simulações seguidas: o loop do bot trabalha e publica status o tempo todo"""
+    seed = 0
+    while not stop.is_set():
+        seed += 1
+        simulate_bot.run_simulation(hours=6, mentions=20, replies=60, seed=seed)
+
+
+def client(base_url, path, stop, results, conditional):
+    session = requests.Session()
+    etag = None
+    latencies, not_modified, errors = [], 0, 0
+    while not stop.is_set():
+        headers = {'If-None-Match': etag} if conditional and etag else {}
+        started = time.perf_counter()
+        try:
+            response = session.get(base_url + path, headers=headers, timeout=5)
+        except requests.RequestException:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status_code == 304:
+            not_modified += 1
+        elif response.status_code != 200:
+            errors += 1
+        etag = response.headers.get('ETag', etag)
+    results.append((path, conditional, latencies, not_modified, errors))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(pct / 100 * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+def run(seconds, clients, threads):
+    logging.getLogger().setLevel(logging.WARNING)
+    server = create_server(bot_module.app, host='127.0.0.1', port=0, threads=threads)
+    base_url = f"http://127.0.0.1:{server.effective_port}"
+    threading.Thread(target=server.run, daemon=True).start()
+
+    stop_bot, stop_clients = threading.Event(), threading.Event()
+    threading.Thread(target=busy_bot_loop, args=(stop_bot,), daemon=True).start()
+    version_before = bot_module.bot_status.snapshot().version
+
+    results = []
+    workers = []
+    for n in range(clients):
+        path = '/' if n % 2 == 0 else '/status'
+        conditional = n % 4 >= 2  # metade dos clientes manda If-None-Match
+        workers.append(threading.Thread(target=client,
+                                        args=(base_url, path, stop_clients, results, conditional)))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop_clients.set()
+    for worker in workers:
+        worker.join()
+    stop_bot.set()
+    server.close()
+
+    published = bot_module.bot_status.snapshot().version - version_before
+    print("🔥 TESTE DE CARGA /  e /status (waitress)")
+    print("=" * 60)
+    print(f"⏰ Duração: {seconds}s | clientes: {clients} | threads waitress: {threads}")
+    print(f"🤖 Snapshots publicados pelo bot durante o teste: {published}")
+    for path in ('/', '/status'):
+        for conditional in (False, True):
+            rows = [r for r in results if r[0] == path and r[1] == conditional]
+            latencies = [v for r in rows for v in r[2]]
+            not_modified = sum(r[3] for r in rows)
+            errors = sum(r[4] for r in rows)
+            label = f"{path} {'(If-None-Match)' if conditional else ''}"
+            print(f"\n📊 {label}")
+            print(f"   Requisições/s: {len(latencies) / seconds:,.0f}")
+            print(f"   p50: {percentile(latencies, 50) * 1000:.2f} ms | "
+                  f"p99: {percentile(latencies, 99) * 1000:.2f} ms")
+            print(f"   304: {not_modified} | erros: {errors}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga dos endpoints de status")
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=4, help="threads do waitress")
+    args = parser.parse_args()
+    run(args.seconds, args.clients, args.threads)
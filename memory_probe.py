@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Observação de memória do processo
+Histórico de RSS em ring buffer e top de alocações via tracemalloc (ligado sob demanda)
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+def rss_bytes():
+    """RSS atual do processo (Linux: /proc/self/statm; fora dele, o pico via getrusage)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+class MemoryMonitor:
+    """Amostras periódicas de RSS (e memória rastreada, se tracemalloc estiver ligado)"""
+
+    def __init__(self, capacity=288, min_interval=60, clock=time.time):
+        self.clock = clock
+        self.min_interval = min_interval
+        self._samples = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._baseline = None
+
+    def sample(self, force=False):
+        now = self.clock()
+        with self._lock:
+            if not force and self._samples and now - self._samples[-1]['ts'] < self.min_interval:
+                return None
+            traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+            entry = {'ts': now, 'rss_bytes': rss_bytes(), 'traced_bytes': traced}
+            self._samples.append(entry)
+            return entry
+
+    def history(self):
+        with self._lock:
+            return list(self._samples)
+
+    # ----- tracemalloc -----
+
+    def start_tracing(self, frames=1):
+        """Liga o tracemalloc e guarda um snapshot base para comparação"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop_tracing(self):
+        self._baseline = None
+        tracemalloc.stop()
+
+    def top(self, limit=20, group_by='lineno', diff=False):
+        """Maiores alocações (ou maiores crescimentos desde start_tracing com diff=True)"""
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        if diff and self._baseline is not None:
+            stats = snapshot.compare_to(self._baseline, group_by)
+            return [{'where': str(s.traceback), 'size_bytes': s.size, 'size_diff_bytes': s.size_diff,
+                     'count': s.count, 'count_diff': s.count_diff} for s in stats[:limit]]
+        return [{'where': str(s.traceback), 'size_bytes': s.size, 'count': s.count}
+                for s in snapshot.statistics(group_by)[:limit]]
+
+    def report(self, limit=20, group_by='lineno', diff=False):
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (None, None)
+        return {
+            'rss_bytes': rss_bytes(),
+            'tracing': tracemalloc.is_tracing(),
+            'traced_bytes': current,
+            'traced_peak_bytes': peak,
+            'top': self.top(limit, group_by, diff),
+            'history': self.history(),
+        }
+
+
+# Monitor do processo (amostrado pelo loop do bot, servido em /debug/memory)
+memory = MemoryMonitor(
+    capacity=int(os.getenv('MEMORY_HISTORY_SIZE', '288')),
+    min_interval=float(os.getenv('MEMORY_SAMPLE_SEC', '300'))
+)
+if os.getenv('TRACEMALLOC', '0') == '1':
+    memory.start_tracing()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conjunto de posts próprios monitorados
+Mantido de forma incremental: posts novos entram via since_id, IDs do env são
+mesclados aos descobertos e posts que saem da janela de 7 dias são descartados
+"""
+
+import time
+
+from tweet_records import snowflake_time
+
+# Janela da busca recente
+SEARCH_WINDOW_SEC = 7 * 86400
+
+
+def post_time(post_id, created_ts=None):
+    """Epoch (segundos) de criação do post: created_at da API ou o tempo do snowflake"""
+    if created_ts is not None:
+        return created_ts
+    try:
+        return snowflake_time(post_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class MonitoredPosts:
+    """Posts próprios cujos comentários são buscados a cada ciclo.
+
+    - merge(posts): junta os TweetRecords vindos da timeline e avança o since_id
+    - seed(ids): IDs fixos (MONITORED_POST_IDS), tratados como os demais; cada chamada
+      substitui o conjunto configurado (os descobertos pela timeline ficam)
+    - evict(): remove posts mais velhos que a janela e aplica o teto `cap`
+    Iterar devolve os IDs do mais novo ao mais velho.
+    """
+
+    def __init__(self, window_seconds=SEARCH_WINDOW_SEC, cap=100, clock=time.time):
+        self.window_seconds = window_seconds
+        self.cap = cap
+        self.clock = clock
+        self.since_id = None
+        self._posts = {}  # id -> epoch de criação
+        self._seeded = set()  # IDs vindos da configuração
+        self._found = set()  # IDs vindos da timeline
+        self.evicted = 0
+
+    def _add(self, post_id, created_ts=None):
+        post_id = str(post_id)
+        if post_id in self._posts:
+            return False
+        created = post_time(post_id, created_ts)
+        # Sem data conhecida: conta a partir de agora (sai da janela em 7 dias)
+        self._posts[post_id] = created if created is not None else self.clock()
+        return True
+
+    def seed(self, ids):
+        """Troca os IDs configurados; devolve (adicionados, removidos)"""
+        ids = {str(post_id) for post_id in ids if post_id}
+        removed = [p for p in self._seeded - ids - self._found if p in self._posts]
+        for post_id in removed:
+            del self._posts[post_id]
+        self._seeded = ids
+        return sum(self._add(post_id) for post_id in sorted(ids)), len(removed)
+
+    def merge(self, posts, newest_id=None):
+        """Acrescenta os posts da timeline; devolve quantos eram novos"""
+        added = 0
+        for post in posts:
+            added += self._add(post.id, post.created_ts)
+            self._found.add(str(post.id))
+            newest_id = max(newest_id or post.id, post.id, key=int)
+        if newest_id and (self.since_id is None or int(newest_id) > int(self.since_id)):
+            self.since_id = str(newest_id)
+        return added
+
+    def evict(self):
+        """Remove posts fora da janela de busca e os mais velhos além do teto"""
+        cutoff = self.clock() - self.window_seconds
+        expired = [post_id for post_id, created in self._posts.items() if created < cutoff]
+        if self.cap is not None and len(self._posts) - len(expired) > self.cap:
+            alive = sorted((p for p, created in self._posts.items() if created >= cutoff),
+                           key=self._posts.get, reverse=True)
+            expired.extend(alive[self.cap:])
+        for post_id in expired:
+            del self._posts[post_id]
+            self._found.discard(post_id)
+        self.evicted += len(expired)
+        return len(expired)
+
+    def __iter__(self):
+        return iter(sorted(self._posts, key=self._posts.get, reverse=True))
+
+    def __len__(self):
+        return len(self._posts)
+
+    def __contains__(self, post_id):
+        return str(post_id) in self._posts
+
+    def stats(self):
+        oldest = min(self._posts.values()) if self._posts else None
+        return {
+            'posts': len(self._posts),
+            'since_id': self.since_id,
+            'evicted': self.evicted,
+            'oldest_age_hours': round((self.clock() - oldest) / 3600, 1) if oldest else None,
+        }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline de candidatos em estágios geradores
+fontes → dedup → filtros → priorizador → outbox, com contadores por estágio
+"""
+
+import time
+from itertools import chain
+
+
+class StageStats:
+    """Itens que entraram/saíram de um estágio e tempo gasto puxando dele"""
+
+    __slots__ = ('items_in', 'items_out', 'seconds')
+
+    def __init__(self):
+        self.items_in = 0
+        self.items_out = 0
+        self.seconds = 0.0
+
+    def to_dict(self):
+        return {'in': self.items_in, 'out': self.items_out, 'seconds': round(self.seconds, 4)}
+
+
+class ReplyPipeline:
+    """Encadeia os estágios de forma preguiçosa: nada é buscado antes de ser pedido.
+
+    - sources: {nome: função que devolve um iterável de candidatos}
+    - dedup: predicado "já respondido?" (repetidos da mesma rodada também saem)
+    - filters: lista de (nome, predicado que devolve True para manter)
+    - batch_filters: lista de (nome, função que recebe a lista de candidatos e devolve
+      um bool por candidato); rodam uma vez por rodada, depois dos filtros por item
+    - prioritizer: função (stream, k) -> lista com os k melhores
+    - outbox: função que recebe a lista escolhida e publica as respostas
+    - on_drop: função (candidato, motivo) chamada para cada descarte: 'duplicate'
+      (já respondido), 'duplicate_in_round' (outra fonte já trouxe o tweet nesta rodada),
+      'filtered:<nome do filtro>' ou 'budget' (não coube no orçamento do ciclo)
+    """
+
+    def __init__(self, sources, dedup, filters, prioritizer, outbox, batch_filters=(),
+                 on_drop=None):
+        self.sources = dict(sources)
+        self.dedup = dedup
+        self.filters = list(filters)
+        self.batch_filters = list(batch_filters)
+        self.prioritizer = prioritizer
+        self.outbox = outbox
+        self.on_drop = on_drop
+        self.stats = {}
+
+    def register_source(self, name, source):
+        self.sources[name] = source
+
+    def add_filter(self, name, predicate):
+        self.filters.append((name, predicate))
+
+    def add_batch_filter(self, name, check):
+        self.batch_filters.append((name, check))
+
+    def _stage(self, name):
+        if name not in self.stats:
+            self.stats[name] = StageStats()
+        return self.stats[name]
+
+    def _counted_source(self, name, source):
+        stats = self._stage(f"source.{name}")
+        iterator = iter(source())
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stats.seconds += time.perf_counter() - started
+                return
+            stats.seconds += time.perf_counter() - started
+            stats.items_out += 1
+            yield item
+
+    def _filtered(self, name, predicate, stream, reason):
+        stats = self._stage(name)
+        for item in stream:
+            stats.items_in += 1
+            started = time.perf_counter()
+            keep = predicate(item)
+            stats.seconds += time.perf_counter() - started
+            if keep:
+                stats.items_out += 1
+                yield item
+            elif self.on_drop:
+                self.on_drop(item, reason)
+
+    def _batched(self, stage, check, stream, name):
+        """Junta o stream e decide tudo numa chamada (só roda quando alguém puxa o primeiro item)"""
+        stats = self._stage(stage)
+        items = list(stream)
+        stats.items_in += len(items)
+        started = time.perf_counter()
+        keep = check(items) if items else []
+        stats.seconds += time.perf_counter() - started
+        for item, kept in zip(items, keep):
+            if kept:
+                stats.items_out += 1
+                yield item
+            elif self.on_drop:
+                self.on_drop(item, f"filtered:{name}")
+
+    def _deduped(self, stream):
+        stats = self._stage('dedup')
+        seen = set()
+        for item in stream:
+            stats.items_in += 1
+            started = time.perf_counter()
+            if item.tweet_id in seen:
+                # Mesmo tweet por outra fonte nesta rodada: a primeira cópia segue viva
+                reason = 'duplicate_in_round'
+            elif self.dedup(item):
+                reason = 'duplicate'
+            else:
+                reason = None
+                seen.add(item.tweet_id)
+            stats.seconds += time.perf_counter() - started
+            if reason is None:
+                stats.items_out += 1
+                yield item
+            elif self.on_drop:
+                self.on_drop(item, reason)
+
+    def stream(self, source_names=None):
+        """Stream preguiçoso de candidatos já deduplicados e filtrados"""
+        names = source_names or list(self.sources)
+        stream = chain.from_iterable(
+            self._counted_source(name, self.sources[name]) for name in names
+        )
+        stream = self._deduped(stream)
+        for name, predicate in self.filters:
+            stream = self._filtered(f"filter.{name}", predicate, stream, f"filtered:{name}")
+        for name, check in self.batch_filters:
+            stream = self._batched(f"batch.{name}", check, stream, name)
+        return stream
+
+    def run(self, budget, source_names=None):
+        """Executa uma rodada completa e devolve os candidatos escolhidos"""
+        stats = self._stage('prioritizer')
+        offered = []
+
+        def counted(stream):
+            for item in stream:
+                stats.items_in += 1
+                if self.on_drop:
+                    offered.append(item)
+                yield item
+
+        # O tempo do priorizador inclui puxar os estágios anteriores (tudo é preguiçoso)
+        started = time.perf_counter()
+        selected = self.prioritizer(counted(self.stream(source_names)), budget)
+        stats.seconds += time.perf_counter() - started
+        stats.items_out += len(selected)
+        if offered:
+            chosen = {id(item) for item in selected}
+            for item in offered:
+                if id(item) not in chosen:
+                    self.on_drop(item, 'budget')
+        if selected:
+            outbox = self._stage('outbox')
+            outbox.items_in += len(selected)
+            started = time.perf_counter()
+            outbox.items_out += self.outbox(selected) or 0
+            outbox.seconds += time.perf_counter() - started
+        return selected
+
+    def snapshot(self):
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Journal de respostas em andamento
+Cada resposta é registrada ANTES do POST; se a tentativa termina sem resposta clara
+(timeout, 5xx) a entrada fica pendente até ser reconciliada com a timeline própria
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+
+class PostJournal:
+    """Entradas pendentes por tweet alvo (in_reply_to_tweet_id).
+
+    Com `path` o journal é um JSONL append-only (begin/ambiguous/finish) que
+    sobrevive a restarts; ao abrir, só as entradas ainda pendentes são mantidas.
+    """
+
+    def __init__(self, path=None, ttl_seconds=86400, clock=time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.entries = {}
+        self.outcomes = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            self._load()
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # linha final truncada por um crash
+                reply_to = record.get('reply_to')
+                if record.get('op') == 'finish':
+                    self.entries.pop(reply_to, None)
+                elif record.get('op') in ('begin', 'ambiguous'):
+                    self.entries[reply_to] = record['entry']
+        self.expire()
+        # Compactar: reescrever só o que continua pendente
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps({'op': 'begin', 'reply_to': entry['reply_to'], 'entry': entry}) + '\n')
+        if self.entries:
+            logging.info(f"Journal de posts: {len(self.entries)} respostas pendentes de reconciliação")
+
+    def _append(self, op, reply_to, entry=None):
+        if not self._file:
+            return
+        record = {'op': op, 'reply_to': reply_to}
+        if entry is not None:
+            record['entry'] = entry
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def get(self, reply_to):
+        with self._lock:
+            entry = self.entries.get(reply_to)
+            return dict(entry) if entry else None
+
+    def begin(self, reply_to, text):
+        """Registra (ou conta mais uma) tentativa; o texto da primeira tentativa é mantido"""
+        with self._lock:
+            entry = self.entries.get(reply_to)
+            if entry is None:
+                entry = {'reply_to': reply_to, 'text': text, 'started': self.clock(),
+                         'attempts': 0, 'ambiguous_at': None}
+                self.entries[reply_to] = entry
+            entry['attempts'] += 1
+            entry['last_attempt'] = self.clock()
+            self._append('begin', reply_to, entry)
+            return dict(entry)
+
+    def mark_ambiguous(self, reply_to, reason):
+        with self._lock:
+            entry = self.entries.get(reply_to)
+            if entry is None:
+                return
+            entry['ambiguous_at'] = entry['ambiguous_at'] or self.clock()
+            entry['reason'] = reason
+            self._append('ambiguous', reply_to, entry)
+
+    def finish(self, reply_to, outcome, tweet_id=None):
+        with self._lock:
+            self.entries.pop(reply_to, None)
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self._append('finish', reply_to, {'outcome': outcome, 'tweet_id': tweet_id})
+
+    def expire(self):
+        """Descarta pendências mais velhas que o TTL (alvo provavelmente fora da busca)"""
+        cutoff = self.clock() - self.ttl_seconds
+        with self._lock:
+            expired = [r for r, e in self.entries.items() if e['started'] < cutoff]
+            for reply_to in expired:
+                del self.entries[reply_to]
+        return len(expired)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        with self._lock:
+            return {'pending': len(self.entries), 'outcomes': dict(self.outcomes)}
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+📈 CONSULTA DO LOG BINÁRIO DE CHAMADAS
+Lê os arquivos calls-YYYYMMDD.bin via numpy.memmap (sem parsear texto) e calcula
+percentis de latência, frequência de 429 por hora e uso de quota de posts.
+Uso:
+  python query_call_log.py latency [--since 2025-01-09T00:00] [--until ...] [--dir call_logs]
+  python query_call_log.py 429
+  python query_call_log.py quota
+"""
+
+import argparse
+import glob
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from call_log import ENDPOINTS, KIND_CALL, KIND_POST, RECORD, RECORD_FIELDS
+
+try:
+    import numpy as np
+except ImportError:  # numpy só é necessário para consultar, não para gravar
+    np = None
+
+ENDPOINT_NAMES = {code: name for name, code in ENDPOINTS.items()}
+
+
+def parse_when(value):
+    """Data/hora ISO (UTC se sem fuso) -> epoch"""
+    if value is None:
+        return None
+    when = datetime.fromisoformat(value)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+def load_records(directory, since=None, until=None):
+    """Mapeia os arquivos do intervalo e devolve um único array estruturado filtrado"""
+    dtype = np.dtype(RECORD_FIELDS)
+    assert dtype.itemsize == RECORD.size
+    first_day = datetime.fromtimestamp(since, tz=timezone.utc).date() if since else None
+    last_day = datetime.fromtimestamp(until, tz=timezone.utc).date() if until else None
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(directory, 'calls-*.bin'))):
+        day = datetime.strptime(os.path.basename(path)[6:14], '%Y%m%d').date()
+        if (first_day and day < first_day) or (last_day and day > last_day):
+            continue
+        count = os.path.getsize(path) // dtype.itemsize  # ignora registro final incompleto
+        if not count:
+            continue
+        records = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+        mask = np.ones(count, dtype=bool)
+        if since is not None:
+            mask &= records['ts'] >= since
+        if until is not None:
+            mask &= records['ts'] < until
+        chunks.append(records[mask])
+    if not chunks:
+        return np.zeros(0, dtype=dtype)
+    return np.concatenate(chunks)
+
+
+def report_latency(records):
+    calls = records[records['kind'] == KIND_CALL]
+    print(f"⏱️  LATÊNCIA POR ENDPOINT ({len(calls)} chamadas)")
+    for code in np.unique(calls['endpoint']):
+        latency = calls['latency_ms'][calls['endpoint'] == code]
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+        print(f"   {ENDPOINT_NAMES.get(int(code), code):25} n={len(latency):6} "
+              f"p50={p50:7.1f}ms p90={p90:7.1f}ms p99={p99:7.1f}ms máx={latency.max():7.1f}ms")
+
+
+def report_429(records):
+    limited = records[(records['kind'] == KIND_CALL) & (records['status'] == 429)]
+    calls = records[records['kind'] == KIND_CALL]
+    print(f"🚦 429 POR HORA (UTC): {len(limited)} de {len(calls)} chamadas")
+    if not len(limited):
+        return
+    hours, counts = np.unique((limited['ts'] // 3600).astype(np.int64), return_counts=True)
+    for hour, count in zip(hours, counts):
+        when = datetime.fromtimestamp(int(hour) * 3600, tz=timezone.utc)
+        endpoints = limited['endpoint'][(limited['ts'] // 3600).astype(np.int64) == hour]
+        names = ', '.join(sorted({ENDPOINT_NAMES.get(int(e), str(e)) for e in endpoints}))
+        print(f"   {when:%Y-%m-%d %H:00}  {count:4}  {names}")
+
+
+def report_quota(records):
+    posts = np.sort(records['ts'][records['kind'] == KIND_POST])
+    print(f"📊 QUOTA DE POSTS: {len(posts)} posts no intervalo")
+    if len(posts):
+        days, counts = np.unique((posts // 86400).astype(np.int64), return_counts=True)
+        for day, count in zip(days, counts):
+            print(f"   {datetime.fromtimestamp(int(day) * 86400, tz=timezone.utc):%Y-%m-%d}  {count:4} posts")
+        # Pico em qualquer janela móvel de 24h (o que a API realmente limita)
+        window_end = np.searchsorted(posts, posts + 86400, side='left')
+        peak = int((window_end - np.arange(len(posts))).max())
+        print(f"   Pico em 24h móveis: {peak} posts")
+    calls = records[(records['kind'] == KIND_CALL) & (records['rate_remaining'] >= 0)]
+    if len(calls):
+        print("   Menor x-rate-limit-remaining por endpoint:")
+        for code in np.unique(calls['endpoint']):
+            remaining = calls['rate_remaining'][calls['endpoint'] == code]
+            print(f"   {ENDPOINT_NAMES.get(int(code), code):25} {int(remaining.min())}")
+
+
+REPORTS = {'latency': report_latency, '429': report_429, 'quota': report_quota}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta o log binário de chamadas do bot")
+    parser.add_argument('report', choices=sorted(REPORTS))
+    parser.add_argument('--dir', default=os.getenv('CALL_LOG_DIR') or 'call_logs')
+    parser.add_argument('--since', help="início ISO 8601 (UTC se sem fuso)")
+    parser.add_argument('--until', help="fim ISO 8601 (exclusivo)")
+    parser.add_argument('--last-hours', type=float, help="atalho para --since agora - N horas")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ numpy não instalado: pip install numpy")
+        return 1
+    since = parse_when(args.since)
+    if args.last_hours:
+        since = (datetime.now(timezone.utc) - timedelta(hours=args.last_hours)).timestamp()
+    records = load_records(args.dir, since, parse_when(args.until))
+    REPORTS[args.report](records)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quota de posts em janelas móveis
+Cada janela guarda só os timestamps dos últimos `limite` posts (ring buffer);
+a janela está cheia quando o mais velho deles ainda não saiu dela
+"""
+
+import time
+from collections import deque
+
+
+def parse_windows(value):
+    """'86400:17,900:5' -> [(86400, 17), (900, 5)] (segundos:posts)"""
+    windows = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        seconds, limit = part.split(':')
+        seconds, limit = int(seconds), int(limit)
+        if seconds <= 0 or limit <= 0:
+            raise ValueError(f"janela inválida: {part}")
+        windows.append((seconds, limit))
+    if not windows:
+        raise ValueError("nenhuma janela de quota definida")
+    return sorted(windows, reverse=True)
+
+
+class RollingQuota:
+    """Posts permitidos em várias janelas móveis ao mesmo tempo (ex: 24h e 15min).
+
+    - can_post(): há vaga em todas as janelas (e nenhum bloqueio da API)?
+    - next_slot_at(): epoch da próxima vaga (agora, se já houver)
+    - record(): registra um post publicado
+    - block_until(ts): respeita o x-rate-limit-reset de um 429
+    """
+
+    def __init__(self, windows, clock=time.time):
+        self.windows = list(windows)
+        self.clock = clock
+        self._posts = {seconds: deque(maxlen=limit) for seconds, limit in self.windows}
+        self.blocked_until = 0.0
+
+    @property
+    def limit(self):
+        """Limite da janela mais longa (o "limite diário" com a janela de 24h)"""
+        return self.windows[0][1]
+
+    def used(self, seconds=None, now=None):
+        """Posts dentro da janela (a mais longa, se não indicada)"""
+        seconds = seconds or self.windows[0][0]
+        now = self.clock() if now is None else now
+        return sum(1 for ts in self._posts[seconds] if ts > now - seconds)
+
+    def used_since(self, since):
+        """Posts a partir de `since` (epoch), contados no buffer da janela mais longa"""
+        return sum(1 for ts in self._posts[self.windows[0][0]] if ts >= since)
+
+    def remaining(self, now=None):
+        """Menor saldo entre as janelas (0 enquanto bloqueado pela API)"""
+        now = self.clock() if now is None else now
+        if now < self.blocked_until:
+            return 0
+        return min(limit - self.used(seconds, now) for seconds, limit in self.windows)
+
+    def next_slot_at(self, now=None):
+        now = self.clock() if now is None else now
+        slot = max(now, self.blocked_until)
+        for seconds, limit in self.windows:
+            posts = self._posts[seconds]
+            if len(posts) == limit:
+                # Janela cheia até o post mais velho do buffer sair dela
+                slot = max(slot, posts[0] + seconds)
+        return slot
+
+    def can_post(self, now=None):
+        now = self.clock() if now is None else now
+        return self.next_slot_at(now) <= now
+
+    def record(self, ts=None):
+        ts = self.clock() if ts is None else ts
+        for posts in self._posts.values():
+            if posts and ts < posts[-1]:
+                # Post de outro nó que chegou atrasado: o buffer continua em ordem
+                ordered = sorted([*posts, ts])
+                posts.clear()
+                posts.extend(ordered)
+            else:
+                posts.append(ts)
+
+    def set_windows(self, windows):
+        """Troca as janelas mantendo o histórico recente (os posts já feitos continuam contando)"""
+        windows = list(windows)
+        history = max(self._posts.values(), key=lambda posts: posts.maxlen)
+        posts = {seconds: deque(history, maxlen=limit) for seconds, limit in windows}
+        # Leitores de outras threads (/activity) nunca veem janela sem buffer
+        self._posts = {**self._posts, **posts}
+        self.windows = windows
+        self._posts = posts
+
+    def block_until(self, ts):
+        self.blocked_until = max(self.blocked_until, float(ts))
+
+    def stats(self, now=None):
+        now = self.clock() if now is None else now
+        return {
+            'windows': {f"{seconds}s": {'used': self.used(seconds, now), 'limit': limit}
+                        for seconds, limit in self.windows},
+            'remaining': self.remaining(now),
+            'next_slot_in_sec': round(max(self.next_slot_at(now) - now, 0), 1),
+        }
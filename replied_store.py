@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento compacto dos IDs de tweets já respondidos
+IDs de 64 bits guardados em baldes (array('Q') ordenado) indexados pelo tempo embutido
+no snowflake, que expiram por idade
+"""
+
+import time
+from array import array
+from bisect import bisect_left
+
+# Bytes por ID nos baldes (array('Q') = uint64)
+BYTES_PER_ID = array('Q').itemsize
+
+
+class RepliedStore:
+    """Conjunto de IDs respondidos com expiração por idade em vez de dia de calendário.
+
+    Cada ID vai para o balde da janela de `bucket_seconds` em que o tweet foi criado
+    (tempo do snowflake): a busca calcula o balde direto e faz uma busca binária num
+    array('Q') ordenado, 8 bytes por ID. Um balde expira quando a última inserção
+    nele ficou mais velha que `ttl_seconds`, então todo ID dura pelo menos o TTL
+    contado da resposta.
+    """
+
+    def __init__(self, ttl_seconds=7 * 86400, bucket_seconds=6 * 3600, clock=time.time):
+        if bucket_seconds <= 0 or ttl_seconds < bucket_seconds:
+            raise ValueError("ttl_seconds deve ser >= bucket_seconds > 0")
+        self.ttl_seconds = ttl_seconds
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._bucket_ms = int(bucket_seconds * 1000)
+        self._buckets = {}  # índice da janela de criação -> array('Q') ordenado
+        self._touched = {}  # índice da janela de criação -> epoch da última inserção
+
+    def _bucket_of(self, value):
+        # Bits 22+ do snowflake: ms desde o epoch do X (TWITTER_EPOCH_MS)
+        return (value >> 22) // self._bucket_ms
+
+    @staticmethod
+    def _to_int(tweet_id):
+        return tweet_id if isinstance(tweet_id, int) else int(tweet_id)
+
+    def add(self, tweet_id, now=None):
+        """Registra um ID como respondido"""
+        now = self.clock() if now is None else now
+        value = self._to_int(tweet_id)
+        start = self._bucket_of(value)
+        ids = self._buckets.get(start)
+        if ids is None:
+            ids = self._buckets[start] = array('Q')
+        pos = bisect_left(ids, value)
+        if pos == len(ids) or ids[pos] != value:
+            # IDs chegam quase em ordem: a inserção costuma ser no fim do array
+            ids.insert(pos, value)
+        self._touched[start] = max(self._touched.get(start, now), now)
+
+    def expire(self, now=None):
+        """Descarta os baldes sem inserções dentro do TTL"""
+        cutoff = (self.clock() if now is None else now) - self.ttl_seconds
+        for start in [s for s, touched in self._touched.items() if touched <= cutoff]:
+            del self._buckets[start]
+            del self._touched[start]
+
+    def __contains__(self, tweet_id):
+        try:
+            value = self._to_int(tweet_id)
+        except (TypeError, ValueError):
+            return False
+        # Cálculo do balde em linha: é o caminho quente do dedup
+        ids = self._buckets.get((value >> 22) // self._bucket_ms)
+        if not ids:
+            return False
+        pos = bisect_left(ids, value)
+        return pos < len(ids) and ids[pos] == value
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._buckets.values())
+
+    def nbytes(self):
+        """Memória aproximada dos IDs"""
+        return sum(len(ids) * BYTES_PER_ID for ids in self._buckets.values())
+
+    def stats(self):
+        """Resumo para /status"""
+        return {
+            'ids': len(self),
+            'buckets': len(self._buckets),
+            'bytes': self.nbytes(),
+            'ttl_hours': self.ttl_seconds / 3600,
+        }
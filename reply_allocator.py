@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alocador do orçamento de respostas
+Junta candidatos de menções e comentários, pontua e escolhe os melhores com heap limitado
+"""
+
+import heapq
+import math
+from datetime import datetime, timezone
+
+from tweet_records import TweetRecord
+
+
+class ReplyCandidate:
+    """Tweet que pode receber resposta, com a origem e os dados do autor.
+
+    `tweet` é um TweetRecord (ou o dict da API, convertido aqui).
+    """
+
+    def __init__(self, tweet, source, author=None, post_id=None, my_user_id=None):
+        if not isinstance(tweet, TweetRecord):
+            tweet = TweetRecord.from_api(tweet)
+        self.tweet = tweet
+        self.source = source  # 'mention' ou 'comment'
+        self.post_id = post_id
+        self.author = author or {}
+        # Resposta direta ao nosso post (não a outro comentário da thread)
+        self.direct_reply = (
+            my_user_id is not None and tweet.in_reply_to_user_id == my_user_id
+        )
+        self.score = 0.0
+        # Marcas de tempo (epoch) preenchidas por ReplyLatency ao longo do pipeline
+        self.first_seen = None
+        self.queued_at = None
+        self.posted_at = None
+
+    @property
+    def tweet_id(self):
+        return self.tweet.tweet_id
+
+    @property
+    def text(self):
+        return self.tweet.text
+
+    @property
+    def author_id(self):
+        return self.tweet.author_id
+
+    @property
+    def conversation_id(self):
+        return self.tweet.conversation_id
+
+    @property
+    def created_ts(self):
+        return self.tweet.created_ts
+
+    def __repr__(self):
+        return f"ReplyCandidate({self.source}:{self.tweet_id} score={self.score:.2f})"
+
+
+class ReplyAllocator:
+    """Distribui o limite diário entre os candidatos mais valiosos"""
+
+    # Pesos da pontuação
+    SOURCE_WEIGHTS = {'mention': 1.0, 'comment': 0.8}
+    RECENCY_WEIGHT = 1.0
+    AUTHOR_WEIGHT = 0.6
+    DIRECT_REPLY_BONUS = 0.3
+    VERIFIED_BONUS = 0.2
+
+    def __init__(self, recency_half_life_hours=2.0, spread=False, active_hours=(0, 24)):
+        self.recency_half_life_hours = recency_half_life_hours
+        self.spread = spread
+        self.set_active_hours(active_hours)
+
+    def set_active_hours(self, active_hours):
+        start, end = active_hours
+        if not (0 <= start < end <= 24):
+            raise ValueError("Janela ativa inválida (use horas entre 0 e 24, início < fim)")
+        self.active_start, self.active_end = start, end
+
+    def score(self, candidate, now):
+        """Pontua um candidato: recência + autor + conversa"""
+        score = self.SOURCE_WEIGHTS.get(candidate.source, 0.5)
+        if candidate.created_ts is not None:
+            age_hours = max(now.timestamp() - candidate.created_ts, 0) / 3600
+            score += self.RECENCY_WEIGHT * 0.5 ** (age_hours / self.recency_half_life_hours)
+        metrics = candidate.author.get('public_metrics') or {}
+        followers = metrics.get('followers_count', 0)
+        # log10: 10 seguidores = 1/6, 1M seguidores = teto
+        score += self.AUTHOR_WEIGHT * min(math.log10(followers + 1) / 6, 1.0)
+        if candidate.author.get('verified'):
+            score += self.VERIFIED_BONUS
+        if candidate.direct_reply:
+            score += self.DIRECT_REPLY_BONUS
+        return score
+
+    def budget(self, daily_posts, daily_limit, now=None):
+        """Quantos posts ainda podem sair agora.
+
+        Sem espalhamento é o saldo do dia. Com espalhamento o limite é liberado
+        proporcionalmente ao tempo decorrido da janela ativa (hora local).
+        """
+        remaining = max(daily_limit - daily_posts, 0)
+        if not self.spread:
+            return remaining
+        now = now or datetime.now()
+        hour = now.hour + now.minute / 60 + now.second / 3600
+        if hour < self.active_start:
+            return 0
+        window = self.active_end - self.active_start
+        elapsed = min((hour - self.active_start) / window, 1.0)
+        released = math.ceil(daily_limit * elapsed)
+        return max(min(remaining, released - daily_posts), 0)
+
+    def select(self, candidates, k, now=None):
+        """Escolhe os k melhores candidatos (heap mínimo de tamanho k)"""
+        if k <= 0:
+            return []
+        now = now or datetime.now(timezone.utc)
+        heap = []
+        for seq, candidate in enumerate(candidates):
+            candidate.score = self.score(candidate, now)
+            entry = (candidate.score, -seq, candidate)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        return [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+
+
+def parse_active_hours(value):
+    """Converte 'inicio-fim' (ex: '8-23') em tupla de horas"""
+    start, _, end = value.partition('-')
+    start, end = int(start), int(end or 24)
+    if not (0 <= start < end <= 24):
+        raise ValueError("Janela ativa inválida (use horas entre 0 e 24, início < fim)")
+    return start, end
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latência de ponta a ponta por candidato
+Cada candidato carrega created_ts (API), first_seen (primeira vez que o bot o viu),
+queued_at (escolhido pelo priorizador) e posted_at; na publicação as diferenças vão
+para histogramas de buckets fixos por origem, e os descartes são contados por motivo
+"""
+
+import time
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+
+# Limites superiores dos buckets (segundos); o último bucket é "acima de 1 dia"
+BUCKETS = (60, 300, 900, 1800, 3600, 7200, 21600, 86400)
+
+# Fases medidas: chegada → descoberta → fila → publicação (total = o que o fã espera)
+PHASES = ('discovery', 'waiting', 'posting', 'total')
+
+
+def bucket_label(index):
+    if index == len(BUCKETS):
+        return f">{BUCKETS[-1]}s"
+    return f"<={BUCKETS[index]}s"
+
+
+class LatencyHistogram:
+    """Contagens por bucket + soma e máximo; percentis pelo limite do bucket"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        seconds = max(seconds, 0.0)
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct):
+        """Limite superior do bucket que contém o percentil (o máximo no último bucket)"""
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self, buckets=False):
+        data = {
+            'count': self.count,
+            'mean': round(self.total / self.count, 1) if self.count else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': round(self.max, 1),
+        }
+        if buckets:
+            data['buckets'] = {bucket_label(i): n for i, n in enumerate(self.counts) if n}
+        return data
+
+
+class ReplyLatency:
+    """Marca os candidatos e agrega latências e descartes.
+
+    - seen(candidate): define first_seen (lembrado entre ciclos para quem volta na busca)
+    - queued(candidate) / posted(candidate): fecham as fases e alimentam os histogramas
+    - dropped(candidate, reason): conta o descarte por origem e motivo ('duplicate' só
+      para tweets ainda rastreados, não para os já respondidos que voltam na busca;
+      'duplicate_in_round' é ignorado, a outra cópia do tweet continua na rodada)
+
+    `max_tracked` limita os first_seen lembrados e `max_sources` as origens com
+    histograma próprio (posts que saem da janela de monitoramento são esquecidos).
+    """
+
+    def __init__(self, max_tracked=10000, max_sources=200, clock=time.time):
+        self.clock = clock
+        self.max_tracked = max_tracked
+        self.max_sources = max_sources
+        self._first_seen = OrderedDict()  # tweet_id -> epoch
+        self._sources = OrderedDict()  # origem -> ({fase: LatencyHistogram}, Counter de descartes)
+        self.overall = {phase: LatencyHistogram() for phase in PHASES}
+        self.drops = Counter()
+
+    @staticmethod
+    def source_key(candidate):
+        """'mentions' ou 'post:<id>' (cada post monitorado é uma origem)"""
+        if candidate.source == 'comment' and candidate.post_id:
+            return f"post:{candidate.post_id}"
+        return 'mentions' if candidate.source == 'mention' else candidate.source
+
+    def seen(self, candidate):
+        now = self.clock()
+        first_seen = self._first_seen.pop(candidate.tweet_id, now)
+        self._first_seen[candidate.tweet_id] = first_seen
+        while len(self._first_seen) > self.max_tracked:
+            self._first_seen.popitem(last=False)
+        candidate.first_seen = first_seen
+
+    def queued(self, candidate):
+        candidate.queued_at = self.clock()
+
+    def _source(self, candidate):
+        key = self.source_key(candidate)
+        entry = self._sources.pop(key, None) or ({phase: LatencyHistogram() for phase in PHASES},
+                                                 Counter())
+        self._sources[key] = entry
+        while len(self._sources) > self.max_sources:
+            self._sources.popitem(last=False)
+        return entry
+
+    def posted(self, candidate):
+        candidate.posted_at = now = self.clock()
+        self._first_seen.pop(candidate.tweet_id, None)
+        created = candidate.created_ts
+        first_seen = candidate.first_seen if candidate.first_seen is not None else now
+        queued = candidate.queued_at if candidate.queued_at is not None else now
+        phases = {'waiting': queued - first_seen, 'posting': now - queued}
+        if created is not None:
+            phases['discovery'] = first_seen - created
+            phases['total'] = now - created
+        histograms, _ = self._source(candidate)
+        for phase, seconds in phases.items():
+            histograms[phase].observe(seconds)
+            self.overall[phase].observe(seconds)
+
+    def dropped(self, candidate, reason):
+        if reason == 'duplicate_in_round':
+            # Cópia vinda de outra fonte: o first_seen pertence à cópia que segue viva
+            return
+        if reason == 'duplicate' and self._first_seen.pop(candidate.tweet_id, None) is None:
+            # Tweet já respondido que voltou na busca: não é um descarte de quem espera
+            return
+        self.drops[reason] += 1
+        self._source(candidate)[1][reason] += 1
+
+    def stats(self):
+        return {
+            'overall': {phase: h.to_dict(buckets=True) for phase, h in self.overall.items()},
+            'by_source': {
+                key: dict({phase: h.to_dict() for phase, h in histograms.items() if h.count},
+                          drops=dict(drops))
+                for key, (histograms, drops) in self._sources.items()
+            },
+            'drops': dict(self.drops),
+            'tracked': len(self._first_seen),
+        }
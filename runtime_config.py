@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuração recarregável sem reiniciar o processo
+Os valores vêm do ambiente e, se houver BOT_CONFIG_FILE, de um JSON que sobrepõe o
+ambiente; o arquivo é relido quando muda (mtime) ou via POST /admin/reload.
+Uma recarga inválida é rejeitada inteira e a configuração anterior continua valendo.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from quota import parse_windows
+from reply_allocator import parse_active_hours
+from throttle import parse_rate
+
+
+class ConfigError(ValueError):
+    """Configuração inválida; `errors` lista cada problema encontrado"""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def non_negative_int(value):
+    value = int(value)
+    if value < 0:
+        raise ValueError("deve ser >= 0")
+    return value
+
+
+def non_negative_float(value):
+    value = float(value)
+    if value < 0:
+        raise ValueError("deve ser >= 0")
+    return value
+
+
+def optional_int(value):
+    return non_negative_int(value) if str(value).strip() else None
+
+
+def parse_range(value):
+    """'30-60' -> (30, 60); '60' -> (60, 60) (segundos, sorteados com randint)"""
+    low, _, high = str(value).partition('-')
+    low = non_negative_int(low)
+    high = non_negative_int(high) if high.strip() else low
+    if high < low:
+        raise ValueError("fim menor que o início")
+    return low, high
+
+
+def parse_flag(value):
+    value = str(value).strip().lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return True
+    if value in ('0', 'false', 'no', 'off', ''):
+        return False
+    raise ValueError("use 0 ou 1")
+
+
+def parse_ids(value):
+    """'1,2,3' (ou lista no JSON) -> tupla de IDs"""
+    if isinstance(value, (list, tuple)):
+        value = ','.join(str(v) for v in value)
+    ids = tuple(i.strip() for i in str(value).split(',') if i.strip())
+    if not all(i.isdigit() for i in ids):
+        raise ValueError("IDs devem ser numéricos")
+    return ids
+
+
+# Configurações recarregáveis: nome -> (parser, padrão). Credenciais, caminhos e
+# tamanhos de buffer continuam lidos uma vez, do ambiente, no boot.
+SETTINGS = {
+    # Legado: só serve de padrão para MAX_REPLIES_PER_CYCLE (valor + 1)
+    'MAX_COMMENTS_PER_CYCLE': (non_negative_int, '2'),
+    'MAX_REPLIES_PER_CYCLE': (optional_int, ''),  # vazio = MAX_COMMENTS_PER_CYCLE + 1
+    'COMMENT_INTERVAL_SEC': (non_negative_int, '120'),
+    'FIRST_REPLY_DELAY_SEC': (parse_range, '30-60'),
+    'CYCLE_WAIT_SEC': (parse_range, '600-900'),
+    'ERROR_BACKOFF_SEC': (non_negative_int, '60'),
+    'MONITORED_REFRESH_SEC': (non_negative_int, '3600'),
+    'MONITORED_POST_IDS': (parse_ids, ''),
+    'POST_QUOTA_WINDOWS': (parse_windows, '86400:17'),
+    'POST_RETRY_MAX': (non_negative_int, '2'),
+    'POST_RETRY_BASE_SEC': (non_negative_float, '20'),
+    'BUDGET_SPREAD': (parse_flag, '0'),
+    'BUDGET_ACTIVE_HOURS': (parse_active_hours, '0-24'),
+    'AUTHOR_REPLY_LIMIT': (parse_rate, '1/6h'),
+    'CONVERSATION_REPLY_LIMIT': (parse_rate, '2/24h'),
+}
+
+
+class RuntimeConfig:
+    """Valores atuais (`values`) e histórico da última recarga.
+
+    Quem usa a configuração consulta `version` (ou espera `changed`, um Event
+    ligado a cada recarga aplicada) e compara com o que já aplicou.
+    """
+
+    def __init__(self, path=None, environ=None, clock=time.time):
+        self.path = path
+        self.environ = os.environ if environ is None else environ
+        self.clock = clock
+        self.values = {}
+        self.version = 0
+        self.last_reload = None
+        self.failed_reloads = 0
+        self.changed = threading.Event()
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        if self.reload('boot') is None:
+            raise ConfigError(self.last_reload['errors'])
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read_file(self):
+        """Sobreposições do arquivo (vazio se não existir)"""
+        if not self.path or not os.path.exists(self.path):
+            return {}, []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            return {}, [f"{self.path}: {e}"]
+        if not isinstance(data, dict):
+            return {}, [f"{self.path}: esperado um objeto JSON"]
+        unknown = sorted(set(data) - set(SETTINGS))
+        return data, [f"{name}: não é recarregável (ou nome errado)" for name in unknown]
+
+    def load(self):
+        """Lê ambiente + arquivo e valida tudo; levanta ConfigError sem alterar nada"""
+        overrides, errors = self._read_file()
+        values = {}
+        for name, (parser, default) in SETTINGS.items():
+            raw = overrides[name] if name in overrides else self.environ.get(name, default)
+            try:
+                values[name] = parser(raw if isinstance(raw, (list, tuple)) else str(raw))
+            except (ValueError, TypeError, KeyError) as e:
+                errors.append(f"{name}={raw!r}: {e}")
+        if errors:
+            raise ConfigError(errors)
+        if values['MAX_REPLIES_PER_CYCLE'] is None:
+            values['MAX_REPLIES_PER_CYCLE'] = values['MAX_COMMENTS_PER_CYCLE'] + 1
+        return values
+
+    def reload(self, source='manual'):
+        """Recarrega e devolve {nome: novo valor} do que mudou, ou None se inválida"""
+        with self._lock:
+            self._mtime = self._file_mtime() if self.path else None
+            try:
+                values = self.load()
+            except ConfigError as e:
+                self.failed_reloads += 1
+                self.last_reload = {'at': self.clock(), 'source': source, 'ok': False,
+                                    'changed': [], 'errors': e.errors}
+                logging.error(f"Configuração rejeitada ({source}): {e}")
+                return None
+            changed = {k: v for k, v in values.items() if self.values.get(k) != v}
+            self.values = values
+            self.last_reload = {'at': self.clock(), 'source': source, 'ok': True,
+                                'changed': sorted(changed), 'errors': []}
+            if changed:
+                self.version += 1
+                self.changed.set()
+                if source != 'boot':
+                    logging.info(f"Configuração recarregada ({source}): {', '.join(sorted(changed))}")
+            return changed
+
+    def check_file(self):
+        """Recarrega se o arquivo mudou desde a última leitura"""
+        if self.path and self._file_mtime() != self._mtime:
+            return self.reload('file')
+        return None
+
+    def start_watching(self, interval=30):
+        """Thread daemon que confere o mtime do arquivo a cada `interval` segundos"""
+        if not self.path or self._watcher:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                self.check_file()
+
+        self._watcher = threading.Thread(target=watch, daemon=True, name='config-watcher')
+        self._watcher.start()
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'file': self.path,
+            'last_reload': self.last_reload,
+            'failed_reloads': self.failed_reloads,
+        }
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Particionamento do monitoramento entre vários nós
+Conversas monitoradas ('post:<id>') e contas ('mentions:<usuário>') são distribuídas
+por hash consistente (anel com nós virtuais); a lista de nós vivos, as atribuições e
+as respostas publicadas ficam num backend de coordenação plugável (memória ou SQLite).
+O backend também guarda as vagas de post reservadas: a quota é da conta, então cada
+nó reserva a vaga ali antes de postar
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from contextlib import closing
+
+
+def ring_hash(value):
+    """Posição no anel: 64 bits do md5 (estável entre processos, ao contrário de hash())"""
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+class HashRing:
+    """Anel de hash consistente: quando um nó entra ou sai, só ~1/N das chaves mudam de dono"""
+
+    def __init__(self, nodes=(), vnodes=64):
+        self.vnodes = vnodes
+        self.nodes = tuple(sorted(set(nodes)))
+        points = sorted(
+            (ring_hash(f"{node}#{replica}"), node)
+            for node in self.nodes for replica in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key):
+        if not self._hashes:
+            return None
+        index = bisect_right(self._hashes, ring_hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class CoordinationBackend(ABC):
+    """Interface do backend de coordenação (membros, atribuições e respostas publicadas)"""
+
+    @abstractmethod
+    def heartbeat(self, node_id, now):
+        raise NotImplementedError
+
+    @abstractmethod
+    def members(self, since):
+        """Nós com heartbeat depois de `since` (epoch)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def leave(self, node_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_assignments(self, node_id, keys, now):
+        """Substitui as chaves atribuídas ao nó (só para consulta/diagnóstico)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def assignments(self):
+        """{node_id: [chaves]}"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def record_reply(self, node_id, tweet_id, ts, throttle=None):
+        """Registra uma resposta; `throttle` são as chaves {dimensão: chave} que ela consumiu.
+
+        Registrar de novo o mesmo tweet só completa as chaves que faltavam.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def replies_since(self, ts, exclude_node=None):
+        """[(tweet_id, ts, throttle)] publicados depois de `ts`, em ordem de ts"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def reserve_post(self, node_id, windows, now):
+        """Reserva uma vaga de post se todas as janelas [(segundos, limite)] tiverem saldo.
+
+        Verificação e reserva são atômicas entre nós; devolve o id da reserva ou None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_post(self, reservation):
+        """Devolve a vaga de um post que não foi criado"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def prune(self, before):
+        """Descarta respostas e reservas anteriores a `before` e nós sem heartbeat desde então"""
+        raise NotImplementedError
+
+
+class MemoryBackend(CoordinationBackend):
+    """Backend em memória: vários bots no mesmo processo (testes e simulação)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes = {}
+        self._assignments = {}
+        self._replies = {}  # tweet_id -> (ts, node_id, throttle)
+        self._posts = {}  # id da reserva -> (ts, node_id)
+        self._next_reservation = 1
+
+    def heartbeat(self, node_id, now):
+        with self._lock:
+            self._nodes[node_id] = now
+
+    def members(self, since):
+        with self._lock:
+            return sorted(node for node, seen in self._nodes.items() if seen > since)
+
+    def leave(self, node_id):
+        with self._lock:
+            self._nodes.pop(node_id, None)
+            self._assignments.pop(node_id, None)
+
+    def set_assignments(self, node_id, keys, now):
+        with self._lock:
+            self._assignments[node_id] = sorted(keys)
+
+    def assignments(self):
+        with self._lock:
+            return {node: list(keys) for node, keys in self._assignments.items()}
+
+    def record_reply(self, node_id, tweet_id, ts, throttle=None):
+        with self._lock:
+            previous = self._replies.get(str(tweet_id))
+            if previous:
+                ts, node_id, throttle = previous[0], previous[1], previous[2] or throttle
+            self._replies[str(tweet_id)] = (ts, node_id, throttle or None)
+
+    def replies_since(self, ts, exclude_node=None):
+        with self._lock:
+            replies = sorted((at, tweet_id, node, throttle)
+                             for tweet_id, (at, node, throttle) in self._replies.items())
+        return [(tweet_id, at, throttle) for at, tweet_id, node, throttle in replies
+                if at > ts and node != exclude_node]
+
+    def reserve_post(self, node_id, windows, now):
+        with self._lock:
+            for seconds, limit in windows:
+                if sum(1 for at, _ in self._posts.values() if at > now - seconds) >= limit:
+                    return None
+            reservation = self._next_reservation
+            self._next_reservation += 1
+            self._posts[reservation] = (now, node_id)
+            return reservation
+
+    def release_post(self, reservation):
+        with self._lock:
+            self._posts.pop(reservation, None)
+
+    def prune(self, before):
+        with self._lock:
+            self._replies = {t: reply for t, reply in self._replies.items() if reply[0] >= before}
+            self._posts = {r: post for r, post in self._posts.items() if post[0] >= before}
+            for node in [n for n, seen in self._nodes.items() if seen < before]:
+                del self._nodes[node]
+                self._assignments.pop(node, None)
+
+
+class SQLiteBackend(CoordinationBackend):
+    """Backend em arquivo SQLite (nós no mesmo host ou num volume compartilhado).
+
+    Cada operação abre sua própria conexão: seguro entre threads e processos.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS nodes (node_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS assignments (node_id TEXT NOT NULL, key TEXT NOT NULL, "
+        "updated REAL NOT NULL, PRIMARY KEY (node_id, key))",
+        "CREATE TABLE IF NOT EXISTS replies (tweet_id TEXT PRIMARY KEY, node_id TEXT NOT NULL, "
+        "ts REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS replies_ts ON replies (ts)",
+        "CREATE TABLE IF NOT EXISTS posts (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "node_id TEXT NOT NULL, ts REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS posts_ts ON posts (ts)",
+    )
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(replies)")]
+            if 'throttle' not in columns:
+                # Arquivos criados antes das chaves de limite por autor/conversa
+                conn.execute("ALTER TABLE replies ADD COLUMN throttle TEXT")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        return _Transaction(conn)
+
+    def heartbeat(self, node_id, now):
+        with self._connect() as conn:
+            conn.execute("INSERT INTO nodes (node_id, last_seen) VALUES (?, ?) "
+                         "ON CONFLICT(node_id) DO UPDATE SET last_seen = excluded.last_seen",
+                         (node_id, now))
+
+    def members(self, since):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT node_id FROM nodes WHERE last_seen > ? ORDER BY node_id",
+                                (since,)).fetchall()
+        return [row[0] for row in rows]
+
+    def leave(self, node_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,))
+            conn.execute("DELETE FROM assignments WHERE node_id = ?", (node_id,))
+
+    def set_assignments(self, node_id, keys, now):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM assignments WHERE node_id = ?", (node_id,))
+            conn.executemany("INSERT INTO assignments (node_id, key, updated) VALUES (?, ?, ?)",
+                             [(node_id, key, now) for key in keys])
+
+    def assignments(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT node_id, key FROM assignments ORDER BY node_id, key").fetchall()
+        result = {}
+        for node_id, key in rows:
+            result.setdefault(node_id, []).append(key)
+        return result
+
+    def record_reply(self, node_id, tweet_id, ts, throttle=None):
+        with self._connect() as conn:
+            conn.execute("INSERT INTO replies (tweet_id, node_id, ts, throttle) VALUES (?, ?, ?, ?) "
+                         "ON CONFLICT(tweet_id) DO UPDATE SET "
+                         "throttle = COALESCE(replies.throttle, excluded.throttle)",
+                         (str(tweet_id), node_id, ts, json.dumps(throttle) if throttle else None))
+
+    def replies_since(self, ts, exclude_node=None):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT tweet_id, ts, throttle FROM replies "
+                                "WHERE ts > ? AND node_id != ? ORDER BY ts",
+                                (ts, exclude_node or '')).fetchall()
+        return [(tweet_id, at, json.loads(throttle) if throttle else None)
+                for tweet_id, at, throttle in rows]
+
+    def reserve_post(self, node_id, windows, now):
+        with self._connect() as conn:
+            # Trava de escrita antes de contar: dois nós não reservam a mesma última vaga
+            conn.execute("BEGIN IMMEDIATE")
+            for seconds, limit in windows:
+                used = conn.execute("SELECT COUNT(*) FROM posts WHERE ts > ?",
+                                    (now - seconds,)).fetchone()[0]
+                if used >= limit:
+                    return None
+            return conn.execute("INSERT INTO posts (node_id, ts) VALUES (?, ?)",
+                                (node_id, now)).lastrowid
+
+    def release_post(self, reservation):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM posts WHERE id = ?", (reservation,))
+
+    def prune(self, before):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM replies WHERE ts < ?", (before,))
+            conn.execute("DELETE FROM posts WHERE ts < ?", (before,))
+            stale = [row[0] for row in conn.execute("SELECT node_id FROM nodes WHERE last_seen < ?",
+                                                    (before,))]
+            conn.executemany("DELETE FROM assignments WHERE node_id = ?", [(n,) for n in stale])
+            conn.execute("DELETE FROM nodes WHERE last_seen < ?", (before,))
+
+
+class _Transaction:
+    """Conexão SQLite como context manager que também fecha (sqlite3 só faz commit)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        with closing(self.conn):
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+
+
+def make_backend(spec):
+    """'memory', 'sqlite:<caminho>' ou vazio (sem particionamento -> None)"""
+    spec = (spec or '').strip()
+    if not spec:
+        return None
+    if spec == 'memory':
+        return MemoryBackend()
+    if spec.startswith('sqlite:'):
+        return SQLiteBackend(spec[len('sqlite:'):] or 'shards.db')
+    raise ValueError(f"SHARD_BACKEND desconhecido: {spec}")
+
+
+class ShardCoordinator:
+    """Visão deste nó: membros vivos, anel atual e as chaves que são dele.
+
+    refresh() manda o heartbeat e relê os membros; quando o conjunto muda o anel é
+    reconstruído (rebalanceamento). O anel é trocado por atribuição, então owns()
+    pode ser chamado de outra thread sem lock.
+    """
+
+    # Folga ao reler respostas (escritas de outros nós com relógio um pouco atrasado)
+    REPLY_OVERLAP_SEC = 120
+
+    def __init__(self, node_id, backend, ttl_seconds=90, vnodes=64,
+                 history_seconds=7 * 86400, clock=time.time):
+        self.node_id = node_id
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.vnodes = vnodes
+        self.history_seconds = history_seconds
+        self.clock = clock
+        self.ring = HashRing([node_id], vnodes)
+        self.rebalances = 0
+        self.last_refresh = None
+        # A primeira leitura traz o histórico inteiro, inclusive deste nó antes de um restart
+        self._watermark = clock() - history_seconds
+        self._first_sync = True
+        self._delivered = {}  # tweet_id -> ts das respostas já entregues dentro da folga
+        self._heartbeat_thread = None
+        self._stop = threading.Event()
+
+    def refresh(self):
+        """Heartbeat + membros; devolve True se o anel mudou"""
+        now = self.clock()
+        self.backend.heartbeat(self.node_id, now)
+        members = self.backend.members(now - self.ttl_seconds)
+        if self.node_id not in members:
+            members.append(self.node_id)
+        self.last_refresh = now
+        if tuple(sorted(members)) == self.ring.nodes:
+            return False
+        previous = self.ring.nodes
+        self.ring = HashRing(members, self.vnodes)
+        self.rebalances += 1
+        logging.info(f"Shards rebalanceados: {list(previous)} -> {list(self.ring.nodes)}")
+        return True
+
+    def owns(self, key):
+        return self.ring.owner(key) == self.node_id
+
+    def publish_assignments(self, keys):
+        """Registra no backend as chaves que este nó está cobrindo"""
+        owned = [key for key in keys if self.owns(key)]
+        self.backend.set_assignments(self.node_id, owned, self.clock())
+        return owned
+
+    def record_reply(self, tweet_id, ts=None, throttle=None):
+        self.backend.record_reply(self.node_id, tweet_id, self.clock() if ts is None else ts,
+                                  throttle)
+
+    def reserve_post(self, windows):
+        """Id da vaga reservada na quota da conta, ou None se outro nó já a esgotou"""
+        return self.backend.reserve_post(self.node_id, windows, self.clock())
+
+    def release_post(self, reservation):
+        self.backend.release_post(reservation)
+
+    def foreign_replies(self):
+        """Respostas de outros nós ainda não entregues, [(tweet_id, ts, throttle)] em ordem de ts"""
+        exclude = None if self._first_sync else self.node_id
+        self._first_sync = False
+        fresh = []
+        for tweet_id, ts, throttle in self.backend.replies_since(
+                self._watermark - self.REPLY_OVERLAP_SEC, exclude_node=exclude):
+            if tweet_id not in self._delivered:
+                self._delivered[tweet_id] = ts
+                fresh.append((tweet_id, ts, throttle))
+            self._watermark = max(self._watermark, ts)
+        cutoff = self._watermark - self.REPLY_OVERLAP_SEC
+        self._delivered = {t: ts for t, ts in self._delivered.items() if ts >= cutoff}
+        return fresh
+
+    def prune(self):
+        self.backend.prune(self.clock() - self.history_seconds)
+
+    def start_heartbeat(self, interval=30):
+        """Thread daemon de heartbeat (o ciclo do bot dorme bem mais que o TTL)"""
+        if self._heartbeat_thread:
+            return
+
+        def beat():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.error(f"Erro no heartbeat de shards: {e}")
+
+        self._heartbeat_thread = threading.Thread(target=beat, daemon=True, name='shard-heartbeat')
+        self._heartbeat_thread.start()
+
+    def leave(self):
+        self._stop.set()
+        self.backend.leave(self.node_id)
+
+    def stats(self):
+        return {
+            'node_id': self.node_id,
+            'members': list(self.ring.nodes),
+            'rebalances': self.rebalances,
+            'last_refresh': self.last_refresh,
+        }
+
+
+def default_node_id():
+    return os.getenv('NODE_ID') or os.getenv('RAILWAY_REPLICA_ID') or f"{os.uname().nodename}-{os.getpid()}"
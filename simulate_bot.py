@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+🧪 SIMULAÇÃO DO BOT EM TEMPO VIRTUAL
+Roda o run_bot_loop contra a API falsa com menções e comentários roteirizados.
+Um dia inteiro de comportamento termina em segundos.
+Uso: python simulate_bot.py [--hours 24] [--mentions 40] [--replies 120] [--posts 5] [--seed 1]
+                            [--spam 0.3]
+"""
+
+import argparse
+import logging
+import os
+import random
+import time
+from bisect import bisect_left
+
+# Credenciais fictícias e sem inicialização automática (antes de importar o bot)
+for _var in ('API_KEY', 'API_KEY_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET', 'BEARER_TOKEN'):
+    os.environ.setdefault(_var, 'simulacao')
+os.environ['BOT_AUTOSTART'] = '0'
+os.environ.setdefault('CALL_LOG_DIR', '')
+os.environ.setdefault('POST_JOURNAL_FILE', '')
+
+import bot_railway_optimized as bot_module  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from fake_x_api import FakeXAPI  # noqa: E402
+from http_transport import HTTPTransport  # noqa: E402
+from spam_filter import SPAM_TEMPLATES  # noqa: E402
+
+
+def build_timeline(api, start, hours, mentions, replies, posts, rng, spam=0.0):
+    """Cria posts próprios (antes do início) e agenda menções/comentários ao longo do período.
+    Uma fração `spam` dos eventos vem de contas de spam (modelos conhecidos com variações)."""
+    post_ids = [
+        api.add_own_post(start - rng.uniform(3600, 3 * 86400), text=f"Post próprio {n}")
+        for n in range(posts)
+    ]
+    events = []
+    for n in range(mentions):
+        events.append((start + rng.uniform(0, hours * 3600), 'mention', None, 2000 + n))
+    for n in range(replies):
+        events.append((start + rng.uniform(0, hours * 3600), 'comment',
+                       rng.choice(post_ids) if post_ids else None, 5000 + n))
+    targets = {}
+    for ts, kind, post_id, author in sorted(events, key=lambda e: e[0]):
+        api.add_user(author, followers=int(rng.paretovariate(1.2) * 10))
+        text = None
+        if rng.random() < spam:
+            text = f"{rng.choice(SPAM_TEMPLATES)} {rng.randint(2, 99)}x https://t.co/{rng.randrange(10**6)}"
+        if kind == 'mention':
+            tweet_id = api.add_mention(ts, author, text=text and f"@{api.username} {text}")
+        elif post_id:
+            tweet_id = api.add_reply(ts, post_id, author, text=text or "Comentário")
+        else:
+            continue
+        targets[tweet_id] = (ts, 'spam' if text else kind)
+    return targets
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def run_simulation(hours=24, mentions=40, replies=120, posts=5, seed=1, post_limit=None,
+                   start=None, spam=0.0):
+    """Executa a simulação e devolve um dicionário com o resumo"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    start = float(start if start is not None else int(time.time()))
+    clock = VirtualClock(start=start, stop_at=start + hours * 3600)
+    api = FakeXAPI(clock, username='drtrafeg0', post_limit=post_limit)
+    targets = build_timeline(api, start, hours, mentions, replies, posts, rng, spam)
+
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=clock)
+    clock.on_stop = lambda: setattr(bot, 'is_running', False)
+
+    wall_started = time.perf_counter()
+    if not bot.authenticate():
+        raise RuntimeError("Falha na autenticação contra a API falsa")
+    bot.run_bot_loop()
+    wall = time.perf_counter() - wall_started
+
+    latencies = {'mention': [], 'comment': []}
+    spam_replied = 0
+    for posted_ts, reply_to, _ in api.posted:
+        if reply_to in targets:
+            created_ts, kind = targets[reply_to]
+            if kind == 'spam':
+                spam_replied += 1
+            else:
+                latencies[kind].append(posted_ts - created_ts)
+    all_latencies = latencies['mention'] + latencies['comment']
+    spam_events = sum(1 for _, kind in targets.values() if kind == 'spam')
+
+    # Pico de posts em qualquer janela móvel de 24h (o que a API realmente limita)
+    post_times = sorted(ts for ts, _, _ in api.posted)
+    peak_24h = max((bisect_left(post_times, ts + 86400) - i for i, ts in enumerate(post_times)),
+                   default=0)
+    rate_limited = sum(1 for entry in bot.activity.recent(limit=len(api.posted) + 10000)
+                       if entry.get('status') == 429)
+
+    return {
+        'virtual_hours': clock.elapsed / 3600,
+        'wall_seconds': wall,
+        'events': len(targets),
+        'replies_sent': len(api.posted),
+        'replies_by_source': {k: len(v) for k, v in latencies.items()},
+        'unanswered': len(targets) - spam_events - len(all_latencies),
+        'spam': {'events': spam_events, 'replied': spam_replied,
+                 'filter': bot.spam_filter.stats() if bot.spam_filter else None},
+        'quota': {'daily_limit': bot.daily_limit, 'daily_posts': bot.daily_posts,
+                  'peak_24h': peak_24h, 'post_429': rate_limited},
+        'api_calls': dict(api.calls),
+        'latency_sec': {
+            'p50': percentile(all_latencies, 50),
+            'p90': percentile(all_latencies, 90),
+            'p99': percentile(all_latencies, 99),
+            'max': max(all_latencies) if all_latencies else None,
+        },
+        'latency_by_source_p50': {k: percentile(v, 50) for k, v in latencies.items()},
+        # Visão do próprio bot (histogramas por fase/origem e descartes por motivo)
+        'pipeline_latency': bot.latency.stats(),
+    }
+
+
+def print_report(report):
+    def minutes(value):
+        return '-' if value is None else f"{value / 60:.1f} min"
+
+    print("🧪 SIMULAÇÃO EM TEMPO VIRTUAL")
+    print("=" * 60)
+    print(f"⏰ Tempo simulado: {report['virtual_hours']:.1f}h em {report['wall_seconds']:.2f}s reais")
+    print(f"📥 Eventos roteirizados: {report['events']}")
+    print(f"💬 Respostas enviadas: {report['replies_sent']} "
+          f"(menções {report['replies_by_source']['mention']}, "
+          f"comentários {report['replies_by_source']['comment']})")
+    print(f"⏸️  Sem resposta: {report['unanswered']}")
+    if report['spam']['events']:
+        print(f"🚫 Spam: {report['spam']['events']} eventos, {report['spam']['replied']} respondidos "
+              f"| filtro: {report['spam']['filter']}")
+    quota = report['quota']
+    print(f"📊 Quota: {quota['daily_posts']}/{quota['daily_limit']} nas últimas 24h | "
+          f"pico em 24h móveis: {quota['peak_24h']} | 429 em posts: {quota['post_429']}")
+    print(f"🌐 Chamadas à API: {report['api_calls']}")
+    latency = report['latency_sec']
+    print("\n⏱️  LATÊNCIA DESCOBERTA → RESPOSTA")
+    print(f"   p50: {minutes(latency['p50'])} | p90: {minutes(latency['p90'])} | "
+          f"p99: {minutes(latency['p99'])} | máx: {minutes(latency['max'])}")
+    for source, value in report['latency_by_source_p50'].items():
+        print(f"   p50 {source}: {minutes(value)}")
+
+    tracked = report['pipeline_latency']
+    print("\n📐 LATÊNCIA MEDIDA PELO BOT (limite do bucket)")
+    for phase, hist in tracked['overall'].items():
+        print(f"   {phase:<9} n={hist['count']:<4} p50: {minutes(hist['p50'])} | "
+              f"p90: {minutes(hist['p90'])} | máx: {minutes(hist['max'] if hist['count'] else None)}")
+    for source, data in tracked['by_source'].items():
+        total = data.get('total', {})
+        print(f"   {source:<26} respostas: {total.get('count', 0):<3} "
+              f"p50: {minutes(total.get('p50'))} | descartes: {data['drops']}")
+    print(f"   Descartes: {tracked['drops']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula o bot em tempo virtual")
+    parser.add_argument('--hours', type=float, default=24)
+    parser.add_argument('--mentions', type=int, default=40)
+    parser.add_argument('--replies', type=int, default=120)
+    parser.add_argument('--posts', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--spam', type=float, default=0.0, help="fração de eventos de spam")
+    parser.add_argument('--verbose', action='store_true', help="mostra os logs do bot")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    print_report(run_simulation(args.hours, args.mentions, args.replies, args.posts, args.seed,
+                                spam=args.spam))
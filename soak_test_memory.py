@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+🧪 SOAK TEST DE MEMÓRIA
+Roda o run_bot_loop contra a API falsa em tempo virtual acelerado, alimentando milhões
+de tweets sintéticos (menções e comentários), e falha se a memória não se estabilizar.
+Uso: python soak_test_memory.py [--tweets 2000000] [--hours 48] [--tolerance 0.10]
+Sai com código 1 se a memória rastreada depois do aquecimento continuar crescendo.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Credenciais fictícias, sem inicialização automática e com limites altos (antes de importar o bot)
+for _var in ('API_KEY', 'API_KEY_SECRET', 'ACCESS_TOKEN', 'ACCESS_TOKEN_SECRET', 'BEARER_TOKEN'):
+    os.environ.setdefault(_var, 'soak')
+os.environ['BOT_AUTOSTART'] = '0'
+os.environ['CALL_LOG_DIR'] = ''
+os.environ['POST_JOURNAL_FILE'] = ''
+os.environ.setdefault('POST_QUOTA_WINDOWS', '3600:100')
+os.environ.setdefault('MAX_REPLIES_PER_CYCLE', '20')
+os.environ.setdefault('COMMENT_INTERVAL_SEC', '1')
+# Estruturas limitadas (TTL, tetos, ring buffers) precisam atingir o platô dentro do aquecimento
+os.environ.setdefault('REPLIED_TTL_HOURS', '12')
+os.environ.setdefault('MAX_MONITORED_POSTS', '6')
+os.environ.setdefault('TRACE_BUFFER_SIZE', '500')
+os.environ.setdefault('ACTIVITY_BUFFER_SIZE', '50')
+
+import bot_railway_optimized as bot_module  # noqa: E402
+from clock import VirtualClock  # noqa: E402
+from fake_x_api import FakeXAPI  # noqa: E402
+from http_transport import HTTPTransport  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class FeedingClock(VirtualClock):
+    """Relógio virtual que, a cada sleep do bot, gera os tweets do intervalo na API falsa"""
+
+    def __init__(self, start, stop_at, rate, authors=1000, post_every=900, seed=1):
+        super().__init__(start=start, stop_at=stop_at)
+        self.api = None
+        self.rate = rate  # tweets por segundo virtual
+        self.authors = authors
+        self.post_every = post_every
+        self.rng = random.Random(seed)
+        self.generated = 0
+        self._pending = 0.0
+        self._next_post = start
+        self._next_prune = start + 1800
+        self._next_sample = start
+        self.on_sample = None
+        self.own_post = None
+
+    def sleep(self, seconds):
+        end = self._t + max(seconds, 0)
+        while self._t < end and not self._stopped:
+            step_end = min(end, self._next_post, self._next_prune, self._next_sample)
+            self._feed(self._t, step_end)
+            self.advance(step_end - self._t)
+            self._housekeeping()
+        self.slept += max(seconds, 0)
+
+    def _feed(self, start, end):
+        self._pending += (end - start) * self.rate
+        count = int(self._pending)
+        self._pending -= count
+        if not count:
+            return
+        step = (end - start) / count
+        for n in range(count):
+            ts = start + (n + 0.5) * step
+            author = 100000 + self.rng.randrange(self.authors)
+            if self.own_post and n % 2:
+                self.api.add_reply(ts, self.own_post, author)
+            else:
+                self.api.add_mention(ts, author)
+        self.generated += count
+
+    def _housekeeping(self):
+        now = self._t
+        if now >= self._next_post:
+            self.own_post = self.api.add_own_post(now, text=f"Post {int(now)}")
+            self._next_post = now + self.post_every
+        if now >= self._next_prune:
+            self.api.prune()
+            # O dedup da API falsa só olha os últimos 200 posts
+            del self.api.posted[:-200]
+            self._next_prune = now + 1800
+        if now >= self._next_sample:
+            if self.on_sample:
+                self.on_sample(now)
+            self._next_sample = now + 3600
+
+
+class UniqueResponses:
+    """Textos de resposta sempre distintos (random.choice só usa len e índice).
+
+    Com as ~100 respostas do respostas.txt a API falsa recusa textos repetidos e o
+    bot tenta outros: o soak mediria esse tráfego de retry, não o regime normal.
+    """
+
+    def __init__(self):
+        self.issued = 0
+
+    def __len__(self):
+        return 10 ** 9
+
+    def __getitem__(self, index):
+        self.issued += 1
+        return f"Obrigado pelo comentário! #{self.issued}"
+
+
+def analyze(samples, warmup_fraction, tolerance):
+    """Compara o pico do início e do fim do trecho pós-aquecimento"""
+    steady = samples[int(len(samples) * warmup_fraction):]
+    if len(steady) < 4:
+        raise ValueError("amostras insuficientes: aumente --hours")
+    quarter = max(len(steady) // 4, 1)
+    early = max(traced for _, traced, _ in steady[:quarter])
+    late = max(traced for _, traced, _ in steady[-quarter:])
+    # Inclinação (mínimos quadrados) em MB por dia virtual
+    xs = [(ts - steady[0][0]) / 86400 for ts, _, _ in steady]
+    ys = [traced / MB for _, traced, _ in steady]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs) or 1.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+    return {
+        'early_peak_mb': early / MB,
+        'late_peak_mb': late / MB,
+        'growth': (late - early) / early if early else 0.0,
+        'slope_mb_per_day': slope,
+        'bounded': late <= early * (1 + tolerance),
+    }
+
+
+def run_soak(tweets=2_000_000, hours=48, seed=1, warmup=0.4, tolerance=0.10, start=1760000000.0):
+    random.seed(seed)
+    rate = tweets / (hours * 3600)
+    clock = FeedingClock(start=start, stop_at=start + hours * 3600, rate=rate, seed=seed)
+    api = FakeXAPI(clock, username='drtrafeg0', keep_tweets_sec=1200)
+    clock.api = api
+    clock.own_post = api.add_own_post(start - 60, text="Post inicial")
+
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=clock)
+    responses = UniqueResponses()
+    bot.load_responses = lambda: responses
+    clock.on_stop = lambda: setattr(bot, 'is_running', False)
+
+    samples = []
+
+    def on_sample(now):
+        gc.collect()
+        samples.append((now, tracemalloc.get_traced_memory()[0], bot.memory_state()))
+
+    clock.on_sample = on_sample
+    tracemalloc.start()
+    wall_started = time.perf_counter()
+    if not bot.authenticate():
+        raise RuntimeError("Falha na autenticação contra a API falsa")
+    bot.run_bot_loop()
+    wall = time.perf_counter() - wall_started
+    tracemalloc.stop()
+
+    result = analyze(samples, warmup, tolerance)
+    result.update({
+        'virtual_hours': clock.elapsed / 3600,
+        'wall_seconds': wall,
+        'tweets_generated': clock.generated,
+        'replies_sent': bot.activity.summary()['totals'].get('posted', 0),
+        'api_calls': dict(api.calls),
+        'bot_state': samples[-1][2],
+        'samples': [(round((ts - start) / 3600, 1), round(traced / MB, 2)) for ts, traced, _ in samples],
+    })
+    return result
+
+
+def print_report(result, tolerance):
+    print("🧪 SOAK TEST DE MEMÓRIA")
+    print("=" * 60)
+    print(f"⏰ {result['virtual_hours']:.1f}h virtuais em {result['wall_seconds']:.1f}s reais")
+    print(f"📥 Tweets sintéticos: {result['tweets_generated']:,} | respostas: {result['replies_sent']}")
+    print(f"🌐 Chamadas à API: {result['api_calls']}")
+    print(f"🧠 Estado do bot no fim: {result['bot_state']}")
+    print("📈 Memória rastreada (h virtual, MB): "
+          + ' '.join(f"{h}:{mb}" for h, mb in result['samples']))
+    print(f"   Pico pós-aquecimento início: {result['early_peak_mb']:.2f} MB | "
+          f"fim: {result['late_peak_mb']:.2f} MB | crescimento: {result['growth'] * 100:+.1f}% "
+          f"| inclinação: {result['slope_mb_per_day']:+.2f} MB/dia")
+    if result['bounded']:
+        print(f"✅ Memória estável (tolerância {tolerance * 100:.0f}%)")
+    else:
+        print(f"❌ Memória crescendo além da tolerância de {tolerance * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Soak test de memória do bot em tempo virtual")
+    parser.add_argument('--tweets', type=int, default=2_000_000)
+    parser.add_argument('--hours', type=float, default=48)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--warmup', type=float, default=0.4, help="fração inicial ignorada")
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    result = run_soak(args.tweets, args.hours, args.seed, args.warmup, args.tolerance)
+    print_report(result, args.tolerance)
+    sys.exit(0 if result['bounded'] else 1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtro de spam e de respostas copiadas
+Textos viram vetores de n-gramas de caracteres com hash (NumPy); a similaridade de
+cosseno contra modelos de spam e contra os textos vistos recentemente é calculada
+em lote, uma vez por ciclo
+"""
+
+import re
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy o bot roda sem este filtro
+    np = None
+
+# Modelos de spam comuns em threads de cripto (comparados por similaridade, não por igualdade)
+SPAM_TEMPLATES = [
+    "giveaway alert claim your free airdrop now link in bio",
+    "free airdrop claim now limited spots connect your wallet",
+    "dm me for the best crypto signals 100x guaranteed profits",
+    "send 0.0 eth and receive 0.0 eth back instantly",
+    "join our telegram group for daily 100x gems url",
+    "i made $0000 in one week thanks to this trader dm him",
+    "check my bio for free crypto giveaway",
+    "whatsapp me for investment opportunity guaranteed returns",
+    "pump incoming buy now before it moons 1000x",
+    "follow back and retweet to win free nft mint",
+    "ganhe dinheiro rápido com cripto me chama no privado",
+    "sorteio de airdrop grátis clique no link da bio",
+]
+
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+_MENTION_RE = re.compile(r'@\w+')
+_DIGIT_RE = re.compile(r'\d')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize(text):
+    """Minúsculas, sem menções, links como 'url', dígitos como '0' e espaços colapsados"""
+    text = _URL_RE.sub(' url ', (text or '').lower())
+    text = _MENTION_RE.sub(' ', text)
+    text = _DIGIT_RE.sub('0', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+class SpamFilter:
+    """Rejeita candidatos parecidos com spam conhecido ou com outros textos recentes.
+
+    - dims: tamanho do vetor de hash (float32)
+    - threshold: cosseno a partir do qual dois textos são "o mesmo" (copiar e colar)
+    - spam_threshold: cosseno mínimo contra um modelo de spam
+    - min_chars: textos normalizados mais curtos ("gm!") não são checados por duplicata
+    - recent: quantos textos de ciclos anteriores ficam para comparação (ring buffer)
+    """
+
+    def __init__(self, dims=512, ngram=3, threshold=0.85, spam_threshold=0.6, min_chars=20,
+                 recent=2000, templates=None, block_rows=512):
+        if np is None:
+            raise RuntimeError("numpy não instalado: pip install numpy")
+        self.dims = dims
+        self.ngram = ngram
+        self.threshold = threshold
+        self.spam_threshold = spam_threshold
+        self.min_chars = min_chars
+        self.block_rows = block_rows
+        self.templates = self.vectorize([normalize(t) for t in (templates or SPAM_TEMPLATES)])
+        self._recent = np.zeros((recent, dims), dtype=np.float32)
+        self._recent_ids = np.zeros(recent, dtype=np.uint64)
+        self._slots = {}  # tweet_id -> posição no ring buffer
+        self._next = 0
+        self._filled = 0
+        self.checked = 0
+        self.rejected = {'spam': 0, 'duplicate': 0}
+
+    def vectorize(self, texts):
+        """Matriz (len(texts), dims) L2-normalizada, montada com um único bincount"""
+        n = len(texts)
+        codes = [np.frombuffer(t.encode('utf-32-le'), dtype=np.uint32) for t in texts]
+        lengths = np.array([len(c) for c in codes], dtype=np.int64)
+        matrix = np.zeros(n * self.dims, dtype=np.float32)
+        total = int(lengths.sum())
+        if total >= self.ngram:
+            chars = np.concatenate(codes).astype(np.uint64)
+            doc = np.repeat(np.arange(n, dtype=np.int64), lengths)
+            windows = total - self.ngram + 1
+            # Hash polinomial de cada janela de `ngram` caracteres (estouro de uint64 é intencional)
+            hashed = np.zeros(windows, dtype=np.uint64)
+            with np.errstate(over='ignore'):
+                for k in range(self.ngram):
+                    hashed = hashed * np.uint64(1000003) + chars[k:k + windows]
+                hashed ^= hashed >> np.uint64(29)
+            # Janelas que atravessam a fronteira entre dois textos não contam
+            valid = doc[:windows] == doc[self.ngram - 1:]
+            buckets = (hashed[valid] % np.uint64(self.dims)).astype(np.int64)
+            matrix = np.bincount(doc[:windows][valid] * self.dims + buckets,
+                                 minlength=n * self.dims).astype(np.float32)
+        matrix = matrix.reshape(n, self.dims)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _max_similarity(self, vectors, ids):
+        """Maior cosseno de cada texto contra os recentes e os demais do lote (outro tweet)"""
+        reference = np.vstack([self._recent[:self._filled], vectors])
+        reference_ids = np.concatenate([self._recent_ids[:self._filled], ids])
+        best = np.zeros(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), self.block_rows):
+            block = vectors[start:start + self.block_rows] @ reference.T
+            # O mesmo tweet visto de novo (ciclo anterior ou ele mesmo) não é duplicata
+            block[ids[start:start + self.block_rows, None] == reference_ids[None, :]] = 0
+            best[start:start + self.block_rows] = block.max(axis=1)
+        return best
+
+    def _remember(self, vectors, ids):
+        capacity = len(self._recent)
+        for vector, tweet_id in zip(vectors, ids.tolist()):
+            if tweet_id in self._slots:
+                continue
+            old_id = int(self._recent_ids[self._next])
+            if self._slots.get(old_id) == self._next:
+                del self._slots[old_id]
+            self._recent[self._next] = vector
+            self._recent_ids[self._next] = tweet_id
+            self._slots[tweet_id] = self._next
+            self._next = (self._next + 1) % capacity
+            self._filled = min(self._filled + 1, capacity)
+
+    def check(self, candidates):
+        """Lista de bools (True = manter), na ordem dos candidatos"""
+        if not candidates:
+            return []
+        texts = [normalize(getattr(c, 'text', '')) for c in candidates]
+        ids = np.array([c.tweet.id for c in candidates], dtype=np.uint64)
+        vectors = self.vectorize(texts)
+
+        spam = (vectors @ self.templates.T).max(axis=1) >= self.spam_threshold
+        long_enough = np.array([len(t) >= self.min_chars for t in texts])
+        duplicate = long_enough & (self._max_similarity(vectors, ids) >= self.threshold) & ~spam
+
+        self._remember(vectors, ids)
+        self.checked += len(candidates)
+        self.rejected['spam'] += int(spam.sum())
+        self.rejected['duplicate'] += int(duplicate.sum())
+        return (~(spam | duplicate)).tolist()
+
+    def stats(self):
+        return {'checked': self.checked, 'rejected': dict(self.rejected), 'recent_texts': self._filled}
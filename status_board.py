@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quadro de status do bot com snapshots imutáveis
+A thread do bot publica; os endpoints só leem a referência atual (sem lock)
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from types import MappingProxyType
+
+# Campos servidos em / (healthcheck enxuto); /status serve tudo
+HEALTH_FIELDS = ('status', 'bot_running', 'daily_limit', 'daily_posts', 'last_activity',
+                 'monitored_posts', 'replies_found', 'timestamp', 'error')
+
+
+def _etag(body):
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+class StatusSnapshot:
+    """Estado congelado com os corpos JSON já serializados"""
+
+    __slots__ = ('data', 'version', 'health_body', 'health_etag', 'status_body', 'status_etag')
+
+    def __init__(self, data, version):
+        self.data = MappingProxyType(data)
+        self.version = version
+        self.health_body = json.dumps({k: data.get(k) for k in HEALTH_FIELDS}).encode()
+        self.health_etag = _etag(self.health_body)
+        self.status_body = json.dumps(data, default=str).encode()
+        self.status_etag = _etag(self.status_body)
+
+
+class StatusBoard:
+    """Publica snapshots novos a cada mudança e troca a referência atomicamente.
+
+    Escritores serializam entre si com um lock; leitores apenas pegam
+    `self._snapshot` (uma atribuição de referência é atômica no CPython) e
+    nunca veem um dicionário pela metade.
+    """
+
+    def __init__(self, initial):
+        self._lock = threading.Lock()
+        self._snapshot = self._build(dict(initial), 0)
+
+    @staticmethod
+    def _build(data, version):
+        data['timestamp'] = datetime.now().isoformat()
+        return StatusSnapshot(data, version)
+
+    def publish(self, **changes):
+        """Aplica as mudanças e publica um novo snapshot"""
+        with self._lock:
+            current = self._snapshot
+            data = dict(current.data)
+            data.update(changes)
+            self._snapshot = self._build(data, current.version + 1)
+
+    def snapshot(self):
+        return self._snapshot
+
+    def __getitem__(self, key):
+        return self._snapshot.data[key]
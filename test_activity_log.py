@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO /activity
+Respostas publicadas e falhas (com motivo da API) ficam no ring buffer do bot e são
+servidas em /activity sem nenhuma chamada à API.
+"""
+
+import bot_railway_optimized as bot_module
+from activity_log import ActivityLog
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+
+START = 1760000000.0
+
+
+def test_ring_buffer_filters():
+    now = [START]
+    log = ActivityLog(capacity=3, clock=lambda: now[0])
+    for action in ('posted', 'failed', 'posted', 'posted'):
+        log.record(action, reply_to='1')
+        now[0] += 10
+    assert [e['ts'] for e in log.recent()] == [START + 30, START + 20, START + 10]
+    assert len(log.recent(action='posted')) == 2 and log.recent(since=START + 15)[-1]['ts'] == START + 20
+    assert log.summary()['totals'] == {'posted': 3, 'failed': 1}
+    assert log.summary()['last_post_ts'] == START + 30
+
+
+def test_activity_endpoint_serves_posts_and_failures():
+    clock = VirtualClock(start=START)
+    api = FakeXAPI(clock)
+    mentions = [api.add_mention(START - 60 * (n + 1), 2000 + n) for n in range(2)]
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=clock)
+    assert bot.authenticate()
+    bot.create_tweet("Valeu!", reply_to=mentions[0], source='mention')
+    bot.create_tweet("Valeu!", reply_to='999', source='mention')  # alvo inexistente: 400
+
+    client = bot_module.app.test_client()
+    previous, bot_module.bot = bot_module.bot, bot
+    try:
+        calls = sum(api.calls.values())
+        body = client.get('/activity?limit=10').get_json()
+        failed = client.get('/activity?action=failed').get_json()['activity']
+    finally:
+        bot_module.bot = previous
+    assert sum(api.calls.values()) == calls  # servido da memória
+    assert [e['action'] for e in body['activity']] == ['failed', 'posted']
+    assert body['activity'][1]['reply_to'] == mentions[0] and body['daily_posts'] == 1
+    assert failed[0]['status'] == 400 and 'reply target not found' in failed[0]['reason']
+
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO WATCHDOG
+Heartbeat atrasado ou thread morta sobem um worker novo; o worker antigo percebe
+que foi substituído e sai sem fazer mais nada.
+"""
+
+import threading
+
+from bot_watchdog import BotWatchdog, WorkerSuperseded
+
+
+class LoopBot:
+    """Bot mínimo: o loop só confere a geração, como o check_superseded do bot real"""
+
+    heartbeat_grace_sec = 120
+
+    def __init__(self):
+        self.worker_generation = 0
+        self.overdue = False
+        self.started = []
+        self.superseded = []
+        self.stop = threading.Event()
+
+    def heartbeat(self, expected_sec=0):
+        self.overdue = False
+
+    def heartbeat_overdue(self):
+        return self.overdue
+
+    def heartbeat_age(self):
+        return 999 if self.overdue else 0
+
+    def run_bot_loop(self, generation=None):
+        self.started.append(generation)
+        try:
+            while not self.stop.wait(0.005):
+                if generation != self.worker_generation:
+                    raise WorkerSuperseded(generation)
+        except WorkerSuperseded:
+            self.superseded.append(generation)
+            raise
+
+
+def test_stalled_worker_is_replaced():
+    bot = LoopBot()
+    changes = []
+    watchdog = BotWatchdog(bot, on_change=changes.append)
+    first = watchdog.start_worker()
+    assert watchdog.check() is None and changes[-1]['alive']
+
+    bot.overdue = True
+    assert watchdog.check().startswith('heartbeat atrasado')
+    first.join(2)
+    assert not first.is_alive() and bot.superseded == [1]
+    assert watchdog.thread.is_alive() and bot.started == [1, 2] and watchdog.restarts == 1
+
+    bot.stop.set()  # worker "morre"
+    watchdog.thread.join(2)
+    assert watchdog.check() == 'thread morta' and bot.worker_generation == 3
+    watchdog.thread.join(2)
+    assert changes[-1]['restarts'] == 2
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
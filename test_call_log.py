@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO LOG BINÁRIO DE CHAMADAS
+Registros de largura fixa num arquivo por dia UTC, lidos de volta com numpy.memmap
+(filtro por intervalo e registro final incompleto ignorado).
+"""
+
+import os
+
+import pytest
+
+from call_log import ENDPOINTS, KIND_CALL, KIND_POST, KIND_POST_FAILED, RECORD, CallLog, endpoint_code
+from clock import VirtualClock
+
+pytest.importorskip('numpy')  # só a leitura precisa de numpy
+from query_call_log import load_records  # noqa: E402
+
+MIDNIGHT = 1760054400.0  # 2025-10-10T00:00:00Z
+
+
+def test_endpoint_codes():
+    assert endpoint_code('/2/users/1000/tweets?max_results=5') == ENDPOINTS['/users/:id/tweets']
+    assert endpoint_code('/2/tweets/search/recent') == ENDPOINTS['/tweets/search/recent']
+    assert endpoint_code('/2/desconhecido') == 0
+
+
+def test_records_roundtrip_across_days(tmp_path):
+    clock = VirtualClock(start=MIDNIGHT - 60)
+    log = CallLog(str(tmp_path), clock)
+    log.record_call('GET', '/2/tweets/search/recent', 200, 0.25, rate_remaining='179', size=512)
+    clock.advance(120)  # vira o dia UTC: arquivo novo
+    log.record_post('1978000000000000001', reply_to='1977000000000000000', status=201)
+    log.record_post(None, reply_to='1977000000000000001', status=403, ok=False)
+    log.close()
+
+    files = sorted(os.listdir(tmp_path))
+    assert files == ['calls-20251009.bin', 'calls-20251010.bin']
+    with open(tmp_path / files[1], 'ab') as f:
+        f.write(b'\x00' * (RECORD.size // 2))  # processo morto no meio de um registro
+
+    records = load_records(str(tmp_path))
+    assert records['kind'].tolist() == [KIND_CALL, KIND_POST, KIND_POST_FAILED]
+    assert records['latency_ms'][0] == 250 and records['rate_remaining'][0] == 179
+    assert int(records['tweet_id'][1]) == 1978000000000000001 and records['tweet_id'][2] == 0
+    assert records['status'].tolist() == [200, 201, 403]
+
+    after_midnight = load_records(str(tmp_path), since=MIDNIGHT)
+    assert len(after_midnight) == 2 and len(load_records(str(tmp_path), until=MIDNIGHT)) == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, '-q']))
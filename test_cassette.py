@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DOS CASSETES
+Gravação sem credenciais, reprodução na ordem gravada e cassete .gz legível mesmo
+quando o processo morre sem fechar o gravador (ou no meio de uma escrita).
+"""
+
+from cassette import CassettePlayer, CassetteRecorder, load_cassette
+
+
+class StubResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {'x-rate-limit-remaining': '9', 'set-cookie': 'segredo'}
+
+
+class StubSession:
+    def __init__(self):
+        self.count = 0
+
+    def request(self, method, url, **kwargs):
+        self.count += 1
+        return StubResponse(200, f'{{"n": {self.count}}}')
+
+
+def test_gzip_cassette_survives_a_killed_process(tmp_path):
+    path = str(tmp_path / 'trafego.jsonl.gz')
+    recorder = CassetteRecorder(StubSession(), path)
+    for _ in range(3):
+        recorder.request('GET', 'https://api.x.com/2/users/me?oauth_token=abc',
+                         headers={'Authorization': 'Bearer x'}, params={'query': '@bot'})
+    # Sem close(): o processo "morreu"; e a última escrita ficou pela metade
+    with open(path, 'ab') as f:
+        f.write(b'\x1f\x8b\x08\x00partial')
+
+    entries = load_cassette(path)
+    assert [e['r'] for e in entries] == ['{"n": 1}', '{"n": 2}', '{"n": 3}']
+    assert 'abc' not in entries[0]['u'] and entries[0]['h'] == {'x-rate-limit-remaining': '9'}
+
+    player = CassettePlayer(entries)
+    assert [player.request('GET', 'https://api.x.com/2/users/me', params={'query': '@bot'}).json()['n']
+            for _ in range(3)] == [1, 2, 3]
+    assert player.remaining() == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DOS CIRCUIT BREAKERS
+Fechado → aberto após falhas seguidas, corte enquanto aberto, uma única sonda no
+meio-aberto e volta a fechado (ou a aberto) conforme o resultado da sonda, inclusive
+quando o worker que mandou a sonda é substituído pelo watchdog durante a chamada.
+"""
+
+import pytest
+
+import bot_railway_optimized as bot_module
+from bot_watchdog import WorkerSuperseded
+from circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, is_failure_status)
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+
+
+def test_state_transitions():
+    clock = VirtualClock(start=0)
+    breaker = CircuitBreaker('search', failure_threshold=3, reset_timeout=60, clock=clock.monotonic)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    breaker.record_success()  # sucesso zera a sequência
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow() and breaker.short_circuited == 1
+
+    clock.advance(60)
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # só uma sonda por vez
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.retry_in() == 60 and breaker.times_opened == 2
+
+    clock.advance(60)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow() and breaker.info()['failures'] == 0
+
+
+def test_registry_overrides_and_failure_statuses():
+    registry = BreakerRegistry(env={'BREAKER_FAILURES': '4', 'BREAKER_FAILURES_AUTH': '2'})
+    assert registry['auth'].failure_threshold == 2 and registry['post'].failure_threshold == 4
+    assert set(registry.snapshot()) == {'auth', 'timeline', 'search', 'post', 'users'}
+    assert [is_failure_status(s) for s in (200, 400, 401, 403, 429, 503)] == [
+        False, True, True, False, False, True]
+
+
+def test_superseded_probe_still_closes_the_half_open_breaker():
+    clock = VirtualClock(start=1760000000.0)
+    api = FakeXAPI(clock)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=clock)
+    breaker = bot.breakers['search']
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    clock.advance(breaker.reset_timeout)
+
+    class RestartDuringCall:
+        """Sessão em que o watchdog sobe um worker novo enquanto a sonda está na rede"""
+        def request(self, *args, **kwargs):
+            bot.worker_generation += 1
+            return api.request(*args, **kwargs)
+
+    bot.http = HTTPTransport(session=RestartDuringCall())
+    bot._worker.generation = bot.worker_generation
+    with pytest.raises(WorkerSuperseded):
+        bot.search_mentions()
+    assert breaker.state == CLOSED and breaker.allow()
+
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO TRANSPORTE HTTP (SINGLE-FLIGHT)
+GETs idênticos em andamento saem uma vez só e compartilham resposta ou exceção;
+POSTs e credenciais diferentes nunca são coalescidos.
+"""
+
+import threading
+import time
+
+from http_transport import HTTPTransport
+
+URL = "https://api.x.com/2/tweets/search/recent"
+
+
+class SlowSession:
+    """Sessão que segura cada requisição até `release` ser ligado"""
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        self.error = error
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, (kwargs.get('headers') or {}).get('Authorization')))
+        number = len(self.calls)
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return f"resposta {number}"
+
+
+def concurrent(transport, requests_args, session):
+    """Dispara as requisições em threads e libera a sessão quando todas pediram"""
+    results = [None] * len(requests_args)
+
+    def run(index, args):
+        try:
+            results[index] = transport.request(*args)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(n, args)) for n, args in enumerate(requests_args)]
+    threads[0].start()
+    session.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while transport.saved_calls + len(session.calls) < len(requests_args) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    session.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_identical_gets_share_one_call():
+    session = SlowSession()
+    transport = HTTPTransport(session=session)
+    oauth = {'Authorization': 'OAuth oauth_nonce="{}", oauth_token="tok"'}
+    args = [('GET', URL, {'Authorization': oauth['Authorization'].format(n)}, {'query': '@bot'})
+            for n in range(4)]
+    args.append(('GET', URL, {'Authorization': 'Bearer outro'}, {'query': '@bot'}))
+
+    results = concurrent(transport, args, session)
+
+    assert len(session.calls) == 2 and transport.saved_calls == 3
+    assert len(set(results[:4])) == 1 and results[4] != results[0]
+    assert transport.stats()['in_flight'] == 0
+
+
+def test_error_is_shared_and_posts_are_not_coalesced():
+    session = SlowSession(error=TimeoutError("lento"))
+    transport = HTTPTransport(session=session)
+    results = concurrent(transport, [('GET', URL), ('GET', URL)], session)
+    assert all(isinstance(r, TimeoutError) for r in results) and len(session.calls) == 1
+
+    session = SlowSession()
+    session.release.set()
+    transport = HTTPTransport(session=session)
+    transport.post(URL, json={'text': 'oi'})
+    transport.post(URL, json={'text': 'oi'})
+    assert len(session.calls) == 2 and transport.saved_calls == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DE POSTAGEM IDEMPOTENTE
+Injeta timeouts e 5xx no POST /tweets da API falsa e verifica que cada alvo recebe
+no máximo uma resposta, inclusive entre restarts (journal em arquivo).
+"""
+
+import logging
+import random
+
+import bot_railway_optimized as bot_module
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+from post_journal import PostJournal
+from tracing import tracer
+
+START = 1760000000.0
+
+
+def make_api():
+    clock = VirtualClock(start=START)
+    api = FakeXAPI(clock)
+    target = api.add_mention(START - 600, 2000)
+    return api, target
+
+
+def make_bot(api, journal_path=None):
+    random.seed(3)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=api.clock)
+    if journal_path:
+        bot.journal = PostJournal(path=journal_path, clock=api.clock.time)
+    assert bot.authenticate()
+    return bot
+
+
+def replies_to(api, target):
+    return [tweet_id for _, reply_to, tweet_id in api.posted if reply_to == target]
+
+
+def test_timeout_after_create_is_reconciled_without_reposting():
+    api, target = make_api()
+    bot = make_bot(api)
+    api.fail_next_posts('timeout_after')
+
+    assert bot.create_tweet("gm", reply_to=target)
+    assert len(replies_to(api, target)) == 1
+    assert bot.journal.stats() == {'pending': 0, 'outcomes': {'reconciled': 1}}
+    assert bot.daily_posts == 1
+
+
+def test_timeout_before_create_retries_once():
+    api, target = make_api()
+    bot = make_bot(api)
+    api.fail_next_posts('timeout_before', '503')
+
+    assert bot.create_tweet("gm", reply_to=target)
+    assert len(replies_to(api, target)) == 1
+    assert bot.journal.stats()['outcomes'] == {'posted': 1}
+    span = tracer.recent(name='create_tweet')[-1]
+    assert span['depth'] == 0 and span['error'] is None
+
+
+def test_pending_entry_survives_restart_and_is_not_reposted(tmp_path):
+    api, target = make_api()
+    journal = str(tmp_path / 'journal.jsonl')
+    bot = make_bot(api, journal)
+    bot.post_retry_max = 0
+    api.fail_next_posts('503_after')
+
+    assert not bot.create_tweet("gm", reply_to=target)
+    bot.journal.close()
+
+    restarted = make_bot(api, journal)
+    assert len(restarted.journal) == 1
+    assert restarted.create_tweet("outro texto", reply_to=target)
+    assert len(replies_to(api, target)) == 1
+    assert len(restarted.journal) == 0
+
+
+def test_duplicate_after_ambiguous_attempt_is_reconciled():
+    api, target = make_api()
+    bot = make_bot(api)
+    lookup, calls = bot.find_own_reply, []
+
+    def flaky_lookup(reply_to, since_ts):
+        calls.append(reply_to)
+        if len(calls) == 1:
+            return False  # timeline própria indisponível na primeira conferência
+        return lookup(reply_to, since_ts)
+
+    bot.find_own_reply = flaky_lookup
+    api.fail_next_posts('503_after')
+
+    assert bot.create_tweet("gm", reply_to=target)
+    assert len(replies_to(api, target)) == 1
+    assert bot.journal.stats()['outcomes'] == {'reconciled': 1}
+    assert bot.daily_posts == 1 and len(calls) == 2  # conferiu de novo após o 403
+
+
+def test_duplicate_after_ambiguous_attempt_without_reply_picks_another_text():
+    api, target = make_api()
+    other = api.add_mention(START - 300, 2001)
+    bot = make_bot(api)
+    assert bot.create_tweet("gm", reply_to=other)
+    api.fail_next_posts('503')
+
+    # O 403 veio do texto repetido no outro alvo: nada na timeline, então outro texto
+    assert bot.create_tweet("gm", reply_to=target, alternatives=["gm", "valeu"])
+    assert [api.tweets[t][1]['text'] for t in replies_to(api, target)] == ["valeu"]
+    assert bot.journal.stats()['outcomes'] == {'posted': 2, 'duplicate_text': 1}
+    assert bot.daily_posts == 2
+
+
+def test_first_attempt_duplicate_text_picks_another_text():
+    api, target = make_api()
+    other = api.add_mention(START - 300, 2001)
+    bot = make_bot(api)
+    assert bot.create_tweet("gm", reply_to=target)
+
+    # A X recusa o mesmo texto em outro tweet: não é resposta já dada
+    assert not bot.create_tweet("gm", reply_to=other)
+    assert bot.create_tweet("gm", reply_to=other, alternatives=["gm", "valeu"])
+    assert [api.tweets[t][1]['text'] for t in replies_to(api, other)] == ["valeu"]
+    assert bot.journal.stats()['outcomes'] == {'posted': 2, 'duplicate_text': 2}
+    assert bot.daily_posts == 2
+
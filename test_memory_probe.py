@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DA SONDA DE MEMÓRIA
+Amostras de RSS com intervalo mínimo e ring buffer, top de alocações e crescimento
+com tracemalloc, e o endpoint /debug/memory (liga/desliga o tracemalloc).
+"""
+
+import tracemalloc
+
+import bot_railway_optimized as bot_module
+from memory_probe import MemoryMonitor, rss_bytes
+
+START = 1760000000.0
+
+
+def test_rss_is_read_from_the_process():
+    assert rss_bytes() is None or rss_bytes() > 1024 * 1024
+
+
+def test_samples_respect_interval_and_capacity():
+    now = [START]
+    monitor = MemoryMonitor(capacity=3, min_interval=60, clock=lambda: now[0])
+    first = monitor.sample()
+    assert first['ts'] == START and (first['rss_bytes'] or 0) >= 0
+    assert monitor.sample() is None  # antes do intervalo mínimo
+    assert monitor.sample(force=True) is not None
+    for _ in range(3):
+        now[0] += 60
+        monitor.sample()
+    history = monitor.history()
+    assert len(history) == 3 and history[-1]['ts'] == START + 180
+    assert history[-1]['traced_bytes'] is None  # tracemalloc desligado
+
+
+def test_top_and_diff_while_tracing():
+    monitor = MemoryMonitor()
+    assert monitor.top() is None
+    monitor.start_tracing()
+    try:
+        retained = [bytearray(1024) for _ in range(2000)]
+        grown = monitor.top(limit=5, diff=True)
+        assert grown[0]['size_diff_bytes'] >= 2000 * 1024
+        assert grown[0]['where'].startswith(__file__)
+        report = monitor.report(limit=3, group_by='filename')
+        assert report['tracing'] and len(report['top']) <= 3 and report['traced_bytes'] > 0
+        del retained
+    finally:
+        monitor.stop_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_debug_memory_endpoint(monkeypatch):
+    monkeypatch.setenv('DEBUG_TOKEN', 'segredo')
+    monkeypatch.setattr(bot_module, 'bot', None)
+    client = bot_module.app.test_client()
+    headers = {'Authorization': 'Bearer segredo'}
+    try:
+        report = client.get('/debug/memory?start=1&limit=2', headers=headers).get_json()
+        assert report['tracing'] and len(report['top']) <= 2
+        assert report['history'] and report['bot'] is None
+
+        assert client.get('/debug/memory?group_by=pilha', headers=headers).status_code == 400
+        report = client.get('/debug/memory?stop=1', headers=headers).get_json()
+        assert not report['tracing'] and report['top'] is None
+    finally:
+        bot_module.memory.stop_tracing()
+
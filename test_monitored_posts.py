@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DOS POSTS MONITORADOS
+Janela completa de 7 dias carregada na autenticação, atualização incremental via
+since_id e descarte dos posts que saem da janela (ou passam do teto).
+"""
+
+import bot_railway_optimized as bot_module
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+
+START = 1760000000.0
+
+
+class SpySession:
+    """Guarda os parâmetros de cada chamada à timeline própria"""
+
+    def __init__(self, api):
+        self.api = api
+        self.timeline_params = []
+
+    def request(self, method, url, **kwargs):
+        if url.endswith('/tweets') and '/users/' in url:
+            self.timeline_params.append(dict(kwargs.get('params') or {}))
+        return self.api.request(method, url, **kwargs)
+
+
+def test_window_refresh_and_eviction():
+    clock = VirtualClock(start=START)
+    api = FakeXAPI(clock)
+    api.add_own_post(START - 86400 * 8)  # fora da busca recente
+    posts = [api.add_own_post(START - 86400 * days) for days in (6.5, 3, 1)]
+    spy = SpySession(api)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=spy), clock=clock)
+
+    assert bot.authenticate()
+    assert set(bot.monitored_posts) == set(posts) and 'since_id' not in spy.timeline_params[0]
+    assert bot.monitored_posts.since_id == posts[-1]
+
+    clock.advance(86400)  # o post de 6,5 dias sai da janela
+    newest = api.add_own_post(clock.time())
+    bot.refresh_monitored_posts()
+    assert spy.timeline_params[-1]['since_id'] == posts[-1]  # só os posts novos
+    assert list(bot.monitored_posts) == [newest, posts[2], posts[1]]
+    assert bot.monitored_posts.stats()['evicted'] == 1
+
+    bot.monitored_posts.cap = 2
+    assert bot.monitored_posts.evict() == 1 and list(bot.monitored_posts) == [newest, posts[2]]
+
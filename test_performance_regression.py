@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DE REGRESSÃO DE DESEMPENHO
+Reproduz um tráfego fixo gravado em cassete e verifica, para dois ciclos de
+process_cycle, o número de chamadas à API e o tempo que cada ciclo passa esperando
+no relógio virtual (só o espaçamento entre respostas, sem retry nem backoff).
+Regravar o cassete (a partir da API falsa):
+python -m pytest test_performance_regression.py --record-cassette
+"""
+
+import os
+import random
+
+import pytest
+
+import bot_railway_optimized as bot_module
+from cassette import CassettePlayer, CassetteRecorder
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+
+CASSETTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cassettes', 'ciclo_basico.jsonl.gz')
+# Início do relógio virtual na gravação e na reprodução (2025-10-09T08:53:20Z)
+CASSETTE_START = 1760000000.0
+
+# Chamadas esperadas por fase (método, caminho) -> quantidade
+EXPECTED_CALLS = {
+    'authenticate': {('GET', '/2/users/me'): 1, ('GET', '/2/users/1000/tweets'): 1},
+    # Menções + uma busca por post monitorado; 3 respostas por ciclo (MAX_REPLIES_PER_CYCLE)
+    'process_cycle': {('GET', '/2/tweets/search/recent'): 4, ('POST', '/2/tweets'): 3},
+    'process_cycle_repeat': {('GET', '/2/tweets/search/recent'): 4, ('POST', '/2/tweets'): 3},
+}
+
+
+def build_traffic(api):
+    """Tráfego fixo: 3 posts próprios, 5 menções e 6 comentários já publicados"""
+    posts = [api.add_own_post(CASSETTE_START - 3600 * (n + 2), text=f"Post {n}") for n in range(3)]
+    for n in range(5):
+        api.add_user(2000 + n, followers=10 ** n)
+        api.add_mention(CASSETTE_START - 600 * (n + 1), 2000 + n)
+    for n in range(6):
+        api.add_reply(CASSETTE_START - 300 * (n + 1), posts[n % 3], 3000 + n)
+
+
+def make_bot(session):
+    random.seed(7)
+    clock = VirtualClock(start=CASSETTE_START)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=session, single_flight=False),
+                             clock=clock)
+    return bot
+
+
+def run_phases(bot, on_phase=None):
+    """Executa as fases na ordem gravada e devolve (fase, segundos virtuais, esperas)"""
+    timings = []
+    sleeps = []
+    sleep = bot.sleep
+
+    def recorded_sleep(seconds, reason, wake=None):
+        sleeps.append((reason, seconds))
+        return sleep(seconds, reason, wake)
+
+    bot.sleep = recorded_sleep
+    phases = [
+        ('authenticate', bot.authenticate),
+        ('process_cycle', bot.process_cycle),
+        ('process_cycle_repeat', bot.process_cycle),
+    ]
+    for name, phase in phases:
+        started = bot.clock.monotonic()
+        del sleeps[:]
+        phase()
+        timings.append((name, bot.clock.monotonic() - started, list(sleeps)))
+        if on_phase:
+            on_phase(name)
+    return timings
+
+
+def record():
+    clock = VirtualClock(start=CASSETTE_START)
+    api = FakeXAPI(clock)
+    build_traffic(api)
+    os.makedirs(os.path.dirname(CASSETTE), exist_ok=True)
+    if os.path.exists(CASSETTE):
+        os.remove(CASSETTE)
+    recorder = CassetteRecorder(api, CASSETTE)
+    bot = make_bot(recorder)
+    # O relógio da API falsa precisa andar junto com o do bot
+    api.clock = bot.clock
+    run_phases(bot)
+    recorder.close()
+
+
+@pytest.fixture(scope='module', autouse=True)
+def recorded_cassette(request):
+    """Com --record-cassette, regrava antes de reproduzir"""
+    if request.config.getoption('--record-cassette'):
+        record()
+
+
+def replay_phase_calls():
+    player = CassettePlayer(CASSETTE)
+    bot = make_bot(player)
+    per_phase = {}
+    seen = {}
+
+    def on_phase(name):
+        per_phase[name] = {k: v - seen.get(k, 0) for k, v in player.calls.items() if v - seen.get(k, 0)}
+        seen.update(player.calls)
+
+    timings = run_phases(bot, on_phase)
+    return player, per_phase, timings, bot
+
+
+def test_replay_call_counts():
+    player, per_phase, _, _ = replay_phase_calls()
+    assert per_phase == EXPECTED_CALLS
+    assert player.remaining() == 0
+
+
+def test_replay_cycle_waits_only_between_replies():
+    _, per_phase, timings, bot = replay_phase_calls()
+    first_min, first_max = bot.first_reply_delay_sec
+    for name, elapsed, sleeps in timings:
+        posts = per_phase[name].get(('POST', '/2/tweets'), 0)
+        assert [reason for reason, _ in sleeps] == ['reply_interval'] * posts, name
+        assert elapsed == sum(seconds for _, seconds in sleeps), name
+        if posts:
+            spacing = (posts - 1) * bot.comment_interval_sec
+            assert first_min + spacing <= elapsed <= first_max + spacing, name
+
+
+def test_replay_latency_summary():
+    _, _, _, bot = replay_phase_calls()
+    summary = bot.latency.stats()
+    # 6 respostas (3 por ciclo), cada uma com as quatro fases medidas
+    assert {phase: hist['count'] for phase, hist in summary['overall'].items()} == {
+        'discovery': 6, 'waiting': 6, 'posting': 6, 'total': 6}
+    assert summary['overall']['total']['max'] <= 3600
+    # Os já respondidos que voltam na busca do segundo ciclo não contam como descarte;
+    # o resto ficou fora do orçamento
+    assert summary['drops'] == {'budget': 13}
+    assert summary['by_source']['mentions']['total']['count'] == 3
+    assert sum(1 for key in summary['by_source'] if key.startswith('post:')) == 3
+    assert summary['tracked'] == 5  # vistos e ainda sem resposta
+
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO PIPELINE DE CANDIDATOS
+Fontes preguiçosas → dedup (inclusive repetidos da mesma rodada) → filtros →
+filtros em lote → priorizador → outbox, com descartes por motivo e contadores.
+"""
+
+from pipeline import ReplyPipeline
+
+
+class Item:
+    def __init__(self, tweet_id, score):
+        self.tweet_id = tweet_id
+        self.score = score
+
+    def __repr__(self):
+        return f"Item({self.tweet_id})"
+
+
+def test_round_drops_and_stats():
+    pulled = []
+
+    def source(items):
+        def generate():
+            for item in items:
+                pulled.append(item.tweet_id)
+                yield item
+        return generate
+
+    mentions = [Item('1', 5), Item('2', 1), Item('3', 9)]
+    comments = [Item('3', 9), Item('4', 7), Item('5', 8), Item('6', 6)]
+    drops, posted = [], []
+    pipeline = ReplyPipeline(
+        sources={'mentions': source(mentions), 'comments': source(comments)},
+        dedup=lambda item: item.tweet_id == '1',  # já respondido
+        filters=[('odd', lambda item: item.tweet_id != '5')],
+        batch_filters=[('spam', lambda items: [item.tweet_id != '6' for item in items])],
+        prioritizer=lambda stream, k: sorted(stream, key=lambda i: i.score, reverse=True)[:k],
+        outbox=lambda selected: posted.extend(selected) or len(selected),
+        on_drop=lambda item, reason: drops.append((item.tweet_id, reason)),
+    )
+    pipeline.stream()
+    assert pulled == []  # nada é buscado antes de alguém puxar
+
+    selected = pipeline.run(2)
+
+    assert [i.tweet_id for i in selected] == ['3', '4'] and posted == selected
+    assert sorted(drops) == [('1', 'duplicate'), ('2', 'budget'), ('3', 'duplicate_in_round'),
+                             ('5', 'filtered:odd'), ('6', 'filtered:spam')]
+    stats = pipeline.snapshot()
+    assert stats['source.comments']['out'] == 4
+    assert (stats['dedup']['in'], stats['dedup']['out']) == (7, 5)
+    assert stats['prioritizer']['in'] == 3 and stats['outbox']['out'] == 2
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DA QUOTA E DO ORÇAMENTO ESPALHADO
+Janelas móveis liberando vaga quando o post mais velho sai, e o BUDGET_SPREAD
+recomeçando a cada meia-noite local por vários dias seguidos (relógio virtual).
+"""
+
+from datetime import datetime
+
+import bot_railway_optimized as bot_module
+from clock import VirtualClock
+from quota import RollingQuota
+from runtime_config import RuntimeConfig
+
+START = 1760000000.0
+
+
+def test_windows_roll_over():
+    now = [START]
+    quota = RollingQuota([(86400, 3), (900, 2)], clock=lambda: now[0])
+    quota.record()
+    quota.record()
+    assert quota.remaining() == 0 and quota.next_slot_at() == START + 900
+
+    now[0] += 900
+    assert quota.can_post() and quota.remaining() == 1
+    quota.record()
+    assert quota.next_slot_at() == START + 86400  # janela de 24h cheia
+
+    now[0] = START + 86400
+    assert quota.remaining() == 2 and quota.used_since(START + 900) == 1
+
+
+def test_spread_budget_restarts_every_local_midnight():
+    midnight = datetime(2025, 10, 10).timestamp()
+    clock = VirtualClock(start=midnight)
+    config = RuntimeConfig(environ={'BUDGET_SPREAD': '1', 'MAX_REPLIES_PER_CYCLE': '5'},
+                           clock=clock.time)
+    bot = bot_module.XAPIBot(clock=clock, config=config)
+
+    posts_by_day = {}
+    for _ in range(4 * 48):  # um ciclo a cada 30 min por 4 dias
+        for _ in range(bot.cycle_budget()):
+            bot.quota.record()
+            posts_by_day.setdefault(clock.now().date(), []).append(clock.now().hour)
+        clock.advance(1800)
+
+    assert len(posts_by_day) == 4
+    for hours in posts_by_day.values():
+        # Todo dia libera o primeiro post logo no início e chega ao limite
+        assert len(hours) == bot.daily_limit and hours[0] == 0
+
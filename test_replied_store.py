@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO REPLIED STORE
+Pertinência por balde do snowflake (IDs como int ou string) e expiração contada da
+última inserção no balde.
+"""
+
+from replied_store import RepliedStore
+from tweet_records import TWITTER_EPOCH_MS
+
+START = 1760000000.0
+
+
+def snowflake(ts, seq=0):
+    return ((int(ts * 1000) - TWITTER_EPOCH_MS) << 22) | seq
+
+
+def test_membership_across_buckets():
+    store = RepliedStore(ttl_seconds=86400, bucket_seconds=3600, clock=lambda: START)
+    ids = [snowflake(START - 600 * n, n) for n in range(48)]
+    for tweet_id in reversed(ids):
+        store.add(str(tweet_id))
+    store.add(ids[0])  # repetido não ocupa espaço
+
+    assert len(store) == 48 and store.stats()['buckets'] == 9
+    assert all(tweet_id in store and str(tweet_id) in store for tweet_id in ids)
+    assert snowflake(START - 600, 99) not in store  # mesmo balde, outro ID
+    assert snowflake(START - 30 * 86400) not in store
+    assert 'abc' not in store and None not in store
+
+
+def test_expiry_counts_from_last_insert():
+    now = [START]
+    store = RepliedStore(ttl_seconds=7200, bucket_seconds=3600, clock=lambda: now[0])
+    old, fresh = snowflake(START - 3 * 86400), snowflake(START - 60)
+    store.add(old)  # tweet antigo respondido agora: fica pelo TTL a partir de agora
+    now[0] += 3600
+    store.add(fresh)
+
+    now[0] += 3601
+    store.expire()
+    assert old not in store and fresh in store
+    now[0] += 3600
+    store.expire()
+    assert len(store) == 0 and store.nbytes() == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
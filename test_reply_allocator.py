@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO ALOCADOR DE RESPOSTAS
+Pontuação (recência, autor, resposta direta) e escolha dos k melhores entre menções
+e comentários, com empate resolvido pela ordem de chegada.
+"""
+
+from datetime import datetime, timezone
+
+from pytest import approx
+
+from reply_allocator import ReplyAllocator, ReplyCandidate
+from tweet_records import TweetRecord
+
+NOW = datetime(2025, 10, 9, 12, 0, tzinfo=timezone.utc)
+
+
+def candidate(tweet_id, source, age_hours, followers=0, verified=False, reply_to_me=False):
+    record = TweetRecord(tweet_id, author_id=str(tweet_id), created_ts=NOW.timestamp() - age_hours * 3600,
+                         in_reply_to_user_id='1000' if reply_to_me else None)
+    author = {'public_metrics': {'followers_count': followers}, 'verified': verified}
+    return ReplyCandidate(record, source, author, my_user_id='1000')
+
+
+def test_score_weights():
+    allocator = ReplyAllocator(recency_half_life_hours=2.0)
+    fresh, old = candidate(1, 'mention', 0), candidate(2, 'mention', 2)
+    assert allocator.score(fresh, NOW) - allocator.score(old, NOW) == approx(0.5)  # meia-vida
+
+    plain = allocator.score(candidate(3, 'comment', 1), NOW)
+    assert allocator.score(candidate(4, 'comment', 1, reply_to_me=True), NOW) - plain == approx(0.3)
+    assert allocator.score(candidate(5, 'comment', 1, verified=True), NOW) - plain == approx(0.2)
+    famous = allocator.score(candidate(6, 'comment', 1, followers=10 ** 6), NOW) - plain
+    assert famous == approx(ReplyAllocator.AUTHOR_WEIGHT)
+
+
+def test_select_keeps_best_k_across_sources():
+    allocator = ReplyAllocator()
+    stream = [
+        candidate(1, 'comment', 6),
+        candidate(2, 'mention', 0.1, followers=5000),
+        candidate(3, 'comment', 0.1, reply_to_me=True),
+        candidate(4, 'mention', 24),
+        candidate(5, 'comment', 0.1, reply_to_me=True),  # empata com o 3: chegou depois
+    ]
+    chosen = allocator.select(iter(stream), 3, NOW)
+    assert [c.tweet.id for c in chosen] == [2, 3, 5]
+    assert chosen[0].score >= chosen[1].score >= chosen[2].score
+    assert allocator.select(stream, 0, NOW) == []
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
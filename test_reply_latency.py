@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DA LATÊNCIA DE RESPOSTA
+Fases medidas na publicação e descartes por motivo: um tweet já respondido que
+volta na busca não conta como descarte de duplicata, e o mesmo tweet vindo de duas
+fontes na rodada mantém o first_seen original.
+"""
+
+from pipeline import ReplyPipeline
+from reply_allocator import ReplyCandidate
+from reply_latency import ReplyLatency
+from tweet_records import TweetRecord
+
+START = 1760000000.0
+
+
+def candidate(tweet_id, source='mention', post_id=None):
+    record = TweetRecord(tweet_id, author_id='2000', created_ts=START - 300)
+    return ReplyCandidate(record, source, post_id=post_id)
+
+
+def test_phases_and_duplicate_drops():
+    now = [START]
+    latency = ReplyLatency(clock=lambda: now[0])
+    first, waiting = candidate(1), candidate(2, 'comment', post_id='500')
+    latency.seen(first)
+    latency.seen(waiting)
+    now[0] += 60
+    latency.queued(first)
+    now[0] += 30
+    latency.posted(first)
+
+    summary = latency.stats()
+    assert summary['overall']['discovery']['max'] == 300
+    assert summary['overall']['total']['max'] == 390
+    assert summary['tracked'] == 1
+
+    latency.dropped(candidate(1), 'duplicate')  # já respondido, voltou na busca
+    latency.dropped(waiting, 'budget')
+    latency.dropped(candidate(2, 'mention'), 'duplicate')  # repetido ainda sem resposta
+    summary = latency.stats()
+    assert summary['drops'] == {'budget': 1, 'duplicate': 1}
+    assert summary['by_source']['post:500']['drops'] == {'budget': 1}
+    assert summary['tracked'] == 0
+
+
+def test_tweet_from_two_sources_keeps_first_seen():
+    now = [START]
+    latency = ReplyLatency(clock=lambda: now[0])
+
+    def source(kind, post_id=None):
+        def generate():
+            item = candidate(7, kind, post_id)  # comentário que também cita o @ do bot
+            latency.seen(item)
+            yield item
+        return generate
+
+    pipeline = ReplyPipeline(
+        sources={'mentions': source('mention'), 'comments': source('comment', '500')},
+        dedup=lambda c: False,
+        filters=[],
+        prioritizer=lambda stream, k: list(stream)[:k],
+        outbox=lambda selected: len(selected),
+        on_drop=latency.dropped,
+    )
+    pipeline.run(0)  # fora do orçamento nesta rodada
+    assert latency.stats()['drops'] == {'budget': 1} and latency.stats()['tracked'] == 1
+
+    now[0] += 3600
+    chosen = pipeline.run(1)
+    assert chosen[0].first_seen == START
+    latency.posted(chosen[0])
+    assert latency.stats()['overall']['waiting']['max'] == 3600
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
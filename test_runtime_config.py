@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DE CONFIGURAÇÃO RECARREGÁVEL
+Troca o BOT_CONFIG_FILE com o bot vivo e verifica que recargas válidas são aplicadas
+aos limites e ao agendador sem perder estado, que MONITORED_POST_IDS substitui a lista
+anterior e que recargas inválidas são rejeitadas.
+"""
+
+import json
+import os
+import threading
+import time
+
+import bot_railway_optimized as bot_module
+from clock import SystemClock, VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+from runtime_config import RuntimeConfig
+from tweet_records import TweetRecord
+
+START = 1760000000.0
+_writes = [0]
+
+
+def write_config(path, **values):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(values, f)
+    # mtime explícito: duas escritas no mesmo instante não podem parecer o mesmo arquivo
+    _writes[0] += 1
+    os.utime(path, (START + _writes[0], START + _writes[0]))
+
+
+def make_bot(path, clock=None):
+    clock = clock or VirtualClock(start=START)
+    api = FakeXAPI(VirtualClock(start=START))
+    config = RuntimeConfig(path=str(path), environ={}, clock=clock.time)
+    return bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=clock, config=config)
+
+
+def test_file_change_is_applied_live_and_keeps_state(tmp_path):
+    path = tmp_path / 'bot_config.json'
+    write_config(path, POST_QUOTA_WINDOWS='86400:17', AUTHOR_REPLY_LIMIT='1/6h')
+    bot = make_bot(path)
+    for _ in range(3):
+        bot.quota.record()
+
+    write_config(path, POST_QUOTA_WINDOWS='86400:5,900:2', AUTHOR_REPLY_LIMIT='3/1h',
+                 MONITORED_POST_IDS=['111', '222'], CYCLE_WAIT_SEC='60-120')
+    assert bot.sync_config() >= {'POST_QUOTA_WINDOWS', 'AUTHOR_REPLY_LIMIT', 'CYCLE_WAIT_SEC'}
+
+    assert bot.daily_limit == 5
+    assert bot.daily_posts == 3  # histórico da quota sobrevive à troca de janelas
+    assert not bot.quota.can_post()  # 3 posts agora estouram a janela de 15 min
+    assert bot.throttle.buckets['author'].capacity == 3
+    assert set(bot.monitored_posts) == {'111', '222'}
+    assert bot.cycle_wait_sec == (60, 120)
+    assert bot.config_state()['applied_version'] == bot.config.version
+
+
+def test_invalid_reload_is_rejected_and_previous_values_stay(tmp_path):
+    path = tmp_path / 'bot_config.json'
+    write_config(path, MAX_COMMENTS_PER_CYCLE=4)
+    bot = make_bot(path)
+    version = bot.config.version
+
+    write_config(path, MAX_COMMENTS_PER_CYCLE=-1, BUDGET_ACTIVE_HOURS='20-8', API_KEY='x')
+    assert bot.sync_config() == set()
+
+    last = bot.config.stats()['last_reload']
+    assert not last['ok'] and len(last['errors']) == 3
+    assert bot.config.version == version
+    assert bot.max_replies_per_cycle == 5  # padrão: MAX_COMMENTS_PER_CYCLE + 1
+
+
+def test_reload_replaces_configured_posts_and_alias(tmp_path):
+    path = tmp_path / 'bot_config.json'
+    write_config(path, MONITORED_POST_IDS=['111', '222'], MAX_COMMENTS_PER_CYCLE=2)
+    bot = make_bot(path)
+    bot.monitored_posts.merge([TweetRecord('333', created_ts=START)])  # achado na timeline
+
+    write_config(path, MONITORED_POST_IDS=['222', '333'], MAX_COMMENTS_PER_CYCLE=6)
+    assert bot.sync_config() == {'MONITORED_POST_IDS', 'MAX_COMMENTS_PER_CYCLE', 'MAX_REPLIES_PER_CYCLE'}
+    assert set(bot.monitored_posts) == {'222', '333'}
+    assert bot.max_replies_per_cycle == 7
+
+    write_config(path, MONITORED_POST_IDS='', MAX_COMMENTS_PER_CYCLE=6)
+    bot.sync_config()
+    assert set(bot.monitored_posts) == {'333'}  # o da timeline continua
+
+
+def test_reload_wakes_cycle_wait_with_new_interval(tmp_path):
+    path = tmp_path / 'bot_config.json'
+    write_config(path, CYCLE_WAIT_SEC='600')
+    bot = make_bot(path, clock=SystemClock())
+    bot.sync_config()
+
+    def shorten():
+        time.sleep(0.2)
+        write_config(path, CYCLE_WAIT_SEC='0')
+        bot.config.reload('admin')
+
+    threading.Thread(target=shorten).start()
+    started = time.monotonic()
+    bot.wait_next_cycle(600)
+    assert time.monotonic() - started < 5
+    assert bot.cycle_wait_sec == (0, 0)
+
+
+def test_admin_reload_requires_token(tmp_path, monkeypatch):
+    path = tmp_path / 'bot_config.json'
+    write_config(path, COMMENT_INTERVAL_SEC=120)
+    monkeypatch.setattr(bot_module, 'bot', make_bot(path))
+    client = bot_module.app.test_client()
+
+    monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+    assert client.post('/admin/reload').status_code == 401
+    monkeypatch.setenv('ADMIN_TOKEN', 'segredo')
+    assert client.post('/admin/reload', headers={'Authorization': 'Bearer errado'}).status_code == 401
+
+    write_config(path, COMMENT_INTERVAL_SEC=30)
+    response = client.post('/admin/reload', headers={'Authorization': 'Bearer segredo'})
+    assert response.status_code == 200
+    assert response.get_json()['changed'] == ['COMMENT_INTERVAL_SEC']
+
+    write_config(path, COMMENT_INTERVAL_SEC='rápido')
+    response = client.post('/admin/reload', headers={'Authorization': 'Bearer segredo'})
+    assert response.status_code == 400
+    assert response.get_json()['last_reload']['errors']
+
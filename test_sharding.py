@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DE PARTICIONAMENTO ENTRE NÓS
+Hash consistente (equilíbrio e movimento mínimo), membros no backend SQLite com
+expiração por heartbeat, e dois bots dividindo as conversas monitoradas sem
+responder duas vezes, reservando a quota da conta no backend e repassando os
+limites por autor.
+"""
+
+import random
+
+import pytest
+
+import bot_railway_optimized as bot_module
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+from sharding import (
+    CoordinationBackend, HashRing, MemoryBackend, SQLiteBackend, ShardCoordinator
+)
+
+START = 1760000000.0
+
+
+def test_ring_is_balanced_and_moves_only_to_the_new_node():
+    keys = [f"post:{n}" for n in range(3000)]
+    ring = HashRing(['a', 'b', 'c'])
+    before = {key: ring.owner(key) for key in keys}
+    for node in 'abc':
+        assert 0.2 < sum(1 for owner in before.values() if owner == node) / len(keys) < 0.46
+
+    grown = HashRing(['a', 'b', 'c', 'd'])
+    moved = [key for key in keys if grown.owner(key) != before[key]]
+    assert all(grown.owner(key) == 'd' for key in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+
+
+def test_sqlite_membership_rebalances_on_join_and_expiry(tmp_path):
+    clock = VirtualClock(start=START)
+    backend = SQLiteBackend(str(tmp_path / 'shards.db'))
+    a = ShardCoordinator('a', backend, ttl_seconds=90, clock=clock.time)
+    b = ShardCoordinator('b', SQLiteBackend(str(tmp_path / 'shards.db')), ttl_seconds=90,
+                         clock=clock.time)
+    a.refresh()
+    assert b.refresh() and a.refresh()
+    assert a.ring.nodes == b.ring.nodes == ('a', 'b')
+
+    keys = [f"post:{n}" for n in range(200)]
+    owned_a, owned_b = a.publish_assignments(keys), b.publish_assignments(keys)
+    assert sorted(owned_a + owned_b) == sorted(keys)
+    assert backend.assignments() == {'a': sorted(owned_a), 'b': sorted(owned_b)}
+
+    # b para de mandar heartbeat: depois do TTL, a assume tudo
+    clock.advance(120)
+    assert a.refresh()
+    assert a.ring.nodes == ('a',)
+    assert all(a.owns(key) for key in keys)
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoReservations(CoordinationBackend):
+        """Backend antigo, de antes da quota compartilhada"""
+
+        def heartbeat(self, node_id, now): pass
+        def members(self, since): return []
+        def leave(self, node_id): pass
+        def set_assignments(self, node_id, keys, now): pass
+        def assignments(self): return {}
+        def record_reply(self, node_id, tweet_id, ts, throttle=None): pass
+        def replies_since(self, ts, exclude_node=None): return []
+        def prune(self, before): pass
+
+    with pytest.raises(TypeError, match='reserve_post'):
+        NoReservations()  # falha na criação, não no primeiro post
+
+
+def make_bot(api, backend, node_id):
+    random.seed(node_id)
+    shards = ShardCoordinator(node_id, backend, clock=api.clock.time)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=api.clock, shards=shards)
+    assert bot.authenticate()
+    return bot
+
+
+def test_two_nodes_split_conversations_and_share_the_quota():
+    clock = VirtualClock(start=START)
+    api = FakeXAPI(clock)
+    posts = [api.add_own_post(START - 3600 * (n + 1), text=f"Post {n}") for n in range(8)]
+    for n, post_id in enumerate(posts):
+        api.add_reply(START - 60 * (n + 1), post_id, 3000 + n)
+    backend = MemoryBackend()
+    nodes = [make_bot(api, backend, 'node-a'), make_bot(api, backend, 'node-b')]
+    for bot in nodes:
+        bot.max_replies_per_cycle = 10
+        bot.sync_shards()
+    nodes[0].sync_shards()  # node-a também precisa ver node-b no anel
+
+    searches = []
+    for bot in nodes:
+        before = api.calls['/tweets/search/recent']
+        bot.process_cycle()
+        searches.append(api.calls['/tweets/search/recent'] - before)
+
+    # Cada conversa (e as menções) é buscada por um único nó e cada comentário respondido uma vez
+    assert sum(searches) == len(posts) + 1 and all(searches)
+    targets = [reply_to for _, reply_to, _ in api.posted]
+    assert len(targets) == len(set(targets)) == len(posts)
+
+    # Depois da sincronização, cada nó conta os posts da conta inteira
+    for bot in nodes:
+        bot.sync_shards()
+        assert bot.daily_posts == len(posts)
+
+
+def two_nodes(backends, replies):
+    """API com 8 posts monitorados (autores de `replies`) e dois nós já no mesmo anel"""
+    clock = VirtualClock(start=START)
+    api = FakeXAPI(clock)
+    posts = [api.add_own_post(START - 3600 * (n + 1), text=f"Post {n}") for n in range(8)]
+    for n, post_id in enumerate(posts):
+        api.add_reply(START - 60 * (n + 1), post_id, replies(n))
+    nodes = [make_bot(api, backend, node_id) for backend, node_id in zip(backends, ('node-a', 'node-b'))]
+    for bot in nodes + nodes[:1]:
+        bot.max_replies_per_cycle = 10
+        bot.sync_shards()
+    return api, nodes
+
+
+@pytest.mark.parametrize('kind', ['memory', 'sqlite'])
+def test_concurrent_nodes_stay_under_the_account_quota(kind, tmp_path):
+    if kind == 'memory':
+        backends = [MemoryBackend()] * 2
+    else:
+        backends = [SQLiteBackend(str(tmp_path / 'shards.db')) for _ in range(2)]
+    api, nodes = two_nodes(backends, lambda n: 3000 + n)
+    for bot in nodes:
+        bot.quota.set_windows([(86400, 5)])
+        bot.daily_limit = bot.quota.limit
+
+    # Sem sincronizar entre os ciclos: cada nó só vê a própria quota local
+    for bot in nodes:
+        bot.process_cycle()
+    assert len(api.posted) == 5
+    assert backends[0].reserve_post('node-c', [(86400, 5)], START) is None
+
+
+def test_author_limit_is_shared_between_nodes():
+    backend = MemoryBackend()
+    api, nodes = two_nodes([backend] * 2, lambda n: 3000 + n % 2)  # dois fãs em todas as conversas
+    nodes[0].process_cycle()
+    assert len(api.posted) == 2
+
+    nodes[1].sync_shards()
+    nodes[1].process_cycle()
+    assert len(api.posted) == 2  # os dois autores já receberam resposta de node-a
+    assert nodes[1].throttle.stats()['author']['keys'] == 2
+
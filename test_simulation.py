@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DA SIMULAÇÃO EM TEMPO VIRTUAL
+O run_bot_loop inteiro contra a API falsa: 24h e 48h virtuais respeitam a quota em
+qualquer janela móvel de 24h, sem 429, e terminam em poucos segundos reais.
+"""
+
+import logging
+
+from simulate_bot import run_simulation
+
+START = 1760000000.0
+
+# Folga generosa: a simulação de 24h roda em centésimos de segundo
+MAX_WALL_SEC = 10
+
+
+def test_one_virtual_day_stays_within_the_quota():
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run_simulation(hours=24, start=START)
+
+    assert report['virtual_hours'] >= 24
+    quota = report['quota']
+    assert 0 < report['replies_sent'] <= quota['daily_limit']
+    assert quota['peak_24h'] <= quota['daily_limit'] and quota['post_429'] == 0
+    assert report['replies_by_source']['mention'] and report['replies_by_source']['comment']
+    assert report['wall_seconds'] < MAX_WALL_SEC
+
+
+def test_two_days_against_the_api_post_limit():
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run_simulation(hours=48, mentions=80, replies=240, start=START,
+                            post_limit=(86400, 17))
+
+    quota = report['quota']
+    assert report['replies_sent'] > quota['daily_limit']  # o segundo dia também posta
+    assert quota['peak_24h'] <= quota['daily_limit'] and quota['post_429'] == 0
+    assert report['wall_seconds'] < MAX_WALL_SEC
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
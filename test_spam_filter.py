@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO FILTRO DE SPAM
+Normalização, rejeição por modelo de spam e por texto copiado (no lote e entre
+ciclos), sem marcar o mesmo tweet visto de novo nem textos curtos.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from spam_filter import SpamFilter, normalize  # noqa: E402
+
+
+def candidate(tweet_id, text):
+    return SimpleNamespace(tweet=SimpleNamespace(id=tweet_id), text=text)
+
+
+def test_normalize():
+    assert normalize("  Ganhei 500 @fulano em https://x.co/abc  HOJE ") == "ganhei 000 em url hoje"
+    assert normalize(None) == ""
+
+
+def test_spam_and_copied_replies_are_rejected():
+    spam_filter = SpamFilter(recent=4)
+    batch = [
+        candidate(1, "Giveaway alert!! Claim your FREE airdrop now, link in bio 🚀"),
+        candidate(2, "Concordo demais, esse ponto sobre liquidez faz muito sentido"),
+        candidate(3, "Concordo demais, esse ponto sobre liquidez faz muito sentido!!"),
+        candidate(4, "gm!"),
+        candidate(5, "gm!"),
+        candidate(6, "Qual corretora você usa para operar opções de bitcoin?"),
+    ]
+    assert spam_filter.check(batch) == [False, False, False, True, True, True]
+    assert spam_filter.rejected == {'spam': 1, 'duplicate': 2}
+
+    # Ciclo seguinte: o mesmo tweet não é duplicata de si mesmo, uma cópia nova é
+    again = [candidate(6, batch[5].text), candidate(7, "@outro " + batch[1].text)]
+    assert spam_filter.check(again) == [True, False]
+    assert spam_filter.rejected == {'spam': 1, 'duplicate': 3}
+    assert spam_filter.check([]) == []
+    assert spam_filter.stats()['recent_texts'] == 4  # ring buffer cheio
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO QUADRO DE STATUS
+Snapshots imutáveis e versionados, e ETag/304 em / e /status.
+"""
+
+import pytest
+
+import bot_railway_optimized as bot_module
+from status_board import StatusBoard
+
+
+def test_snapshots_are_frozen_and_versioned():
+    board = StatusBoard({'daily_posts': 0})
+    first = board.snapshot()
+    board.publish(daily_posts=1)
+    assert first.data['daily_posts'] == 0 and board['daily_posts'] == 1
+    assert board.snapshot().version == first.version + 1
+    with pytest.raises(TypeError):
+        first.data['daily_posts'] = 5
+
+
+def test_etag_answers_304_until_status_changes():
+    client = bot_module.app.test_client()
+    for route in ('/', '/status'):
+        response = client.get(route)
+        etag = response.headers['ETag']
+        assert response.status_code == 200 and response.get_json()['status'] == 'healthy'
+
+        cached = client.get(route, headers={'If-None-Match': etag})
+        assert cached.status_code == 304 and cached.data == b''
+
+    etag = client.get('/status').headers['ETag']
+    bot_module.bot_status.publish(replies_found=42)
+    fresh = client.get('/status', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.get_json()['replies_found'] == 42
+    assert fresh.headers['ETag'] != etag
+
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO LIMITE POR AUTOR E POR CONVERSA
+Token buckets por chave (recarga e despejo LRU), parse dos limites e isenção do
+limite por conversa nas threads dos posts do próprio bot.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from throttle import KeyedBuckets, ThrottleIndex, parse_rate
+
+START = 1760000000.0
+
+
+def candidate(author_id, conversation_id, post_id=None):
+    return SimpleNamespace(author_id=author_id, conversation_id=conversation_id, post_id=post_id)
+
+
+def test_parse_rate():
+    assert parse_rate('1/6h') == (1, 21600)
+    assert parse_rate('2/90') == (2, 90)
+    assert parse_rate('3') == (3, 86400)
+    assert parse_rate('0') is None and parse_rate('') is None
+    with pytest.raises(ValueError):
+        parse_rate('0/1h')
+
+
+def test_buckets_refill_and_evict_least_recent():
+    buckets = KeyedBuckets(2, 3600, max_keys=2)
+    buckets.consume('a', START)
+    buckets.consume('a', START)
+    assert not buckets.available('a', START + 1799)
+    assert buckets.available('a', START + 1800)  # meia hora recarrega um token
+
+    buckets.consume('b', START)
+    buckets.consume('c', START)
+    assert len(buckets) == 2 and buckets.evicted == 1
+    assert buckets.available('a', START)  # esquecida: volta cheia
+
+
+def test_own_conversations_skip_the_conversation_limit():
+    now = [START]
+    throttle = ThrottleIndex({'author': (1, 3600), 'conversation': (2, 86400)},
+                             clock=lambda: now[0],
+                             exempt={'conversation': lambda c: c.post_id is not None})
+
+    for author in ('1', '2', '3'):
+        fan = candidate(author, 500, post_id='500')
+        assert throttle.allow(fan)
+        throttle.consume(fan)
+    assert not throttle.allow(candidate('1', 500, post_id='500'))  # autor continua limitado
+
+    for author in ('4', '5'):
+        throttle.consume(candidate(author, 900))
+    assert not throttle.allow(candidate('6', 900))
+    assert throttle.stats()['conversation'] == {'keys': 1, 'evicted': 0, 'blocked': 1}
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO TRACING
+Spans aninhados no ring buffer (pai, profundidade, erro), resumo por fase e
+amostragem de pilhas colapsadas de outra thread; /debug/* fechado sem DEBUG_TOKEN.
+"""
+
+import threading
+
+import pytest
+
+import bot_railway_optimized as bot_module
+from tracing import Tracer, collapse, sample_stacks
+
+
+def test_nested_spans_and_ring_buffer():
+    tracer = Tracer(capacity=3)
+    with tracer.span('cycle'):
+        with tracer.span('http', family='search') as span:
+            span.attrs['status'] = 200
+        with pytest.raises(ValueError):
+            with tracer.span('json.parse'):
+                raise ValueError("corpo inválido")
+
+    spans = tracer.recent()
+    assert [s['name'] for s in spans] == ['http', 'json.parse', 'cycle']
+    assert spans[0]['parent'] == 'cycle' and spans[0]['depth'] == 1
+    assert spans[0]['attrs'] == {'family': 'search', 'status': 200}
+    assert spans[1]['error'] == 'ValueError: corpo inválido' and spans[2]['depth'] == 0
+
+    with tracer.span('sleep'):
+        pass
+    assert [s['name'] for s in tracer.recent()] == ['json.parse', 'cycle', 'sleep']
+    assert tracer.recent(name='sleep')[0]['parent'] is None
+    assert tracer.summary()['cycle']['count'] == 1
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sample_stacks_of_another_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    try:
+        stacks = sample_stacks(worker.ident, 0.1, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+    assert sum(stacks.values()) >= 5
+    text = collapse(stacks)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in text.strip().splitlines())
+    assert 'busy_loop (test_tracing.py:' in text
+
+
+def test_debug_endpoints_require_token(monkeypatch):
+    client = bot_module.app.test_client()
+    paths = ['/debug/trace', '/debug/profile?seconds=0.1', '/debug/memory?start=1']
+
+    monkeypatch.delenv('DEBUG_TOKEN', raising=False)
+    assert [client.get(path).status_code for path in paths] == [401] * 3
+    monkeypatch.setenv('DEBUG_TOKEN', 'segredo')
+    assert [client.get(path, headers={'Authorization': 'Bearer errado'}).status_code
+            for path in paths] == [401] * 3
+    assert client.get('/debug/trace?token=errado').status_code == 401
+
+    response = client.get('/debug/trace', headers={'Authorization': 'Bearer segredo'})
+    assert response.status_code == 200 and 'summary' in response.get_json()
+    assert client.get('/debug/trace?token=segredo&limit=1').status_code == 200
+
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DOS TWEET RECORDS
+Parse da resposta da API em registros compactos (IDs inteiros, autores internados,
+epoch) e o uso deles pelos candidatos e pelos posts monitorados.
+"""
+
+import json
+
+from monitored_posts import MonitoredPosts
+from reply_allocator import ReplyCandidate
+from tweet_records import TweetRecord, parse_tweets
+
+START = 1760000000.0
+
+
+def test_parse_keeps_only_used_fields():
+    # json.loads cria uma string nova para cada author_id
+    data = json.loads(json.dumps({'data': [
+        {'id': '1978000000000000001', 'text': 'Oi', 'author_id': '5001',
+         'conversation_id': '1977000000000000000', 'in_reply_to_user_id': '1000',
+         'created_at': '2025-10-09T08:53:20.000Z', 'edit_history_tweet_ids': ['1978000000000000001'],
+         'public_metrics': {'like_count': 3}},
+        {'id': 'abc'}, {'text': 'sem id'},
+        {'id': '1978000000000000002', 'author_id': '5001'},
+    ]}))
+    first, second = parse_tweets(data)
+
+    assert first.id == 1978000000000000001 and first.tweet_id == '1978000000000000001'
+    assert first.conversation_id == 1977000000000000000
+    assert first.created_ts == START and second.created_ts is None
+    assert first.author_id is second.author_id  # mesma string internada
+    assert not hasattr(first, '__dict__') and not hasattr(first, 'public_metrics')
+
+    candidate = ReplyCandidate(first, 'comment', my_user_id='1000')
+    assert candidate.tweet_id == '1978000000000000001' and candidate.direct_reply
+    assert ReplyCandidate({'id': '7', 'text': 'x'}, 'mention').tweet.id == 7
+
+
+def test_monitored_posts_merge_records():
+    posts = MonitoredPosts(clock=lambda: START)
+    records = [TweetRecord(1978000000000000002, created_ts=START - 60),
+               TweetRecord(1978000000000000001, created_ts=START - 8 * 86400)]
+    assert posts.merge(records) == 2
+    assert posts.since_id == '1978000000000000002'
+    assert posts.evict() == 1 and list(posts) == ['1978000000000000002']
+
+
+if __name__ == "__main__":
+    import pytest
+    raise SystemExit(pytest.main([__file__, '-q']))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+🧪 TESTE DO CACHE DE AUTORES
+LRU + TTL do cache e preenchimento em lote (/2/users?ids=, até 100 por chamada)
+para candidatos que chegaram sem includes.users; IDs que a API não devolve ficam
+lembrados como desconhecidos até o TTL próprio.
+"""
+
+import bot_railway_optimized as bot_module
+from clock import VirtualClock
+from fake_x_api import FakeXAPI
+from http_transport import HTTPTransport
+from reply_allocator import ReplyCandidate
+from user_cache import UserCache
+
+START = 1760000000.0
+
+
+def test_lru_and_ttl():
+    clock = VirtualClock(start=START)
+    cache = UserCache(capacity=2, ttl_seconds=60, clock=clock.time)
+    cache.put_many([{'id': '1', 'username': 'um'}, {'id': '2', 'username': 'dois'}])
+    assert cache.get('1')['username'] == 'um'  # '1' passa a ser o mais recente
+    cache.put_many([{'id': '3', 'username': 'tres'}])
+    assert cache.get('2') is None and cache.evicted == 1
+
+    clock.advance(61)
+    assert cache.missing(['1', '3', '1', '4']) == ['1', '3', '4']
+    assert cache.get('1') is None and len(cache) == 1
+
+
+def test_missing_authors_are_resolved_in_batches():
+    api = FakeXAPI(VirtualClock(start=START))
+    for n in range(250):
+        api.add_user(5000 + n, followers=n)
+    bot = bot_module.XAPIBot(transport=HTTPTransport(session=api), clock=api.clock)
+    candidates = [
+        ReplyCandidate({'id': str(9000 + n), 'author_id': str(5000 + n % 250)}, 'mention')
+        for n in range(300)
+    ] + [ReplyCandidate({'id': '9999', 'author_id': '404'}, 'mention')]
+
+    assert bot.resolve_authors(candidates) == [True] * len(candidates)
+
+    assert api.calls['/users'] == 3  # 251 IDs distintos: 100 + 100 + 51
+    assert candidates[7].author['public_metrics']['followers_count'] == 7
+    assert candidates[-1].author == {}
+    # Segunda rodada com os mesmos autores (e o desconhecido): tudo vem do cache
+    bot.resolve_authors([ReplyCandidate({'id': '1', 'author_id': '5001'}, 'mention'),
+                         ReplyCandidate({'id': '2', 'author_id': '404'}, 'mention')])
+    assert api.calls['/users'] == 3
+    assert bot.users.stats()['unknown'] == 1
+
+    api.clock.advance(bot.users.unknown_ttl_seconds + 1)
+    assert bot.users.missing(['5001', '404']) == ['404']
+
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Limite de respostas por autor e por conversa
+Token bucket por chave (author_id, conversation_id) num OrderedDict com despejo LRU:
+verificação O(1) e memória limitada a `max_keys` chaves por dimensão
+"""
+
+import time
+from collections import Counter, OrderedDict
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(value):
+    """'1/6h' -> (1, 21600); vazio ou '0' desativa (None)"""
+    value = (value or '').strip()
+    if not value or value == '0':
+        return None
+    count, _, period = value.partition('/')
+    period = period.strip() or '1d'
+    if period[-1].isdigit():
+        seconds = float(period)
+    else:
+        seconds = float(period[:-1] or 1) * UNITS[period[-1]]
+    count = int(count)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f"limite inválido: {value}")
+    return count, seconds
+
+
+class KeyedBuckets:
+    """Token buckets por chave; chaves menos usadas recentemente são descartadas"""
+
+    def __init__(self, capacity, period, max_keys=10000):
+        self.set_rate(capacity, period)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # chave -> (tokens, ts)
+        self.evicted = 0
+
+    def set_rate(self, capacity, period):
+        """Novo limite; os saldos guardados são limitados à nova capacidade na próxima leitura"""
+        self.capacity = capacity
+        self.refill_per_sec = capacity / period
+
+    def _tokens(self, key, now):
+        state = self._buckets.get(key)
+        if state is None:
+            return self.capacity
+        tokens, ts = state
+        return min(self.capacity, tokens + (now - ts) * self.refill_per_sec)
+
+    def available(self, key, now):
+        return self._tokens(key, now) >= 1
+
+    def consume(self, key, now):
+        self._buckets[key] = (self._tokens(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            # A chave mais antiga já está (quase sempre) cheia de novo: esquecer é seguro
+            self._buckets.popitem(last=False)
+            self.evicted += 1
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class ThrottleIndex:
+    """Índice de limites por dimensão do candidato ('author' e 'conversation').
+
+    `exempt` mapeia dimensão -> predicado: candidatos para os quais ele é verdadeiro
+    não são limitados (nem contados) naquela dimensão.
+    """
+
+    DIMENSIONS = {'author': 'author_id', 'conversation': 'conversation_id'}
+
+    def __init__(self, limits, max_keys=10000, clock=time.time, exempt=None):
+        self.clock = clock
+        self.max_keys = max_keys
+        self.exempt = exempt or {}
+        self.buckets = {}
+        self.blocked = Counter()
+        self.set_limits(limits)
+
+    def set_limits(self, limits):
+        """Aplica novos limites; dimensões mantidas preservam o histórico por chave"""
+        buckets = {}
+        for name, limit in limits.items():
+            if not limit:
+                continue
+            if name in self.buckets:
+                buckets[name] = self.buckets[name]
+                buckets[name].set_rate(*limit)
+            else:
+                buckets[name] = KeyedBuckets(*limit, max_keys=self.max_keys)
+        self.buckets = buckets
+
+    def _key(self, name, candidate):
+        exempt = self.exempt.get(name)
+        if exempt and exempt(candidate):
+            return None
+        return getattr(candidate, self.DIMENSIONS[name])
+
+    def allow(self, candidate):
+        """True se o candidato não estoura nenhum limite (não consome)"""
+        now = self.clock()
+        for name, buckets in self.buckets.items():
+            key = self._key(name, candidate)
+            if key and not buckets.available(key, now):
+                self.blocked[name] += 1
+                return False
+        return True
+
+    def keys(self, candidate):
+        """{dimensão: chave} que uma resposta ao candidato consome"""
+        keys = {}
+        for name in self.buckets:
+            key = self._key(name, candidate)
+            if key:
+                keys[name] = key
+        return keys
+
+    def consume(self, candidate):
+        """Registra uma resposta publicada para o candidato"""
+        self.consume_keys(self.keys(candidate))
+
+    def consume_keys(self, keys):
+        """Registra uma resposta pelas chaves (ex: publicada por outro nó)"""
+        now = self.clock()
+        for name, key in keys.items():
+            if name in self.buckets:
+                self.buckets[name].consume(key, now)
+
+    def stats(self):
+        return {
+            name: {'keys': len(buckets), 'evicted': buckets.evicted, 'blocked': self.blocked[name]}
+            for name, buckets in self.buckets.items()
+        }
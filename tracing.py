@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tracing leve e profiler por amostragem
+Spans por fase do loop gravados num ring buffer em memória e pilhas colapsadas
+(formato flamegraph) amostradas da thread do bot
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+
+class Span:
+    """Trecho cronometrado de uma fase"""
+
+    __slots__ = ('name', 'start', 'duration', 'thread', 'depth', 'parent', 'attrs', 'error')
+
+    def __init__(self, name, parent, depth, attrs):
+        self.name = name
+        self.start = time.time()
+        self.duration = None
+        self.thread = threading.current_thread().name
+        self.depth = depth
+        self.parent = parent
+        self.attrs = attrs
+        self.error = None
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': round(self.duration * 1000, 3) if self.duration is not None else None,
+            'thread': self.thread,
+            'depth': self.depth,
+            'parent': self.parent,
+            'attrs': self.attrs,
+            'error': self.error,
+        }
+
+
+class Tracer:
+    """Grava spans finalizados num deque de tamanho fixo (ring buffer)"""
+
+    def __init__(self, capacity=2000):
+        self._spans = deque(maxlen=capacity)
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        current = Span(name, stack[-1].name if stack else None, len(stack), attrs)
+        stack.append(current)
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.duration = time.perf_counter() - started
+            stack.pop()
+            self._spans.append(current)
+
+    def recent(self, limit=200, name=None):
+        spans = list(self._spans)
+        if name:
+            spans = [s for s in spans if s.name == name]
+        return [s.to_dict() for s in spans[-limit:]]
+
+    def summary(self):
+        """Contagem, total e máximo (ms) por nome de span no buffer"""
+        durations = defaultdict(list)
+        for span in list(self._spans):
+            if span.duration is not None:
+                durations[span.name].append(span.duration)
+        result = {}
+        for name, values in durations.items():
+            values.sort()
+            result[name] = {
+                'count': len(values),
+                'total_ms': round(sum(values) * 1000, 3),
+                'p50_ms': round(values[len(values) // 2] * 1000, 3),
+                'max_ms': round(values[-1] * 1000, 3),
+            }
+        return result
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(thread_id, seconds, interval=0.005):
+    """Amostra a pilha de uma thread e conta as pilhas colapsadas (raiz;...;folha)"""
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        stacks[';'.join(reversed(labels))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def collapse(stacks):
+    """Texto no formato aceito pelo flamegraph.pl / speedscope"""
+    return '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common()) + '\n'
+
+
+# Tracer do processo (compartilhado pelos bots e endpoints)
+tracer = Tracer(capacity=int(os.getenv('TRACE_BUFFER_SIZE', '2000')))
+
+
+def traced(name):
+    """Decorador: executa a função dentro de um span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registros compactos de tweets
+A resposta da API vira TweetRecord logo no parse: __slots__, IDs inteiros, IDs de
+usuário internados e created_at em epoch. Só os campos que o bot usa são guardados.
+"""
+
+import sys
+from datetime import datetime
+
+# Epoch do snowflake do X (ms)
+TWITTER_EPOCH_MS = 1288834974657
+
+
+def snowflake_time(tweet_id):
+    """Epoch (segundos) embutido num ID snowflake"""
+    return ((int(tweet_id) >> 22) + TWITTER_EPOCH_MS) / 1000
+
+
+def parse_timestamp(value):
+    """created_at da API (ISO 8601 com 'Z') em epoch (segundos), ou None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _user_id(value):
+    # Os mesmos autores aparecem em muitos tweets: uma única string por ID
+    return sys.intern(value) if value else None
+
+
+def _int_id(value):
+    try:
+        return int(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TweetRecord:
+    """Tweet já decodificado (menção, comentário ou post próprio)"""
+
+    __slots__ = ('id', 'author_id', 'conversation_id', 'in_reply_to_user_id', 'created_ts', 'text')
+
+    def __init__(self, id, author_id=None, conversation_id=None, in_reply_to_user_id=None,
+                 created_ts=None, text=''):
+        self.id = id
+        self.author_id = author_id
+        self.conversation_id = conversation_id
+        self.in_reply_to_user_id = in_reply_to_user_id
+        self.created_ts = created_ts
+        self.text = text
+
+    @classmethod
+    def from_api(cls, tweet):
+        """Constrói a partir do dict da API; levanta ValueError se o ID faltar ou for inválido"""
+        tweet_id = _int_id(tweet.get('id'))
+        if tweet_id is None:
+            raise ValueError(f"Tweet sem ID válido: {tweet.get('id')!r}")
+        return cls(
+            tweet_id,
+            _user_id(tweet.get('author_id')),
+            _int_id(tweet.get('conversation_id')),
+            _user_id(tweet.get('in_reply_to_user_id')),
+            parse_timestamp(tweet.get('created_at')),
+            tweet.get('text') or '',
+        )
+
+    @property
+    def tweet_id(self):
+        """ID como string, formato usado no JSON enviado à API"""
+        return str(self.id)
+
+    def __repr__(self):
+        return f"TweetRecord({self.id} author={self.author_id})"
+
+
+def parse_tweets(data):
+    """Lista 'data' de uma resposta da API -> [TweetRecord], ignorando itens sem ID"""
+    records = []
+    for tweet in data.get('data') or ():
+        try:
+            records.append(TweetRecord.from_api(tweet))
+        except (AttributeError, ValueError):
+            continue
+    return records
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de autores (objetos user da API)
+LRU com TTL: alimentado de graça pelo includes.users das buscas e, para quem faltar,
+por GET /2/users?ids= em lotes de até 100 IDs
+"""
+
+import time
+from collections import OrderedDict
+
+# Máximo de IDs por chamada de /2/users
+LOOKUP_BATCH = 100
+
+
+class UserCache:
+    """Autores por ID; entradas mais velhas que `ttl_seconds` contam como ausentes.
+
+    Só os campos usados pelo bot são guardados (username, seguidores e verificação),
+    não o objeto inteiro da resposta. IDs que o /2/users não devolve (conta suspensa
+    ou apagada) ficam marcados como desconhecidos por `unknown_ttl_seconds`, para
+    não voltarem a cada ciclo.
+    """
+
+    FIELDS = ('id', 'username', 'name', 'verified', 'public_metrics')
+
+    def __init__(self, capacity=5000, ttl_seconds=6 * 3600, unknown_ttl_seconds=3600,
+                 clock=time.time):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.unknown_ttl_seconds = unknown_ttl_seconds
+        self.clock = clock
+        self._users = OrderedDict()  # id -> (ts, user); user None = desconhecido
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _expired(self, entry, now):
+        ttl = self.ttl_seconds if entry[1] is not None else self.unknown_ttl_seconds
+        return entry[0] < now - ttl
+
+    def _store(self, user_id, user, now):
+        self._users.pop(user_id, None)
+        self._users[user_id] = (now, user)
+
+    def put_many(self, users):
+        now = self.clock()
+        stored = 0
+        for user in users or ():
+            user_id = user.get('id')
+            if not user_id:
+                continue
+            self._store(user_id, {k: user[k] for k in self.FIELDS if k in user}, now)
+            stored += 1
+        self._evict()
+        return stored
+
+    def put_unknown(self, user_ids):
+        """Marca IDs que a API não devolveu (get() dá None sem contar como falta)"""
+        now = self.clock()
+        for user_id in user_ids:
+            self._store(user_id, None, now)
+        self._evict()
+
+    def _evict(self):
+        while len(self._users) > self.capacity:
+            self._users.popitem(last=False)
+            self.evicted += 1
+
+    def get(self, user_id):
+        entry = self._users.get(user_id)
+        if entry is None or self._expired(entry, self.clock()):
+            if entry is not None:
+                del self._users[user_id]
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def missing(self, user_ids):
+        """IDs (sem repetição, na ordem) que não estão no cache ou expiraram"""
+        now = self.clock()
+        seen = set()
+        result = []
+        for user_id in user_ids:
+            if not user_id or user_id in seen:
+                continue
+            seen.add(user_id)
+            entry = self._users.get(user_id)
+            if entry is None or self._expired(entry, now):
+                result.append(user_id)
+        return result
+
+    def __len__(self):
+        return len(self._users)
+
+    def stats(self):
+        return {'size': len(self._users), 'hits': self.hits, 'misses': self.misses,
+                'evicted': self.evicted,
+                'unknown': sum(1 for _, user in self._users.values() if user is None)}
+
+
+def batches(ids, size=LOOKUP_BATCH):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]